@@ -1,19 +1,93 @@
+import asyncio
+import json
 import logging
-from typing import List
+import os
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from typing import Iterator, List, Optional, Tuple
 
-import joblib
 import pandas as pd
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from hydra import compose, initialize
+from omegaconf import DictConfig
+from pydantic import TypeAdapter, ValidationError
+from starlette.requests import ClientDisconnect
 
 from src.experiment_tracker import create_experiment_tracker
 from src.messaging import create_messaging_client
-from src.pipeline import run_inference_pipeline
-from src.schemas import PredictionRequest, PredictionResponse
+from src.schemas import (
+    ColumnarPredictionRequest,
+    PredictionRequest,
+    PredictionResponse,
+    decode_columnar_request,
+)
+from src.serving import (
+    ActiveModel,
+    ExecutorSaturatedError,
+    InferenceExecutor,
+    MicroBatcher,
+    ModelBundle,
+    ModelWatcher,
+    PredictionCache,
+    ReadinessStatus,
+    load_model_bundle,
+    read_memory_usage,
+    warmup_plan,
+)
+from src.telemetry import REGISTRY, REQUEST_SECONDS, time_stage
+
+LABELS = {0: "malignant", 1: "benign"}
+PREDICTION_ROWS = TypeAdapter(List[PredictionRequest])
+logger = logging.getLogger()
+
+# Config and model bundle loaded by a pre-fork master process, if any
+_preloaded: Optional[Tuple[DictConfig, ModelBundle]] = None
+
+
+def preload(cfg: DictConfig, bundle: ModelBundle):
+    """
+    Registers artifacts loaded before forking the workers, so that every
+    worker serves the same (copy-on-write shared) model instead of loading
+    its own copy on startup.
+    """
+    global _preloaded
+    _preloaded = (cfg, bundle)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.status = ReadinessStatus()
+    app.state.active_model = None
+    app.state.watcher = None
+    app.state.batcher = None
+    app.state.executor = None
+    app.state.cache = None
+    app.state.messaging_client = None
+
+    REGISTRY.register_collector("serving_executor", lambda: _stats("executor"))
+    REGISTRY.register_collector("serving_batching", lambda: _stats("batcher"))
+    REGISTRY.register_collector("serving_cache", lambda: _stats("cache"))
+    REGISTRY.register_collector(
+        "messaging_publisher", lambda: _stats("messaging_client")
+    )
+    # Identifies the pre-fork worker that answered the scrape
+    REGISTRY.register_collector("process", lambda: {"pid": os.getpid()})
+
+    # Load in the background so the health endpoints answer while booting
+    startup = asyncio.create_task(_startup(app))
+    yield
+
+    startup.cancel()
+    await asyncio.gather(startup, return_exceptions=True)
+    _shutdown(app)
 
-app = FastAPI(title="Breast Cancer Classifier API")
+
+app = FastAPI(title="Breast Cancer Classifier API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -23,61 +97,440 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-LABELS = {0: "malignant", 1: "benign"}
-logger = logging.getLogger()
 
-with initialize(config_path="../../config"):
-    cfg = compose(config_name="config")
+async def _startup(app: FastAPI):
+    status = app.state.status
+
+    try:
+        start = time.perf_counter()
+        if _preloaded is not None:
+            cfg, preloaded_bundle = _preloaded
+        else:
+            preloaded_bundle = None
+            with initialize(config_path="../../config"):
+                cfg = compose(config_name="config")
+
+        model_name = cfg["model"]["name"]
+        serving_cfg = cfg["serving"]
+
+        # Artifacts and broker connection are loaded concurrently
+        tracker = create_experiment_tracker(
+            cfg["experiment_tracker"]["type"], cfg["experiment_tracker"]["params"]
+        )
+        messaging_client = create_messaging_client(
+            cfg["messaging"]["type"],
+            cfg["messaging"].get("params"),
+            cfg["messaging"].get("publisher"),
+        )
+        app.state.messaging_client = messaging_client
+        app.state.stream_chunk_size = serving_cfg["stream"]["chunk_size"]
+
+        bundle, messaging_seconds = await asyncio.gather(
+            _load_bundle(tracker, model_name, preloaded_bundle),
+            asyncio.to_thread(_timed, messaging_client.connect),
+        )
+        for name, seconds in bundle.timings.items():
+            status.record(name, seconds)
+        status.record("messaging", messaging_seconds)
+
+        if preloaded_bundle is None:
+            status.record(
+                "warmup",
+                await asyncio.to_thread(
+                    warmup_plan, bundle.plan, serving_cfg["warmup_rows"]
+                ),
+            )
+
+        active_model = ActiveModel(bundle)
+        app.state.active_model = active_model
+
+        # Dedicated executor for model scoring
+        executor_cfg = serving_cfg["executor"]
+        executor = InferenceExecutor(
+            active_model,
+            messaging_client,
+            executor_type=executor_cfg["type"],
+            max_workers=executor_cfg["max_workers"],
+            max_queue_size=executor_cfg["max_queue_size"],
+            warmup_rows=serving_cfg["warmup_rows"],
+        )
+        app.state.executor = executor
+        # Process workers warm their own copy of the model while starting
+        status.record("executor", await asyncio.to_thread(_timed, executor.start))
+
+        # Micro-batching of concurrent requests
+        batching_cfg = serving_cfg["batching"]
+        if batching_cfg["enabled"]:
+            batcher = MicroBatcher(
+                executor.submit,
+                max_batch_size=batching_cfg["max_batch_size"],
+                max_wait_ms=batching_cfg["max_wait_ms"],
+            )
+            batcher.start()
+            app.state.batcher = batcher
+
+        # Prediction cache in front of the model
+        reload_cfg = serving_cfg["reload"]
+        # A pre-fork master reloads the model and re-forks its workers instead,
+        # so the workers keep sharing its memory
+        watch_model = reload_cfg["enabled"] and preloaded_bundle is None
+        cache_cfg = serving_cfg["cache"]
+        cache = None
+        if cache_cfg["enabled"]:
+            cache = PredictionCache(
+                max_entries=cache_cfg["max_entries"],
+                ttl_seconds=cache_cfg["ttl_seconds"],
+                # With hot reload (or a pre-fork master) the model version only
+                # changes on swaps, the cache follows them instead
+                version_fn=(
+                    None
+                    if reload_cfg["enabled"] or preloaded_bundle is not None
+                    else lambda: tracker.get_model_version(model_name)
+                ),
+                version_check_interval=cache_cfg["version_check_interval"],
+            )
+            cache.set_version(bundle.version)
+            cache.start()
+            app.state.cache = cache
+
+        # Hot reload when the production alias moves
+        if watch_model:
+            watcher = ModelWatcher(
+                tracker,
+                model_name,
+                active_model,
+                poll_interval=reload_cfg["poll_interval"],
+                warmup_rows=serving_cfg["warmup_rows"],
+                drain_timeout=reload_cfg["drain_timeout"],
+                # Process workers for the new model start before the swap
+                on_prepare=executor.prepare,
+                on_swap=(
+                    (lambda new_bundle: cache.set_version(new_bundle.version))
+                    if cache is not None
+                    else None
+                ),
+                on_retire=executor.retire,
+            )
+            watcher.start()
+            app.state.watcher = watcher
+
+        status.record("total", time.perf_counter() - start)
+        status.mark_ready()
+        logger.info(f"API ready, model version {bundle.version}")
+
+    except Exception as e:
+        logger.exception("API startup failed.")
+        status.mark_failed(e)
+
 
+def _shutdown(app: FastAPI):
+    if app.state.watcher is not None:
+        app.state.watcher.stop()
+    if app.state.cache is not None:
+        app.state.cache.stop()
+    if app.state.batcher is not None:
+        app.state.batcher.stop()
+    if app.state.executor is not None:
+        app.state.executor.shutdown()
+    if app.state.messaging_client is not None:
+        app.state.messaging_client.close()
 
-model_name = cfg["model"]["name"]
 
-# Load artifacts
-tracker = create_experiment_tracker(
-    cfg["experiment_tracker"]["type"], cfg["experiment_tracker"]["params"]
+def _stats(component: str) -> dict:
+    instance = getattr(app.state, component, None)
+    return instance.stats() if instance is not None else {}
+
+
+async def _load_bundle(tracker, model_name: str, preloaded: Optional[ModelBundle]):
+    if preloaded is not None:
+        return preloaded
+
+    return await asyncio.to_thread(load_model_bundle, tracker, model_name)
+
+
+def _timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+@app.post(
+    "/predict",
+    response_model=List[PredictionResponse],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": PredictionRequest.model_json_schema(),
+                    }
+                }
+            },
+            "required": True,
+        }
+    },
 )
+async def predict(request: Request) -> List[PredictionResponse]:
+    with _timed_request("predict"):
+        body = await request.body()
+        # Parsed here rather than by FastAPI so the decode stage covers the
+        # JSON parsing and validation, as on /predict/columnar
+        try:
+            with time_stage("decode"):
+                inputs = PREDICTION_ROWS.validate_json(body)
+                input_df = pd.DataFrame([i.model_dump() for i in inputs])
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+            )
 
-model = tracker.load_model(model_name)
+        return await _predict_frame(input_df)
 
-transformer_path = tracker.get_artifact(model_name, path="artifact/transformer.pkl")
-transformer = joblib.load(transformer_path)
 
-# Create messaging client
-messaging_client = create_messaging_client(
-    cfg["messaging"]["type"], cfg["messaging"]["params"]
+@app.post(
+    "/predict/columnar",
+    response_model=List[PredictionResponse],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {
+                    "schema": ColumnarPredictionRequest.model_json_schema()
+                }
+            },
+            "required": True,
+        }
+    },
 )
-messaging_client.connect()
+async def predict_columnar(request: Request) -> List[PredictionResponse]:
+    with _timed_request("predict_columnar"):
+        body = await request.body()
+        try:
+            with time_stage("decode"):
+                input_df = decode_columnar_request(body)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+
+        return await _predict_frame(input_df)
+
+
+def _submit(input_df: pd.DataFrame) -> Future:
+    if app.state.batcher is not None:
+        return app.state.batcher.submit(input_df)
+
+    return app.state.executor.submit(input_df)
 
 
-@app.post("/predict", response_model=List[PredictionResponse])
-def predict(inputs: List[PredictionRequest]) -> List[PredictionResponse]:
-    input_df = pd.DataFrame([i.model_dump() for i in inputs])
+async def _score_with_cache(input_df: pd.DataFrame):
+    cache = app.state.cache
+    if cache is None:
+        return await asyncio.wrap_future(_submit(input_df))
+
+    # Hashing the rows is CPU-bound, keep it off the event loop
+    scored = await asyncio.to_thread(cache.predict, input_df, _submit)
+    return await asyncio.wrap_future(scored)
+
+
+async def _predict_frame(input_df: pd.DataFrame) -> List[PredictionResponse]:
+    if not app.state.status.is_ready:
+        raise HTTPException(status_code=503, detail="Model is not ready")
 
     try:
-        preds, probs = run_inference_pipeline(
-            model, transformer, input_df, messaging_client
-        )
+        with time_stage("score"):
+            preds, probs = await _score_with_cache(input_df)
 
-        responses = []
-        for pred, prob in zip(preds, probs):
-            predicted_class = int(pred)
-            predicted_prob = float(prob[predicted_class])
-            label = LABELS[predicted_class]
-
-            responses.append(
-                PredictionResponse(
-                    prediction=predicted_class,
-                    prediction_prob=predicted_prob,
-                    label=label,
-                )
-            )
+        with time_stage("encode"):
+            return _build_responses(preds, probs)
 
-        return responses
+    except ExecutorSaturatedError:
+        raise HTTPException(status_code=503, detail="Inference queue is full")
 
     except Exception:
         logger.exception("Prediction failed")
         return []
 
 
+@contextmanager
+def _timed_request(endpoint: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - start)
+
+
+def _build_responses(preds, probs) -> List[PredictionResponse]:
+    responses = []
+    for pred, prob in zip(preds, probs):
+        predicted_class = int(pred)
+        predicted_prob = float(prob[predicted_class])
+        label = LABELS[predicted_class]
+
+        responses.append(
+            PredictionResponse(
+                prediction=predicted_class,
+                prediction_prob=predicted_prob,
+                label=label,
+            )
+        )
+
+    return responses
+
+
+class _BodyStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body iterator is the only reader of `receive`.
+
+    Below ASGI 2.4 the stock response also listens for disconnects on
+    `receive` while streaming, which consumes the request body chunks that
+    the iterator has not read yet. A disconnect still surfaces to the
+    iterator through `request.stream()`, or through `send` failing.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+        if self.background is not None:
+            await self.background()
+
+
+@app.post("/predict/stream")
+async def predict_stream(request: Request) -> StreamingResponse:
+    """
+    Scores an NDJSON body (one PredictionRequest per line) in chunks of
+    `serving.stream.chunk_size` rows and streams one NDJSON response per input
+    line as soon as each chunk is scored. Invalid lines produce an error line
+    in place of their prediction.
+    """
+    if not app.state.status.is_ready:
+        raise HTTPException(status_code=503, detail="Model is not ready")
+
+    return _BodyStreamingResponse(
+        _stream_predictions(request, app.state.stream_chunk_size),
+        media_type="application/x-ndjson",
+    )
+
+
+async def _stream_predictions(request: Request, chunk_size: int):
+    chunk = []
+    async for line_number, line in _iter_ndjson_lines(request):
+        try:
+            chunk.append(PredictionRequest.model_validate_json(line))
+        except ValidationError as e:
+            chunk.append({"line": line_number, "error": e.errors(include_url=False)})
+
+        if len(chunk) >= chunk_size:
+            yield await _score_stream_chunk(chunk)
+            chunk = []
+
+    if chunk:
+        yield await _score_stream_chunk(chunk)
+
+
+async def _iter_ndjson_lines(request: Request):
+    buffer = b""
+    line_number = 0
+    async for data in request.stream():
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+
+    if buffer.strip():
+        yield line_number + 1, buffer
+
+
+async def _score_stream_chunk(chunk: list) -> bytes:
+    rows = [item for item in chunk if isinstance(item, PredictionRequest)]
+    responses = None
+
+    if rows:
+        input_df = pd.DataFrame([row.model_dump() for row in rows])
+        try:
+            while True:
+                try:
+                    preds, probs = await app.state.executor.predict(input_df)
+                    break
+                except ExecutorSaturatedError:
+                    # Bulk scoring yields to interactive traffic instead of failing
+                    await asyncio.sleep(0.05)
+
+            responses = iter(_build_responses(preds, probs))
+
+        except Exception:
+            logger.exception("Prediction failed")
+
+    lines = []
+    for item in chunk:
+        if not isinstance(item, PredictionRequest):
+            lines.append(json.dumps(item, default=str))
+        elif responses is None:
+            lines.append(json.dumps({"error": "Prediction failed"}))
+        else:
+            lines.append(next(responses).model_dump_json())
+
+    return ("\n".join(lines) + "\n").encode()
+
+
+@app.get("/stats")
+def stats() -> dict:
+    state = app.state
+    return {
+        "batching": state.batcher.stats() if state.batcher is not None else None,
+        "executor": state.executor.stats() if state.executor is not None else None,
+        "cache": state.cache.stats() if state.cache is not None else None,
+        "messaging": _stats("messaging_client"),
+    }
+
+
+@app.get("/metrics")
+def metrics() -> PlainTextResponse:
+    """
+    Metrics of this process only: behind the pre-fork server each scrape is
+    answered by a single worker.
+    """
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/model")
+def model_status() -> JSONResponse:
+    state = app.state
+    if state.active_model is None:
+        return JSONResponse({"status": state.status.phase}, status_code=503)
+
+    return JSONResponse(
+        {
+            **state.active_model.status(),
+            "watcher": state.watcher.status() if state.watcher is not None else None,
+        }
+    )
+
+
+@app.get("/memory")
+def memory() -> dict:
+    return {"pid": os.getpid(), **read_memory_usage()}
+
+
+@app.get("/healthz")
+def healthz() -> JSONResponse:
+    status = app.state.status
+    return JSONResponse(
+        status.to_dict(), status_code=503 if status.phase == "failed" else 200
+    )
+
+
+@app.get("/readyz")
+def readyz() -> JSONResponse:
+    status = app.state.status
+    return JSONResponse(status.to_dict(), status_code=200 if status.is_ready else 503)
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
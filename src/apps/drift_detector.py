@@ -1,14 +1,96 @@
 import json
+import logging
+import multiprocessing as mp
+import os
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from queue import Empty
+from typing import List, Optional, Tuple
 
 import hydra
+import numpy as np
 import pandas as pd
 
 from src.experiment_tracker import create_experiment_tracker
-from src.messaging import create_messaging_client
-from src.monitoring import DriftDetector, DriftState
+from src.messaging import ReceivedMessage, create_messaging_client, decode_message
+from src.monitoring import (
+    BaseDriftDetector,
+    DriftState,
+    ReferenceProfile,
+    StreamingDriftDetector,
+    create_drift_detector,
+)
 
+logger = logging.getLogger()
+
+
+def decode_events(
+    messages: List[dict],
+) -> Optional[Tuple[pd.DataFrame, pd.Series, np.ndarray]]:
+    """Une los eventos de varios mensajes en entradas, probabilidades y pesos."""
+    # Los mensajes pueden agrupar varios eventos de predicción
+    events = [
+        event
+        for message in messages
+        for event in (message["events"] if "events" in message else [message])
+        if len(event["probabilities"])
+    ]
+    if not events:
+        return None
+
+    input_data = pd.concat([event["input_data"] for event in events], ignore_index=True)
+    probs = pd.DataFrame(
+        np.concatenate([event["probabilities"] for event in events]),
+        columns=["class_0", "class_1"],
+    )
+
+    # Peso de muestreo de cada fila (1 si el evento no se muestreó)
+    weights = np.concatenate(
+        [
+            np.asarray(event.get("weights", 1.0), dtype=float)
+            * np.ones(len(event["probabilities"]))
+            for event in events
+        ]
+    )
+
+    return input_data, probs.iloc[:, 1], np.nan_to_num(weights, nan=1.0)
+
+
+class _QueueConsumer(ABC):
+    """Consume la cola de predicciones, mensaje a mensaje o por lotes."""
+
+    def _consume(self, cfg):
+        self.messaging_client = create_messaging_client(
+            cfg["messaging"]["type"], cfg["messaging"]["params"]
+        )
+        self.messaging_client.connect()
+
+        # Con `consume_batch_size` se procesan varios mensajes de una vez
+        batch_size = cfg["drift"].get("consume_batch_size")
+        if batch_size:
+            self.messaging_client.start_consuming(self._batch_callback, batch_size)
+        else:
+            self.messaging_client.start_consuming(self._callback)
+
+    def _callback(self, ch, method, properties, body):
+        """Procesa cada mensaje de la cola."""
+        self._process([decode_message(body, getattr(properties, "content_type", None))])
+
+    def _batch_callback(self, messages: List[ReceivedMessage]):
+        """Procesa un lote de mensajes de la cola con una sola escritura."""
+        self._process(
+            [decode_message(message.body, message.content_type) for message in messages]
+        )
+
+    @abstractmethod
+    def _process(self, messages: List[dict]):
+        pass
+
+
+class DriftChecker:
+    """Compara el buffer de datos recientes con los datos de entrenamiento."""
 
-class DriftConsumer:
     def __init__(self, cfg):
         self.cfg = cfg
         self.model_name = cfg["model"]["name"]
@@ -18,20 +100,58 @@ class DriftConsumer:
         self.tracker = create_experiment_tracker(
             cfg["experiment_tracker"]["type"], cfg["experiment_tracker"]["params"]
         )
-        self._load_training_data()
+        self.training_data: Optional[pd.DataFrame] = None
+        self.training_preds: Optional[pd.DataFrame] = None
+        self.reference_profile = self._load_reference_profile()
 
-        # Inicializar detector de drift
-        self.drift_state = DriftState(
-            cfg["drift"]["path"], buffer_size=cfg["drift"]["buffer_size"]
-        )
-        self.drift_detector = DriftDetector(self.training_data, self.training_preds)
+        # Inicializar detector de drift. El backend de Evidently necesita las
+        # filas de entrenamiento, que se cargan la primera vez que se usa
+        self.drift_state = self._create_drift_state(cfg)
+        self.drift_backend = cfg["drift"].get("backend", "evidently")
+        self.drift_detector: Optional[BaseDriftDetector] = None
 
-        # Create messaging client
-        self.messaging_client = create_messaging_client(
-            cfg["messaging"]["type"], cfg["messaging"]["params"]
-        )
-        self.messaging_client.connect()
-        self.messaging_client.start_consuming(self._callback)
+        # Puntuación continua del drift con sketches, entre informes completos
+        streaming = dict(cfg["drift"].get("streaming") or {})
+        self.streaming_detector = None
+        if streaming.pop("enabled", False):
+            self.score_every = streaming.pop("score_every", 1000)
+            self._unscored_rows = 0
+            self.streaming_detector = StreamingDriftDetector(
+                self.reference_profile, **streaming
+            )
+
+    def _create_drift_state(self, cfg) -> DriftState:
+        return DriftState(cfg["drift"]["path"], buffer_size=cfg["drift"]["buffer_size"])
+
+    def _load_reference_profile(self) -> ReferenceProfile:
+        try:
+            profile_path = self.tracker.get_artifact(
+                self.model_name, path="dataset/reference_profile.json"
+            )
+            return ReferenceProfile.load(profile_path)
+        except Exception:
+            # Modelos entrenados antes de que existiera el perfil
+            logger.warning(
+                "Reference profile not found, computing it from the training data."
+            )
+            self._load_training_data()
+            return ReferenceProfile.from_frames(
+                self.training_data,
+                self.training_preds,
+                bins=self.cfg["drift"].get("reference_bins", 10),
+            )
+
+    def _get_drift_detector(self) -> BaseDriftDetector:
+        if self.drift_detector is None:
+            if self.drift_backend == "evidently" and self.training_data is None:
+                self._load_training_data()
+            self.drift_detector = create_drift_detector(
+                self.drift_backend,
+                reference_profile=self.reference_profile,
+                training_data=self.training_data,
+                training_preds=self.training_preds,
+            )
+        return self.drift_detector
 
     def _load_training_data(self):
         train_data_path = self.tracker.get_artifact(
@@ -42,29 +162,209 @@ class DriftConsumer:
         self.training_data = train_data.drop(["target", "pred", "proba"], axis=1)
         self.training_preds = train_data[["proba"]]
 
-    def _callback(self, ch, method, properties, body):
-        """Procesa cada mensaje de la cola."""
-        message = json.loads(body)
+    def add(self, input_data: pd.DataFrame, proba: pd.Series, weights: np.ndarray):
+        should_check = self.drift_state.add_input(input_data, proba, weights)
+        self._analyze(input_data, proba, weights, should_check)
 
-        input_data = pd.read_json(message["input_data"])
-        probs = pd.DataFrame(message["probabilities"], columns=["class_0", "class_1"])
-
-        should_check = self.drift_state.add_input(input_data, probs.iloc[:, 1])
+    def _analyze(
+        self,
+        input_data: pd.DataFrame,
+        proba: pd.Series,
+        weights: np.ndarray,
+        should_check: bool,
+    ):
+        """Actualiza el drift continuo y, con el buffer lleno, genera el informe."""
+        if self.streaming_detector is not None:
+            self._update_streaming(input_data, proba, weights)
 
         if should_check:
             current_data, current_preds = self.drift_state.get_buffer_data()
-            result = self.drift_detector.check_drift(current_data, current_preds)
+            drift_detector = self._get_drift_detector()
+            result = drift_detector.check_drift(current_data, current_preds)
 
             if result.get("error"):
-                print(f"Drift detection failed: {result['error']}")
+                logger.error(f"Drift detection failed: {result['error']}")
             else:
-                print("Drift detection report generated.")
-                self.drift_detector.save_report_html(self.drift_output_path)
+                logger.info("Drift detection report generated.")
+                drift_detector.save_report(self.drift_output_path)
+
+    def _update_streaming(
+        self, input_data: pd.DataFrame, proba: pd.Series, weights: np.ndarray
+    ):
+        self.streaming_detector.update(
+            input_data, proba.to_frame(name="proba"), weights
+        )
+        self._unscored_rows += len(input_data)
+        if self._unscored_rows < self.score_every:
+            return
+
+        self._unscored_rows = 0
+        result = self.streaming_detector.score()
+
+        path = Path(self.drift_output_path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "streaming_drift.json").write_text(json.dumps(result))
+
+        logger.info(
+            f"Streaming drift over {result['rows']} rows: "
+            f"data={result['is_data_drift_detected']} "
+            f"prediction={result['is_pred_drift_detected']}"
+        )
+
+
+class DriftConsumer(DriftChecker, _QueueConsumer):
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        self._consume(cfg)
+
+    def _process(self, messages: List[dict]):
+        decoded = decode_events(messages)
+        if decoded is not None:
+            self.add(*decoded)
+
+
+# -----------------------------
+# Sharded mode
+# -----------------------------
+
+
+class DriftShard(_QueueConsumer):
+    """
+    Consumidor de una partición de la cola: decodifica los mensajes y los
+    acumula en su propio buffer, que entrega al merger cada vez que se llena.
+    Los shards compiten por los mensajes de la misma cola, así que cada uno
+    recibe una parte del tráfico.
+
+    El buffer solo se vacía cuando el merger confirma su recepción en `acks`,
+    así que si el merger termina antes, el shard lo recupera de sus segmentos
+    al reiniciarse.
+    """
+
+    def __init__(self, cfg, index: int, partials: mp.Queue, acks: mp.Queue):
+        self.index = index
+        self.partials = partials
+        self.acks = acks
+
+        shards = cfg["drift"]["shards"]
+        partial_size = max(1, -(-cfg["drift"]["buffer_size"] // shards))
+        self.drift_state = DriftState(
+            Path(cfg["drift"]["path"]) / "shards" / str(index), partial_size
+        )
+
+        self._consume(cfg)
+
+    def _process(self, messages: List[dict]):
+        decoded = decode_events(messages)
+        if decoded is None:
+            return
+
+        if self.drift_state.add_input(*decoded):
+            data, preds = self.drift_state.get_buffer_data(weighted=False)
+            self.partials.put((self.index, os.getpid(), data, preds))
+            self._wait_merged()
+            self.drift_state.reset()
+
+    def _wait_merged(self):
+        merger = mp.parent_process()
+        while True:
+            try:
+                return self.acks.get(timeout=1.0)
+            except Empty:
+                if merger is not None and not merger.is_alive():
+                    # El buffer parcial sigue en los segmentos del shard
+                    logger.error(
+                        f"Drift merger exited before merging shard {self.index}"
+                    )
+                    sys.exit(1)
+
+
+class DriftMerger(DriftChecker):
+    """
+    Recibe los buffers parciales de los shards y los une en el buffer común
+    sobre el que se calcula el drift. Reinicia los shards que terminan.
+
+    Los shards guardan sus filas hasta que el merger las confirma, así que el
+    buffer común solo se mantiene en memoria. Los buffers parciales de un
+    shard que ya se ha reiniciado se descartan: el nuevo shard los recupera de
+    sus segmentos.
+    """
+
+    def __init__(self, cfg):
+        super().__init__(cfg)
+        self.num_shards = cfg["drift"]["shards"]
+
+        context = mp.get_context("spawn")
+        self.context = context
+        self.partials = context.Queue()
+        self.acks = {}
+        self.shards = {}
+
+    def _create_drift_state(self, cfg) -> DriftState:
+        return DriftState(None, buffer_size=cfg["drift"]["buffer_size"])
+
+    def run(self):
+        for index in range(self.num_shards):
+            self._start_shard(index)
+
+        while True:
+            try:
+                partial = self.partials.get(timeout=1.0)
+            except Empty:
+                self._restart_stopped_shards()
+                continue
+
+            self._merge(*partial)
+
+    def _merge(self, index: int, pid: int, data: pd.DataFrame, preds: pd.DataFrame):
+        if self.shards[index].pid != pid:
+            logger.warning(f"Dropping partial buffer of stopped shard {index}")
+            return
+
+        logger.info(f"Merging {len(data)} rows from shard {index}")
+        proba, weights = preds["proba"], preds["weight"].to_numpy()
+        should_check = self.drift_state.add_input(data, proba, weights)
+
+        # El shard sigue consumiendo mientras se calcula el drift
+        self.acks[index].put(len(data))
+
+        try:
+            self._analyze(data, proba, weights, should_check)
+        except Exception:
+            logger.exception("Drift check of the merged buffer failed.")
+
+    def _start_shard(self, index: int):
+        # Cola nueva, para que el shard reiniciado no reciba confirmaciones viejas
+        self.acks[index] = self.context.Queue()
+        process = self.context.Process(
+            target=_run_shard,
+            args=(self.cfg, index, self.partials, self.acks[index]),
+            name=f"drift-shard-{index}",
+            daemon=True,
+        )
+        process.start()
+        self.shards[index] = process
+        logger.info(f"Started drift shard {index} (pid {process.pid})")
+
+    def _restart_stopped_shards(self):
+        for index, process in list(self.shards.items()):
+            if not process.is_alive():
+                logger.warning(
+                    f"Drift shard {index} exited with code {process.exitcode}, "
+                    "restarting"
+                )
+                self._start_shard(index)
+
+
+def _run_shard(cfg, index: int, partials: mp.Queue, acks: mp.Queue):
+    DriftShard(cfg, index, partials, acks)
 
 
 @hydra.main(config_path="../../config", config_name="config")
 def main(cfg):
-    DriftConsumer(cfg)
+    if cfg["drift"].get("shards", 1) > 1:
+        DriftMerger(cfg).run()
+    else:
+        DriftConsumer(cfg)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,20 @@
+import hydra
+from omegaconf import DictConfig
+
+from src.messaging import LocalBroker
+
+
+@hydra.main(config_path="../../config", config_name="config")
+def main(cfg: DictConfig):
+    """Runs the broker used by the `local` messaging client."""
+    params = cfg["messaging"]["params"]
+    broker = LocalBroker(
+        params["address"],
+        authkey=params.get("authkey", "local-broker").encode(),
+        **cfg["messaging"].get("broker", {}),
+    )
+    broker.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
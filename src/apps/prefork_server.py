@@ -0,0 +1,239 @@
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+
+import hydra
+import uvicorn
+from omegaconf import DictConfig
+
+from src.experiment_tracker import create_experiment_tracker
+from src.serving import load_model_bundle, read_memory_usage, warmup_plan
+
+logger = logging.getLogger()
+
+MB = 1024 * 1024
+
+
+class PreforkServer:
+    """
+    Loads the model once in the master process and forks Uvicorn workers that
+    share its memory copy-on-write. The master supervises the workers,
+    respawning the ones that exit, and periodically reports how much of each
+    worker's resident memory is still shared with the others.
+
+    With `serving.reload.enabled` the master, not the workers, polls the model
+    alias: a new version is loaded and warmed up in the master and the
+    workers are replaced one by one by fresh forks, so they keep sharing a
+    single copy of the model. Replaced workers finish their in-flight
+    requests before exiting.
+    """
+
+    def __init__(self, cfg: DictConfig):
+        prefork_cfg = cfg["serving"]["prefork"]
+
+        self.cfg = cfg
+        self.host = prefork_cfg["host"]
+        self.port = prefork_cfg["port"]
+        self.num_workers = prefork_cfg["workers"]
+        self.memory_report_interval = prefork_cfg["memory_report_interval"]
+        self.reload_enabled = cfg["serving"]["reload"]["enabled"]
+        self.poll_interval = cfg["serving"]["reload"]["poll_interval"]
+
+        self.tracker = None
+        self.version = None
+        self.workers = {}  # pid -> worker index
+        self.retiring = set()  # pids of replaced workers still draining
+        self.socket = None
+        self.should_exit = False
+
+    def run(self):
+        self._preload()
+        self.socket = self._bind()
+
+        signal.signal(signal.SIGTERM, self._handle_exit)
+        signal.signal(signal.SIGINT, self._handle_exit)
+
+        for index in range(self.num_workers):
+            self._spawn(index)
+
+        self._supervise()
+
+    # -----------------------------
+    # Master
+    # -----------------------------
+
+    def _preload(self):
+        self.tracker = create_experiment_tracker(
+            self.cfg["experiment_tracker"]["type"],
+            self.cfg["experiment_tracker"]["params"],
+        )
+        self._install(load_model_bundle(self.tracker, self.cfg["model"]["name"]))
+
+    def _install(self, bundle):
+        # Imported here so the app module is part of the shared master image
+        from src.api import endpoints
+
+        bundle.timings["warmup"] = warmup_plan(
+            bundle.plan, self.cfg["serving"]["warmup_rows"]
+        )
+        endpoints.preload(self.cfg, bundle)
+        self.version = bundle.version
+
+        # Move everything allocated so far to the permanent generation, so the
+        # collector never touches (and copies) the shared pages in the workers.
+        # Unfreezing first lets the collector free a replaced bundle.
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+
+        logger.info(
+            f"Master {os.getpid()} preloaded model version {bundle.version} "
+            f"({read_memory_usage().get('rss', 0) / MB:.1f} MB RSS)"
+        )
+
+    def check_reload(self) -> bool:
+        """
+        Reloads the model in the master and replaces the workers if the alias
+        moved. Returns True if the workers were replaced.
+        """
+        model_name = self.cfg["model"]["name"]
+        try:
+            version = self.tracker.get_model_version(model_name)
+            if version == self.version:
+                return False
+
+            logger.info(f"Model version {version} available, reloading in the master")
+            self._install(load_model_bundle(self.tracker, model_name))
+
+        except Exception:
+            logger.exception("Model reload failed, keeping the current workers.")
+            return False
+
+        self._replace_workers()
+        return True
+
+    def _replace_workers(self):
+        for pid, index in list(self.workers.items()):
+            # The new worker is up before the old one stops accepting requests
+            self._spawn(index)
+            del self.workers[pid]
+            self.retiring.add(pid)
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self.retiring.discard(pid)
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        logger.info(f"Listening on http://{self.host}:{self.port}")
+        return sock
+
+    def _spawn(self, index: int):
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+
+        self.workers[pid] = index
+        logger.info(f"Started worker {index} (pid {pid})")
+
+    def _supervise(self):
+        last_report = last_reload_check = time.monotonic()
+
+        while self.workers or self.retiring:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+
+            if pid in self.retiring:
+                self.retiring.discard(pid)
+                continue
+
+            if pid:
+                index = self.workers.pop(pid)
+                if not self.should_exit:
+                    logger.warning(
+                        f"Worker {index} (pid {pid}) exited with status {status}, "
+                        "respawning"
+                    )
+                    self._spawn(index)
+                continue
+
+            if time.monotonic() - last_report >= self.memory_report_interval:
+                self.report_memory()
+                last_report = time.monotonic()
+
+            if (
+                self.reload_enabled
+                and not self.should_exit
+                and time.monotonic() - last_reload_check >= self.poll_interval
+            ):
+                self.check_reload()
+                last_reload_check = time.monotonic()
+
+            time.sleep(0.5)
+
+        logger.info("All workers stopped")
+
+    def _handle_exit(self, signum, frame):
+        self.should_exit = True
+        for pid in list(self.workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def report_memory(self) -> dict:
+        report = {index: read_memory_usage(pid) for pid, index in self.workers.items()}
+
+        for index, usage in sorted(report.items()):
+            if not usage:
+                continue
+            logger.info(
+                f"Worker {index}: rss={usage['rss'] / MB:.1f} MB "
+                f"shared={usage['shared'] / MB:.1f} MB "
+                f"private={usage['private'] / MB:.1f} MB "
+                f"pss={usage['pss'] / MB:.1f} MB"
+            )
+
+        total_pss = sum(usage.get("pss", 0) for usage in report.values())
+        total_pss += read_memory_usage().get("pss", 0)
+        logger.info(f"Total PSS (master + workers): {total_pss / MB:.1f} MB")
+
+        return report
+
+    # -----------------------------
+    # Worker
+    # -----------------------------
+
+    def _run_worker(self):
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+        from src.api.endpoints import app
+
+        exit_code = 0
+        try:
+            server = uvicorn.Server(uvicorn.Config(app, log_config=None))
+            server.run(sockets=[self.socket])
+        except Exception:
+            logger.exception("Worker crashed.")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+
+@hydra.main(config_path="../../config", config_name="config")
+def main(cfg: DictConfig):
+    PreforkServer(cfg).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -61,6 +61,10 @@ class ExperimentTracker(ABC):
     def load_model(self, model_name: str, alias: str = "production"):
         pass
 
+    @abstractmethod
+    def get_model_version(self, model_name: str, alias: str = "production") -> str:
+        pass
+
     @abstractmethod
     def get_artifact(self, model_name: str, path: str, alias: str = "production"):
         pass
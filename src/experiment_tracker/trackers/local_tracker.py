@@ -154,17 +154,7 @@ class LocalTracker(ExperimentTracker):
                 json.dump(aliases_data, f, indent=2)
 
     def load_model(self, model_name: str, alias: str = "production"):
-        aliases_file = self.models_dir / "aliases.json"
-        if not aliases_file.exists():
-            raise FileNotFoundError(f"No aliases.json found in {self.models_dir}")
-
-        with open(aliases_file, "r") as f:
-            aliases_data = json.load(f)
-
-        if alias not in aliases_data:
-            raise ValueError(f"Alias '{alias}' not found in aliases.json")
-
-        version = aliases_data[alias]
+        version = self._resolve_alias(alias)
         versions_file = self.models_dir / "versions.json"
         with open(versions_file, "r") as f:
             versions_data = json.load(f)
@@ -180,6 +170,22 @@ class LocalTracker(ExperimentTracker):
 
         return joblib.load(model_path)
 
+    def get_model_version(self, model_name: str, alias: str = "production") -> str:
+        return self._resolve_alias(alias)
+
+    def _resolve_alias(self, alias: str) -> str:
+        aliases_file = self.models_dir / "aliases.json"
+        if not aliases_file.exists():
+            raise FileNotFoundError(f"No aliases.json found in {self.models_dir}")
+
+        with open(aliases_file, "r") as f:
+            aliases_data = json.load(f)
+
+        if alias not in aliases_data:
+            raise ValueError(f"Alias '{alias}' not found in aliases.json")
+
+        return aliases_data[alias]
+
     def get_artifact(self, model_name: str, path: str, alias: str = "production"):
         # Resolver alias → versión
         aliases_file = self.models_dir / "aliases.json"
@@ -80,6 +80,9 @@ class MLflowTracker(ExperimentTracker):
     def load_model(self, model_name: str, alias: str = "production"):
         return mlflow.sklearn.load_model(f"models:/{model_name}@{alias}")
 
+    def get_model_version(self, model_name: str, alias: str = "production") -> str:
+        return str(self.client.get_model_version_by_alias(model_name, alias).version)
+
     def get_artifact(self, model_name: str, path: str, alias: str = "production"):
         run_id = self.client.get_model_version_by_alias(model_name, alias).run_id
 
@@ -114,6 +114,14 @@ class WandbTracker(ExperimentTracker):
         model_dir = Path(artifact.download())
         return joblib.load(model_dir / "model.pkl")
 
+    def get_model_version(self, model_name: str, alias: str = "production") -> str:
+        api = wandb.Api()
+        artifact_ref = f"{self.experiment_name}/{model_name}:{alias}"
+        if self.entity:
+            artifact_ref = f"{self.entity}/{artifact_ref}"
+
+        return api.artifact(artifact_ref, type="model").version
+
     def get_artifact(self, model_name: str, path: str, alias: str = "production"):
         api = wandb.Api()
         artifact_ref = f"{self.experiment_name}/{model_name}:{alias}"
@@ -4,22 +4,37 @@ import pandas as pd
 
 logger = logging.getLogger()
 
+MAP_MONTHS = {
+    "jan": 0,
+    "feb": 1,
+    "mar": 2,
+    "apr": 3,
+    "may": 4,
+    "jun": 5,
+    "jul": 6,
+    "ago": 7,
+    "sep": 8,
+    "oct": 9,
+    "nov": 10,
+    "dec": 11,
+}
 
-def preprocess_data(X: pd.DataFrame) -> pd.DataFrame:
-    map_months = {
-        "jan": 0,
-        "feb": 1,
-        "mar": 2,
-        "apr": 3,
-        "may": 4,
-        "jun": 5,
-        "jul": 6,
-        "ago": 7,
-        "sep": 8,
-        "oct": 9,
-        "nov": 10,
-        "dec": 11,
-    }
-    X["month"] = X["month"].map(map_months)
+
+def preprocess_data(X: pd.DataFrame, inplace: bool = True) -> pd.DataFrame:
+    """
+    Applies the domain preprocessing shared by training and inference.
+
+    Args:
+        X (pd.DataFrame): Raw features.
+        inplace (bool): Whether to modify `X` in place. When False the caller's
+            frame is left untouched and only the mapped columns are allocated.
+
+    Returns:
+        pd.DataFrame: Preprocessed features.
+    """
+    if not inplace:
+        X = X.copy(deep=False)
+
+    X["month"] = X["month"].map(MAP_MONTHS)
 
     return X
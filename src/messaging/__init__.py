@@ -1,2 +1,6 @@
-from .base import MqClient
+from .base import ChannelPool, MqClient, ReceivedMessage
+from .brokers import LocalBroker
 from .factory import create_messaging_client
+from .publishers import BackgroundPublisher, BatchingPublisher, SamplingPublisher
+from .samplers import Sampler, create_sampler
+from .serializers import MessageSerializer, create_serializer, decode_message
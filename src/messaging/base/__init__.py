@@ -1 +1,3 @@
+from .channel_pool import ChannelPool
 from .mq_client import MqClient
+from .received_message import ReceivedMessage
@@ -0,0 +1,140 @@
+import logging
+import threading
+from contextlib import contextmanager
+from queue import Empty, LifoQueue
+from typing import Callable, Dict, Generic, Iterator, List, Optional, TypeVar
+
+logger = logging.getLogger()
+
+T = TypeVar("T")
+
+
+class ChannelPool(Generic[T]):
+    """
+    Thread-safe pool of broker channels (or any resource that must not be used
+    by two threads at once). Channels are created lazily with `factory`, up to
+    `size`; a thread holds one exclusively between `acquire` and its release
+    and waits up to `timeout` seconds when all of them are in use.
+
+    A channel whose use raises is closed with `close` and replaced on demand,
+    since its connection state is unknown. Idle channels for which `is_open`
+    returns False are replaced when they are checked out, and `fresh=True`
+    replaces an idle channel with a new one, e.g. to retry on a new
+    connection after the previous one turned out to be dead.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], T],
+        size: int = 4,
+        close: Optional[Callable[[T], None]] = None,
+        timeout: float = 10.0,
+        is_open: Optional[Callable[[T], bool]] = None,
+    ):
+        if size < 1:
+            raise ValueError("The pool needs at least one channel")
+
+        self.factory = factory
+        self.size = size
+        self.close_fn = close
+        self.timeout = timeout
+        self.is_open = is_open
+
+        self._idle: LifoQueue = LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._channels: List[T] = []
+        self._in_use = 0
+        self._waits = 0
+        self._discarded = 0
+
+    @contextmanager
+    def acquire(self, fresh: bool = False) -> Iterator[T]:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._waits += 1
+            if not self._slots.acquire(timeout=self.timeout):
+                raise TimeoutError("No channel available in the pool")
+
+        try:
+            channel = self._checkout(fresh)
+        except Exception:
+            self._slots.release()
+            raise
+
+        try:
+            yield channel
+        except Exception:
+            self._discard(channel)
+            raise
+        else:
+            with self._lock:
+                self._in_use -= 1
+            self._idle.put(channel)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        with self._lock:
+            channels, self._channels = self._channels, []
+
+        while True:
+            try:
+                self._idle.get_nowait()
+            except Empty:
+                break
+
+        for channel in channels:
+            self._close(channel)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "pool_size": self.size,
+                "pool_open": len(self._channels),
+                "pool_in_use": self._in_use,
+                "pool_waits": self._waits,
+                "pool_discarded": self._discarded,
+            }
+
+    def _checkout(self, fresh: bool = False) -> T:
+        while True:
+            try:
+                channel = self._idle.get_nowait()
+            except Empty:
+                break
+
+            if not fresh and (self.is_open is None or self.is_open(channel)):
+                with self._lock:
+                    self._in_use += 1
+                return channel
+
+            self._remove(channel)
+            if fresh:
+                break
+
+        channel = self.factory()
+        with self._lock:
+            self._channels.append(channel)
+            self._in_use += 1
+        return channel
+
+    def _discard(self, channel: T):
+        with self._lock:
+            self._in_use -= 1
+        self._remove(channel)
+
+    def _remove(self, channel: T):
+        with self._lock:
+            self._discarded += 1
+            if channel in self._channels:
+                self._channels.remove(channel)
+        self._close(channel)
+
+    def _close(self, channel: T):
+        if self.close_fn is None:
+            return
+        try:
+            self.close_fn(channel)
+        except Exception:
+            logger.debug("Error closing pooled channel.", exc_info=True)
@@ -1,7 +1,12 @@
 from abc import ABC, abstractmethod
+from typing import Optional
+
+from src.messaging.serializers import JsonSerializer, MessageSerializer
 
 
 class MqClient(ABC):
+    serializer: MessageSerializer = JsonSerializer()
+
     @abstractmethod
     def connect(self, max_retries=10, delay=5):
         pass
@@ -11,9 +16,18 @@ class MqClient(ABC):
         pass
 
     @abstractmethod
-    def start_consuming(self, callback):
+    def start_consuming(self, callback, batch_size: Optional[int] = None):
+        """
+        Consumes messages from the queue. By default `callback` is called with
+        every message; with `batch_size` it receives lists of up to that many
+        `ReceivedMessage`.
+        """
         pass
 
     @abstractmethod
     def close(self):
         pass
+
+    def stats(self) -> dict:
+        """Client counters (queue depth, published messages, ...), if any."""
+        return {}
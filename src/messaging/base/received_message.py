@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class ReceivedMessage:
+    """Message handed to batch consumer callbacks."""
+
+    body: bytes
+    content_type: Optional[str] = None
@@ -0,0 +1 @@
+from .local_broker import LocalBroker
@@ -0,0 +1,217 @@
+import logging
+import os
+import threading
+from collections import deque
+from itertools import count
+from multiprocessing.connection import Connection, Listener
+from typing import Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger()
+
+# (content_type, body)
+Message = Tuple[Optional[str], bytes]
+
+
+class _Queue:
+    def __init__(self):
+        self.messages: Deque[Message] = deque()
+        self.unacked: Dict[int, Dict[int, Message]] = {}  # session -> tag -> message
+        self.consumers = 0
+        self.published = 0
+        self.delivered = 0
+        self.acked = 0
+        self.requeued = 0
+        self.dropped = 0
+
+
+class LocalBroker:
+    """
+    Minimal message broker for load testing without RabbitMQ. It keeps named
+    in-memory queues and serves them over a Unix socket to `LocalMQClient`
+    instances running in any process of the host.
+
+    Consumers pull messages and acknowledge them, so several consumers of the
+    same queue compete for messages and the unacknowledged messages of a
+    consumer that disconnects are delivered again.
+    """
+
+    def __init__(
+        self,
+        address: str = ".local_broker.sock",
+        authkey: bytes = b"local-broker",
+        max_messages: int = 1_000_000,
+    ):
+        self.address = address
+        self.authkey = authkey
+        self.max_messages = max_messages
+
+        self._queues: Dict[str, _Queue] = {}
+        self._condition = threading.Condition()
+        self._sessions = count(1)
+        self._listener: Optional[Listener] = None
+        self._running = False
+
+    def serve_forever(self):
+        if os.path.exists(self.address):
+            os.unlink(self.address)
+
+        self._listener = Listener(self.address, "AF_UNIX", authkey=self.authkey)
+        self._running = True
+        logger.info(f"Local broker listening on {self.address}")
+
+        while self._running:
+            try:
+                conn = self._listener.accept()
+            except OSError:
+                break
+            except Exception:
+                logger.exception("Rejected local broker connection.")
+                continue
+
+            threading.Thread(
+                target=self._serve, args=(conn,), name="local-broker", daemon=True
+            ).start()
+
+    def start(self) -> threading.Thread:
+        """Serves in a background thread, mostly useful for tests."""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._running = False
+        if self._listener is not None:
+            self._listener.close()
+        with self._condition:
+            self._condition.notify_all()
+
+    # -----------------------------
+    # Sessions
+    # -----------------------------
+
+    def _serve(self, conn: Connection):
+        session = next(self._sessions)
+        tags = count(1)  # delivery tags of the session
+        consuming = set()
+
+        try:
+            while True:
+                command, *args = conn.recv()
+
+                if command == "publish":
+                    self._publish(*args)
+                elif command == "get":
+                    queue, max_messages, timeout = args
+                    if queue not in consuming:
+                        consuming.add(queue)
+                        self._add_consumer(queue)
+                    conn.send(self._get(session, tags, queue, max_messages, timeout))
+                elif command == "ack":
+                    self._ack(session, *args)
+                elif command == "nack":
+                    self._nack(session, *args)
+                elif command == "stats":
+                    conn.send(self.stats(*args))
+                else:
+                    raise ValueError(f"Unknown local broker command: {command}")
+
+        except (EOFError, OSError):
+            pass
+        except Exception:
+            logger.exception("Local broker session failed.")
+        finally:
+            conn.close()
+            self._close_session(session, consuming)
+
+    def _close_session(self, session: int, consuming: set):
+        with self._condition:
+            for name, queue in self._queues.items():
+                pending = queue.unacked.pop(session, {})
+                # Unacknowledged messages go back to the head of the queue
+                for tag in sorted(pending, reverse=True):
+                    queue.messages.appendleft(pending[tag])
+                queue.requeued += len(pending)
+                if name in consuming:
+                    queue.consumers -= 1
+
+            self._condition.notify_all()
+
+    # -----------------------------
+    # Queues
+    # -----------------------------
+
+    def _queue(self, name: str) -> _Queue:
+        queue = self._queues.get(name)
+        if queue is None:
+            queue = self._queues[name] = _Queue()
+        return queue
+
+    def _add_consumer(self, name: str):
+        with self._condition:
+            self._queue(name).consumers += 1
+
+    def _publish(self, name: str, content_type: Optional[str], body: bytes):
+        with self._condition:
+            queue = self._queue(name)
+            if len(queue.messages) >= self.max_messages:
+                queue.dropped += 1
+                return
+
+            queue.messages.append((content_type, body))
+            queue.published += 1
+            self._condition.notify()
+
+    def _get(self, session: int, tags, name: str, max_messages: int, timeout):
+        with self._condition:
+            queue = self._queue(name)
+            self._condition.wait_for(
+                lambda: queue.messages or not self._running, timeout=timeout
+            )
+
+            unacked = queue.unacked.setdefault(session, {})
+            deliveries = []
+            while queue.messages and len(deliveries) < max_messages:
+                tag = next(tags)
+                message = queue.messages.popleft()
+                unacked[tag] = message
+                deliveries.append((tag, *message))
+
+            queue.delivered += len(deliveries)
+            return deliveries
+
+    def _ack(self, session: int, name: str, tag: int, multiple: bool):
+        with self._condition:
+            queue = self._queue(name)
+            unacked = queue.unacked.get(session, {})
+            tags = [t for t in unacked if t <= tag] if multiple else [tag]
+            for t in tags:
+                if unacked.pop(t, None) is not None:
+                    queue.acked += 1
+
+    def _nack(self, session: int, name: str, tag: int, multiple: bool, requeue: bool):
+        with self._condition:
+            queue = self._queue(name)
+            unacked = queue.unacked.get(session, {})
+            tags = sorted(t for t in unacked if t <= tag) if multiple else [tag]
+            rejected = [unacked.pop(t) for t in tags if t in unacked]
+
+            if requeue:
+                queue.messages.extendleft(reversed(rejected))
+                queue.requeued += len(rejected)
+                self._condition.notify_all()
+            else:
+                queue.dropped += len(rejected)
+
+    def stats(self, name: str) -> Dict:
+        with self._condition:
+            queue = self._queue(name)
+            return {
+                "queue_depth": len(queue.messages),
+                "unacked": sum(len(tags) for tags in queue.unacked.values()),
+                "consumers": queue.consumers,
+                "published": queue.published,
+                "delivered": queue.delivered,
+                "acked": queue.acked,
+                "requeued": queue.requeued,
+                "dropped": queue.dropped,
+            }
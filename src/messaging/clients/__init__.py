@@ -1,2 +1,3 @@
 from .dummy_client import DummyMQClient
+from .local_client import LocalMQClient
 from .rabbitmq_client import RabbitMQClient
@@ -1,4 +1,5 @@
 import logging
+from typing import Optional
 
 from src.messaging.base import MqClient
 
@@ -6,13 +7,13 @@ logger = logging.getLogger()
 
 
 class DummyMQClient(MqClient):
-    def connect(self):
+    def connect(self, max_retries=10, delay=5):
         pass
 
     def send_message(self, message: dict):
         pass
 
-    def start_consuming(self, callback):
+    def start_consuming(self, callback, batch_size: Optional[int] = None):
         pass
 
     def close(self):
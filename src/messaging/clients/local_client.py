@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+from multiprocessing.connection import Client, Connection
+from types import SimpleNamespace
+from typing import Dict, Optional
+
+from src.messaging.base import MqClient, ReceivedMessage
+from src.messaging.serializers import SerializerType, create_serializer
+
+logger = logging.getLogger()
+
+
+class LocalMQClient(MqClient):
+    """
+    Client of the `LocalBroker` (see `src.apps.local_broker`). It has the same
+    consuming semantics as `RabbitMQClient`: messages are pulled in groups of
+    up to `prefetch_count` and acknowledged with `multiple=True` once the
+    callback succeeds.
+    """
+
+    def __init__(
+        self,
+        address: str = ".local_broker.sock",
+        queue: str = "predictions_queue",
+        serializer: SerializerType = "json",
+        authkey: str = "local-broker",
+        prefetch_count: int = 1000,
+        ack_every: int = 100,
+        consume_timeout: float = 1.0,
+        requeue_on_error: bool = False,
+    ):
+        self.address = address
+        self.queue = queue
+        self.serializer = create_serializer(serializer)
+        self.authkey = authkey.encode()
+        self.prefetch_count = prefetch_count
+        self.ack_every = ack_every
+        self.consume_timeout = consume_timeout
+        self.requeue_on_error = requeue_on_error
+
+        self.connection: Optional[Connection] = None
+        self._lock = threading.Lock()
+        # Consuming blocks on the broker, so it uses its own connection
+        self._consumer: Optional[Connection] = None
+
+    def connect(self, max_retries=10, delay=5):
+        for i in range(max_retries):
+            try:
+                self.connection = self._open()
+                logger.info(f"Connected to local broker at {self.address}")
+                return
+
+            except (FileNotFoundError, ConnectionRefusedError):
+                logger.warning(
+                    f"Local broker not available, retry {i + 1}/{max_retries} "
+                    f"in {delay}s..."
+                )
+                time.sleep(delay)
+
+        raise ConnectionError(f"Could not connect to local broker at {self.address}")
+
+    def send_message(self, message: dict):
+        body = self.serializer.dumps(message)
+        self._send(("publish", self.queue, self.serializer.content_type, body))
+
+    def start_consuming(self, callback, batch_size: Optional[int] = None):
+        if self.connection is None:
+            raise ConnectionError("Not connected to the local broker")
+
+        self._consumer = self._open()
+        logger.info("Waiting for messages...")
+        try:
+            if batch_size:
+                self._consume_batches(callback, batch_size)
+            else:
+                self._consume_messages(callback)
+        except (EOFError, OSError):
+            logger.info("Local broker connection closed while consuming")
+
+    def close(self):
+        with self._lock:
+            for connection in (self.connection, self._consumer):
+                if connection is not None:
+                    connection.close()
+            self.connection = self._consumer = None
+            logger.info("Local broker connection closed")
+
+    def stats(self) -> Dict:
+        if self.connection is None:
+            return {}
+
+        return {"broker": self._request(("stats", self.queue))}
+
+    # -----------------------------
+    # Consuming
+    # -----------------------------
+
+    def _consume_messages(self, callback):
+        last_tag, unacked = None, 0
+
+        while True:
+            deliveries = self._get(self.prefetch_count)
+            if not deliveries and unacked:
+                self._ack(last_tag)
+                last_tag, unacked = None, 0
+
+            for tag, content_type, body in deliveries:
+                method = SimpleNamespace(delivery_tag=tag)
+                properties = SimpleNamespace(content_type=content_type)
+                try:
+                    callback(None, method, properties, body)
+                except Exception:
+                    logger.exception("Error processing the message.")
+                    if unacked:
+                        self._ack(last_tag)
+                        last_tag, unacked = None, 0
+                    self._nack(tag, multiple=False)
+                    continue
+
+                last_tag, unacked = tag, unacked + 1
+                if unacked >= self.ack_every:
+                    self._ack(last_tag)
+                    last_tag, unacked = None, 0
+
+    def _consume_batches(self, callback, batch_size: int):
+        while True:
+            deliveries = self._get(batch_size)
+            if not deliveries:
+                continue
+
+            messages = [ReceivedMessage(body, ctype) for _, ctype, body in deliveries]
+            last_tag = deliveries[-1][0]
+            try:
+                callback(messages)
+                self._ack(last_tag)
+            except Exception:
+                logger.exception(
+                    f"Error processing a batch of {len(messages)} messages."
+                )
+                self._nack(last_tag, multiple=True)
+
+    def _get(self, max_messages: int):
+        self._consumer.send(("get", self.queue, max_messages, self.consume_timeout))
+        return self._consumer.recv()
+
+    def _ack(self, tag: int):
+        self._consumer.send(("ack", self.queue, tag, True))
+
+    def _nack(self, tag: int, multiple: bool):
+        self._consumer.send(("nack", self.queue, tag, multiple, self.requeue_on_error))
+
+    # -----------------------------
+    # Connection
+    # -----------------------------
+
+    def _open(self) -> Connection:
+        return Client(self.address, "AF_UNIX", authkey=self.authkey)
+
+    def _send(self, command: tuple):
+        with self._lock:
+            if self.connection is None:
+                raise ConnectionError("Not connected to the local broker")
+            self.connection.send(command)
+
+    def _request(self, command: tuple):
+        with self._lock:
+            if self.connection is None:
+                raise ConnectionError("Not connected to the local broker")
+            self.connection.send(command)
+            return self.connection.recv()
@@ -1,19 +1,54 @@
-import json
 import logging
 import time
+from typing import Optional
 
 import pika
 
-from src.messaging.base import MqClient
+from src.messaging.base import ChannelPool, MqClient, ReceivedMessage
+from src.messaging.serializers import SerializerType, create_serializer
 
 logger = logging.getLogger()
 
+# Errores de un canal o una conexión que ya no sirven (p. ej. una conexión
+# inactiva que el broker cerró por no responder a los heartbeats)
+DEAD_CHANNEL_ERRORS = (
+    pika.exceptions.AMQPConnectionError,
+    pika.exceptions.ChannelClosed,
+    pika.exceptions.ChannelWrongStateError,
+)
+
 
 class RabbitMQClient(MqClient):
-    def __init__(self, host: str, port: int, queue: str):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        queue: str,
+        serializer: SerializerType = "json",
+        confirm_delivery: bool = True,
+        pool_size: int = 4,
+        prefetch_count: int = 1000,
+        ack_every: int = 100,
+        consume_timeout: float = 1.0,
+        requeue_on_error: bool = False,
+    ):
         self.host = host
         self.port = port
         self.queue = queue
+        self.serializer = create_serializer(serializer)
+        # Con confirmaciones, publicar falla si el broker no acepta el mensaje
+        self.confirm_delivery = confirm_delivery
+        # Las conexiones de pika no son thread-safe: cada hilo publica por un
+        # canal (con su propia conexión) tomado del pool
+        self.pool_size = pool_size
+        self.pool: Optional[ChannelPool] = None
+
+        # Consumo: mensajes sin confirmar como máximo, cada cuántos mensajes se
+        # confirman y cuánto se espera antes de procesar un lote incompleto
+        self.prefetch_count = prefetch_count
+        self.ack_every = ack_every
+        self.consume_timeout = consume_timeout
+        self.requeue_on_error = requeue_on_error
         self.connection = None
         self.channel = None
 
@@ -21,11 +56,16 @@ class RabbitMQClient(MqClient):
         """Conectar con RabbitMQ con reintentos."""
         for i in range(max_retries):
             try:
-                self.connection = pika.BlockingConnection(
-                    pika.ConnectionParameters(host=self.host, port=self.port)
+                pool = ChannelPool(
+                    self._open_channel,
+                    self.pool_size,
+                    close=_close_channel,
+                    is_open=_is_open,
                 )
-                self.channel = self.connection.channel()
-                self.channel.queue_declare(queue=self.queue)
+                # El primer canal del pool comprueba que el broker responde
+                with pool.acquire():
+                    pass
+                self.pool = pool
                 logger.info("Conectado a RabbitMQ")
                 return
 
@@ -41,31 +81,153 @@ class RabbitMQClient(MqClient):
 
     def send_message(self, message: dict):
         """Publicar un mensaje en la cola."""
-        if self.channel is None:
+        if self.pool is None:
             raise ConnectionError("No conectado a RabbitMQ")
 
-        self.channel.basic_publish(
-            exchange="",
-            routing_key=self.queue,
-            body=json.dumps(message),
-        )
-        logger.info(f"Mensaje enviado a RabbitMQ: {message}")
+        body = self.serializer.dumps(message)
+        try:
+            self._publish(body)
+        except DEAD_CHANNEL_ERRORS:
+            # El pool ya ha descartado el canal: se reintenta una vez por una
+            # conexión nueva
+            logger.warning("Canal de RabbitMQ caído, reintentando con uno nuevo")
+            self._publish(body, fresh=True)
+        logger.debug(f"Mensaje enviado a RabbitMQ ({len(body)} bytes)")
+
+    def _publish(self, body: bytes, fresh: bool = False):
+        with self.pool.acquire(fresh=fresh) as channel:
+            channel.basic_publish(
+                exchange="",
+                routing_key=self.queue,
+                body=body,
+                properties=pika.BasicProperties(
+                    content_type=self.serializer.content_type
+                ),
+            )
 
-    def start_consuming(self, callback):
-        """Comenzar a consumir mensajes de la cola."""
+    def start_consuming(self, callback, batch_size: Optional[int] = None):
+        """
+        Comenzar a consumir mensajes de la cola con confirmación manual.
+
+        Los mensajes se confirman (`multiple=True`) solo después de que el
+        callback termine sin errores, así que un consumidor que se cae no
+        pierde los mensajes en curso. Con `batch_size` el callback recibe una
+        lista de `ReceivedMessage`.
+        """
         if self.channel is None:
-            raise ConnectionError("No conectado a RabbitMQ")
+            if self.pool is None:
+                raise ConnectionError("No conectado a RabbitMQ")
 
-        self.channel.basic_consume(
-            queue=self.queue,
-            on_message_callback=callback,
-            auto_ack=True,
-        )
+            # El canal de consumo solo se abre al empezar a consumir
+            self.channel = self._open_channel()
+            self.connection = self.channel.connection
+
+        if batch_size and batch_size > self.prefetch_count:
+            logger.warning(
+                f"batch_size ({batch_size}) es mayor que prefetch_count "
+                f"({self.prefetch_count}), los lotes se cerrarán por tiempo"
+            )
+
+        self.channel.basic_qos(prefetch_count=self.prefetch_count)
         logger.info("Esperando mensajes...")
-        self.channel.start_consuming()
+
+        if batch_size:
+            self._consume_batches(callback, batch_size)
+        else:
+            self._consume_messages(callback)
+
+    def _consume_messages(self, callback):
+        last_tag, unacked = None, 0
+
+        for method, properties, body in self._deliveries():
+            if method is None:
+                # Cola inactiva: confirmar lo procesado hasta ahora
+                if unacked:
+                    self.channel.basic_ack(last_tag, multiple=True)
+                    last_tag, unacked = None, 0
+                continue
+
+            try:
+                callback(self.channel, method, properties, body)
+            except Exception:
+                logger.exception("Error procesando el mensaje.")
+                if unacked:
+                    self.channel.basic_ack(last_tag, multiple=True)
+                    last_tag, unacked = None, 0
+                self.channel.basic_nack(
+                    method.delivery_tag, requeue=self.requeue_on_error
+                )
+                continue
+
+            last_tag, unacked = method.delivery_tag, unacked + 1
+            if unacked >= self.ack_every:
+                self.channel.basic_ack(last_tag, multiple=True)
+                last_tag, unacked = None, 0
+
+    def _consume_batches(self, callback, batch_size: int):
+        batch, last_tag = [], None
+        deadline = time.monotonic() + self.consume_timeout
+
+        for method, properties, body in self._deliveries():
+            if method is not None:
+                batch.append(ReceivedMessage(body, properties.content_type))
+                last_tag = method.delivery_tag
+
+            if not batch:
+                deadline = time.monotonic() + self.consume_timeout
+                continue
+
+            # Sin mensajes nuevos durante `consume_timeout` se procesa lo que haya
+            idle = method is None
+            if not idle and len(batch) < batch_size and time.monotonic() < deadline:
+                continue
+
+            try:
+                callback(batch)
+                self.channel.basic_ack(last_tag, multiple=True)
+            except Exception:
+                logger.exception(f"Error procesando un lote de {len(batch)} mensajes.")
+                self.channel.basic_nack(
+                    last_tag, multiple=True, requeue=self.requeue_on_error
+                )
+
+            batch = []
+            deadline = time.monotonic() + self.consume_timeout
+
+    def _deliveries(self):
+        # Devuelve (None, None, None) cuando no llega nada en `consume_timeout`
+        return self.channel.consume(
+            self.queue, auto_ack=False, inactivity_timeout=self.consume_timeout
+        )
 
     def close(self):
         """Cerrar conexión."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
         if self.connection and self.connection.is_open:
             self.connection.close()
             logger.info("Conexión a RabbitMQ cerrada")
+
+    def stats(self) -> dict:
+        return self.pool.stats() if self.pool is not None else {}
+
+    def _open_channel(self):
+        connection = pika.BlockingConnection(
+            pika.ConnectionParameters(host=self.host, port=self.port)
+        )
+        channel = connection.channel()
+        channel.queue_declare(queue=self.queue)
+        if self.confirm_delivery:
+            channel.confirm_delivery()
+        return channel
+
+
+def _is_open(channel) -> bool:
+    return channel.is_open and channel.connection.is_open
+
+
+def _close_channel(channel):
+    if channel.connection.is_open:
+        channel.connection.close()
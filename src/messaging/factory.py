@@ -2,29 +2,72 @@ import logging
 from typing import Any, Dict, Literal, Optional
 
 from src.messaging.base import MqClient
-from src.messaging.clients import DummyMQClient, RabbitMQClient
+from src.messaging.clients import DummyMQClient, LocalMQClient, RabbitMQClient
+from src.messaging.publishers import (
+    BackgroundPublisher,
+    BatchingPublisher,
+    SamplingPublisher,
+)
+from src.messaging.samplers import create_sampler
 
 logger = logging.getLogger()
 
-MqType = Literal["dummy", "rabbitmq"]
+MqType = Literal["dummy", "local", "rabbitmq"]
 
 
 def create_messaging_client(
-    mq_type: MqType, params: Optional[Dict[str, Any]] = None
+    mq_type: MqType,
+    params: Optional[Dict[str, Any]] = None,
+    publisher: Optional[Dict[str, Any]] = None,
 ) -> MqClient:
     try:
         logger.info(f"Creating messaging client: '{mq_type}'")
         params = params or {}
 
         if mq_type == "dummy":
-            return DummyMQClient(**params)
+            client = DummyMQClient(**params)
+
+        elif mq_type == "local":
+            client = LocalMQClient(**params)
 
         elif mq_type == "rabbitmq":
-            return RabbitMQClient(**params)
+            if (publisher or {}).get("mode") == "background":
+                # Only the publisher I/O thread publishes: extra pooled
+                # connections would sit idle, miss their heartbeats and be
+                # dropped by the broker
+                params = {**params, "pool_size": 1}
+            client = RabbitMQClient(**params)
 
         else:
             raise ValueError(f"Unsupported messaging client type: {mq_type}")
 
+        return _wrap_publisher(client, publisher)
+
     except Exception as e:
         logger.exception("Error creating messaging client instance.")
         raise e
+
+
+def _wrap_publisher(client: MqClient, publisher: Optional[Dict[str, Any]]):
+    publisher = dict(publisher or {})
+    mode = publisher.pop("mode", "sync")
+    batching = publisher.pop("batching", None)
+    sampling = dict(publisher.pop("sampling", None) or {})
+
+    if mode == "background":
+        logger.info(f"Publishing in background with {publisher}")
+        client = BackgroundPublisher(client, **publisher)
+
+    elif mode != "sync":
+        raise ValueError(f"Unsupported publisher mode: {mode}")
+
+    if batching:
+        logger.info(f"Coalescing prediction events with {dict(batching)}")
+        client = BatchingPublisher(client, **batching)
+
+    # Every scored row is published unless a sampling policy is chosen
+    if sampling.get("policy", "none") != "none":
+        logger.info(f"Sampling monitoring traffic with {sampling}")
+        client = SamplingPublisher(client, create_sampler(**sampling))
+
+    return client
@@ -0,0 +1,3 @@
+from .background_publisher import BackgroundPublisher
+from .batching_publisher import BatchingPublisher
+from .sampling_publisher import SamplingPublisher
@@ -0,0 +1,244 @@
+import logging
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from queue import Empty, Full, Queue
+from typing import Deque, Dict, Literal, Optional
+
+from src.messaging.base import MqClient
+from src.messaging.publishers.segment_spool import SegmentSpool
+
+logger = logging.getLogger()
+
+OverflowPolicy = Literal["drop", "block", "spill"]
+
+# Spilled messages replayed between two checks of the live queue
+REPLAY_CHUNK = 100
+
+
+class BackgroundPublisher(MqClient):
+    """
+    Decorates a messaging client so that `send_message` only enqueues the
+    message into a bounded in-memory queue. A dedicated I/O thread owns the
+    wrapped client, connects it and drains the queue to the broker.
+
+    When the queue is full the overflow policy decides what happens:
+    `drop` discards the message, `block` waits up to `block_timeout` seconds
+    for room (then drops) and `spill` appends it to an on-disk segment spool.
+    With `spill`, messages that cannot be published (broker down, publish not
+    confirmed) are spooled as well, and the I/O thread replays the spool when
+    the live queue is empty. Reconnections back off exponentially from
+    `backoff_initial` up to `backoff_max` seconds, so the request path never
+    waits for the broker.
+    """
+
+    def __init__(
+        self,
+        client: MqClient,
+        queue_size: int = 10000,
+        overflow: OverflowPolicy = "drop",
+        block_timeout: float = 1.0,
+        spool_dir: str = ".spool/messages",
+        segment_bytes: int = 64 * 1024 * 1024,
+        backoff_initial: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        if overflow not in ("drop", "block", "spill"):
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
+
+        self.client = client
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.spool = (
+            SegmentSpool(spool_dir, segment_bytes) if overflow == "spill" else None
+        )
+
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self._backoff = backoff_initial
+        self._reconnect_after = 0.0
+        self._connected = False
+
+        self._replay_path: Optional[Path] = None
+        self._replay_records: Deque[bytes] = deque()
+        self._replay_rate = 0.0
+
+        self._queue: Queue = Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stats_lock = threading.Lock()
+        self._counters = {
+            "enqueued": 0,
+            "published": 0,
+            "dropped": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "failed": 0,
+            "reconnects": 0,
+        }
+
+    # -----------------------------
+    # MqClient interface
+    # -----------------------------
+
+    def connect(self, max_retries=10, delay=5):
+        """Starts the I/O thread, which connects the client in the background."""
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="mq-publisher", daemon=True
+        )
+        self._thread.start()
+
+    def send_message(self, message: dict):
+        try:
+            if self.overflow == "block":
+                self._queue.put(message, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(message)
+            self._count("enqueued")
+
+        except Full:
+            self._spill_or_drop(message)
+
+    def start_consuming(self, callback, batch_size: Optional[int] = None):
+        self.client.start_consuming(callback, batch_size)
+
+    def close(self, timeout: float = 5.0):
+        """Stops the I/O thread after draining the queue and closes the client."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        if self.spool is not None:
+            self.spool.close()
+        self.client.close()
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            counters = dict(self._counters)
+
+        return {
+            **(self.client.stats() if self._connected else {}),
+            **counters,
+            **(self.spool.stats() if self.spool is not None else {}),
+            "connected": self._connected,
+            "queue_depth": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "overflow": self.overflow,
+            "replay_pending": len(self._replay_records),
+            "replay_rate": self._replay_rate,
+        }
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self._counters[name] += amount
+
+    # -----------------------------
+    # I/O thread
+    # -----------------------------
+
+    def _run(self):
+        while self._running or not self._queue.empty():
+            if not self._connected:
+                self._reconnect()
+
+            # Without spilled messages waiting, block briefly on the live queue
+            timeout = 0 if self._connected and self._replay_records else 0.1
+            try:
+                message = self._queue.get(timeout=timeout)
+            except Empty:
+                self._replay()
+                continue
+
+            if not self._connected or not self._send(message):
+                self._spill_or_drop(message)
+
+    def _reconnect(self):
+        if time.monotonic() < self._reconnect_after:
+            return
+
+        try:
+            self.client.connect(max_retries=1, delay=0)
+        except Exception:
+            logger.warning(f"Broker unavailable, retrying in {self._backoff:.1f}s")
+            self._reconnect_after = time.monotonic() + self._backoff
+            self._backoff = min(self._backoff * 2, self.backoff_max)
+            return
+
+        self._connected = True
+        self._backoff = self.backoff_initial
+        self._count("reconnects")
+
+    def _send(self, message: dict) -> bool:
+        try:
+            self.client.send_message(message)
+            self._count("published")
+            return True
+
+        except Exception:
+            logger.exception("Failed to publish message.")
+            self._count("failed")
+            self._disconnect()
+            return False
+
+    def _disconnect(self):
+        self._connected = False
+        self._reconnect_after = time.monotonic() + self._backoff
+        try:
+            self.client.close()
+        except Exception:
+            logger.debug("Error closing the messaging client.", exc_info=True)
+
+    # -----------------------------
+    # Spool
+    # -----------------------------
+
+    def _spill_or_drop(self, message: dict):
+        if self.spool is None:
+            self._count("dropped")
+            return
+
+        try:
+            self.spool.append([self.client.serializer.dumps(message)])
+            self._count("spilled")
+        except Exception:
+            logger.exception("Failed to spill message.")
+            self._count("dropped")
+
+    def _replay(self):
+        if self.spool is None or not self._connected:
+            return
+
+        if not self._replay_records:
+            segment = self.spool.read_oldest()
+            if segment is None:
+                return
+            self._replay_path, records = segment
+            self._replay_records.extend(records)
+
+        start = time.perf_counter()
+        replayed = 0
+        while self._replay_records and replayed < REPLAY_CHUNK:
+            message = self.client.serializer.loads(self._replay_records[0])
+            if not self._send(message):
+                # Stays pending until the broker is back
+                return
+
+            self._replay_records.popleft()
+            replayed += 1
+
+        self._count("replayed", replayed)
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            self._replay_rate = replayed / elapsed
+
+        # The segment is only deleted once every record has been published
+        if not self._replay_records:
+            self.spool.remove(self._replay_path)
+            self._replay_path = None
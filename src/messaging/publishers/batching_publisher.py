@@ -0,0 +1,134 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.messaging.base import MqClient
+
+logger = logging.getLogger()
+
+
+class BatchingPublisher(MqClient):
+    """
+    Decorates a messaging client so that prediction events are coalesced and
+    published as a single `{"events": [...]}` message once `max_rows` rows
+    are pending or the oldest pending event is `max_delay_ms` old.
+
+    Only the flusher thread publishes through the wrapped client.
+    """
+
+    def __init__(self, client: MqClient, max_rows: int = 500, max_delay_ms=200):
+        self.client = client
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+
+        self._pending: List[dict] = []
+        self._pending_rows = 0
+        self._oldest: Optional[float] = None
+        self._condition = threading.Condition()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._batches = 0
+        self._events = 0
+        self._rows = 0
+
+    # -----------------------------
+    # MqClient interface
+    # -----------------------------
+
+    def connect(self, max_retries=10, delay=5):
+        self.client.connect(max_retries=max_retries, delay=delay)
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="mq-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def send_message(self, message: dict):
+        with self._condition:
+            first = not self._pending
+            if first:
+                self._oldest = time.monotonic()
+
+            self._pending.append(message)
+            self._pending_rows += len(message.get("probabilities", ()))
+
+            # Wake the flusher to arm the delay timer or to flush a full batch
+            if first or self._pending_rows >= self.max_rows:
+                self._condition.notify()
+
+    def start_consuming(self, callback, batch_size: Optional[int] = None):
+        self.client.start_consuming(callback, batch_size)
+
+    def close(self, timeout: float = 5.0):
+        """Flushes the pending events and closes the wrapped client."""
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        self.client.close()
+
+    def stats(self) -> Dict:
+        with self._condition:
+            return {
+                **self.client.stats(),
+                "batches": self._batches,
+                "batched_events": self._events,
+                "batched_rows": self._rows,
+                "mean_rows_per_batch": self._rows / self._batches
+                if self._batches
+                else 0.0,
+                "pending_rows": self._pending_rows,
+            }
+
+    # -----------------------------
+    # Flusher thread
+    # -----------------------------
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and not self._is_due():
+                    timeout = (
+                        self._oldest + self.max_delay - time.monotonic()
+                        if self._pending
+                        else None
+                    )
+                    self._condition.wait(timeout)
+
+                events, rows = self._pending, self._pending_rows
+                self._pending, self._pending_rows, self._oldest = [], 0, None
+                running = self._running
+
+            if events:
+                self._flush(events, rows)
+
+            if not running:
+                return
+
+    def _is_due(self) -> bool:
+        if not self._pending:
+            return False
+
+        return (
+            self._pending_rows >= self.max_rows
+            or time.monotonic() - self._oldest >= self.max_delay
+        )
+
+    def _flush(self, events: List[dict], rows: int):
+        try:
+            self.client.send_message({"events": events})
+        except Exception:
+            logger.exception(f"Failed to publish a batch of {len(events)} events.")
+            return
+
+        with self._condition:
+            self._batches += 1
+            self._events += len(events)
+            self._rows += rows
@@ -0,0 +1,65 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+from src.messaging.base import MqClient
+from src.messaging.samplers import Sampler
+
+logger = logging.getLogger()
+
+
+class SamplingPublisher(MqClient):
+    """
+    Decorates a messaging client so that only the rows selected by `sampler`
+    are published. Runs on the request path, before any batching or
+    background publishing, so dropped rows cost nothing downstream.
+    """
+
+    def __init__(self, client: MqClient, sampler: Sampler):
+        self.client = client
+        self.sampler = sampler
+
+        self._lock = threading.Lock()
+        self._rows_in = 0
+        self._rows_out = 0
+
+    def connect(self, max_retries=10, delay=5):
+        self.client.connect(max_retries=max_retries, delay=delay)
+
+    def send_message(self, message: dict):
+        with self._lock:
+            self._rows_in += len(message["probabilities"])
+            events = self.sampler.sample(message)
+            self._rows_out += sum(len(event["probabilities"]) for event in events)
+
+        for event in events:
+            self.client.send_message(event)
+
+    def start_consuming(self, callback, batch_size: Optional[int] = None):
+        self.client.start_consuming(callback, batch_size)
+
+    def close(self):
+        """Publishes the rows still held by the sampler and closes the client."""
+        with self._lock:
+            events = self.sampler.flush()
+
+        for event in events:
+            try:
+                self.client.send_message(event)
+            except Exception:
+                logger.exception("Failed to publish the sampled events.")
+                break
+
+        self.client.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                **self.client.stats(),
+                "sampling_policy": type(self.sampler).__name__,
+                "sampled_rows_in": self._rows_in,
+                "sampled_rows_out": self._rows_out,
+                "sampling_ratio": self._rows_out / self._rows_in
+                if self._rows_in
+                else 0.0,
+            }
@@ -0,0 +1,160 @@
+import fcntl
+import itertools
+import logging
+import os
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+logger = logging.getLogger()
+
+# Every record is prefixed by its length and the CRC32 of its body
+RECORD_HEADER = struct.Struct(">II")
+SEGMENT_SUFFIX = ".seg"
+SLOT_PREFIX = "slot-"
+LOCK_NAME = "LOCK"
+
+
+class SegmentSpool:
+    """
+    Durable append-only spool of serialized messages. Records are appended to
+    the active segment file, which is rotated once it grows past
+    `segment_bytes`. Segments are read back oldest first and deleted once
+    their records have been handed over, so the spool survives restarts.
+
+    Records whose CRC does not match (e.g. a torn write after a crash) are
+    skipped when the segment is read.
+
+    Several processes (e.g. the workers of the pre-fork server) can share the
+    same `directory`: each one claims the first `slot-NNN` subdirectory it
+    can lock exclusively and only touches the segments in it. The lock is
+    released when the spool is closed or the process exits, so a restarted
+    process takes over the slot (and the segments) of a stopped one.
+    """
+
+    def __init__(
+        self, directory: str, segment_bytes: int = 64 * 1024 * 1024, fsync: bool = False
+    ):
+        self.root = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+
+        self._lock = threading.Lock()
+        self._active: Optional[BinaryIO] = None
+        self._active_path: Optional[Path] = None
+        self._corrupt = 0
+
+        self.directory, self._slot_lock = _claim_slot(self.root)
+        segments = self._segments()
+        self._next_sequence = int(segments[-1].stem) + 1 if segments else 0
+        self._bytes = sum(path.stat().st_size for path in segments)
+
+    def append(self, records: List[bytes]):
+        with self._lock:
+            if self._active is None:
+                self._open_segment()
+
+            for body in records:
+                self._active.write(RECORD_HEADER.pack(len(body), zlib.crc32(body)))
+                self._active.write(body)
+                self._bytes += RECORD_HEADER.size + len(body)
+
+            self._active.flush()
+            if self.fsync:
+                os.fsync(self._active.fileno())
+
+            if self._active.tell() >= self.segment_bytes:
+                self._close_segment()
+
+    def read_oldest(self) -> Optional[Tuple[Path, List[bytes]]]:
+        """
+        Returns the oldest segment and its valid records, closing the active
+        segment if it is the only one. The caller deletes it with `remove`.
+        """
+        with self._lock:
+            segments = self._segments()
+            if not segments:
+                return None
+
+            if segments[0] == self._active_path:
+                self._close_segment()
+
+            path = segments[0]
+            return path, self._read(path)
+
+    def remove(self, path: Path):
+        with self._lock:
+            size = path.stat().st_size if path.exists() else 0
+            path.unlink(missing_ok=True)
+            self._bytes -= size
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+            if not self._slot_lock.closed:
+                # Closing the lock file releases the slot
+                self._slot_lock.close()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "spool_segments": len(self._segments()),
+                "spool_bytes": self._bytes,
+                "spool_corrupt_records": self._corrupt,
+                "spool_slot": self.directory.name,
+            }
+
+    # -----------------------------
+    # Segments
+    # -----------------------------
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def _open_segment(self):
+        name = f"{self._next_sequence:012d}{SEGMENT_SUFFIX}"
+        self._active_path = self.directory / name
+        self._active = open(self._active_path, "ab")
+        self._next_sequence += 1
+
+    def _close_segment(self):
+        if self._active is not None:
+            self._active.close()
+        self._active = None
+        self._active_path = None
+
+    def _read(self, path: Path) -> List[bytes]:
+        data = path.read_bytes()
+        records, offset = [], 0
+
+        while offset + RECORD_HEADER.size <= len(data):
+            size, crc = RECORD_HEADER.unpack_from(data, offset)
+            offset += RECORD_HEADER.size
+            body = data[offset : offset + size]
+            offset += size
+
+            if len(body) != size or zlib.crc32(body) != crc:
+                self._corrupt += 1
+                logger.warning(f"Skipping corrupt spool record in {path.name}")
+                continue
+            records.append(body)
+
+        return records
+
+
+def _claim_slot(root: Path) -> Tuple[Path, BinaryIO]:
+    """Locks the first free slot subdirectory of `root`."""
+    for index in itertools.count():
+        slot = root / f"{SLOT_PREFIX}{index:03d}"
+        slot.mkdir(parents=True, exist_ok=True)
+
+        lock = open(slot / LOCK_NAME, "ab")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            continue
+
+        return slot, lock
@@ -0,0 +1,5 @@
+from .factory import SamplingPolicy, create_sampler
+from .fixed_rate_sampler import FixedRateSampler
+from .reservoir_sampler import ReservoirSampler
+from .sampler import Sampler
+from .stratified_sampler import StratifiedSampler
@@ -0,0 +1,24 @@
+import logging
+from typing import Literal
+
+from src.messaging.samplers.fixed_rate_sampler import FixedRateSampler
+from src.messaging.samplers.reservoir_sampler import ReservoirSampler
+from src.messaging.samplers.sampler import Sampler
+from src.messaging.samplers.stratified_sampler import StratifiedSampler
+
+logger = logging.getLogger()
+
+SamplingPolicy = Literal["fixed_rate", "reservoir", "stratified"]
+
+
+def create_sampler(policy: SamplingPolicy, **params) -> Sampler:
+    if policy == "fixed_rate":
+        return FixedRateSampler(**params)
+
+    elif policy == "reservoir":
+        return ReservoirSampler(**params)
+
+    elif policy == "stratified":
+        return StratifiedSampler(**params)
+
+    raise ValueError(f"Unsupported sampling policy: {policy}")
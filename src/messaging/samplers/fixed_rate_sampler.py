@@ -0,0 +1,23 @@
+from typing import List, Optional
+
+import numpy as np
+
+from src.messaging.samplers.sampler import Sampler, select_rows
+
+
+class FixedRateSampler(Sampler):
+    """Keeps every row independently with probability `rate`."""
+
+    def __init__(self, rate: float = 0.1, seed: Optional[int] = None):
+        super().__init__(seed)
+        if not 0 < rate <= 1:
+            raise ValueError(f"Sampling rate must be in (0, 1], got {rate}")
+        self.rate = rate
+
+    def sample(self, event: dict) -> List[dict]:
+        n_rows = len(event["probabilities"])
+        rows = np.flatnonzero(self.rng.random(n_rows) < self.rate)
+        if len(rows) == 0:
+            return []
+
+        return [select_rows(event, rows, np.full(len(rows), 1 / self.rate))]
@@ -0,0 +1,104 @@
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.messaging.samplers.sampler import Sampler, select_rows
+
+
+class ReservoirSampler(Sampler):
+    """
+    Keeps a uniform sample of at most `size` rows per time window of
+    `window_seconds` (reservoir sampling), however many rows are scored. The
+    sample of a window is published when the first event of the next window
+    arrives, or on `flush`, with weight `rows seen / rows kept`.
+
+    The reservoir only references rows of the events it received, and events
+    without a kept row are released as soon as their rows are replaced.
+    """
+
+    def __init__(
+        self,
+        size: int = 1000,
+        window_seconds: float = 60,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(seed)
+        self.size = size
+        self.window_seconds = window_seconds
+        self._reset(time.monotonic())
+
+    def sample(self, event: dict) -> List[dict]:
+        ready = []
+        now = time.monotonic()
+        if now >= self._window_end:
+            ready = self.flush()
+            self._reset(now)
+
+        n_rows = len(event["probabilities"])
+        if n_rows == 0:
+            return ready
+
+        event_id = self._next_event
+        self._next_event += 1
+        self._events[event_id] = event
+
+        # Position of every incoming row in the stream of the window
+        positions = self._seen + np.arange(n_rows)
+        self._seen += n_rows
+
+        # Rows that fill the empty slots of the reservoir
+        free = max(self.size - self._kept, 0)
+        fill = min(free, n_rows)
+        slots = np.arange(self._kept, self._kept + fill)
+        self._slot_events[slots] = event_id
+        self._slot_rows[slots] = np.arange(fill)
+        self._kept += fill
+
+        # The rest replaces a random slot with probability size / (position + 1);
+        # with repeated slots the last row wins, as in the sequential algorithm
+        if fill < n_rows:
+            rows = np.arange(fill, n_rows)
+            draws = self.rng.random(len(rows)) * (positions[rows] + 1)
+            candidates = draws.astype(np.int64)
+            replace = candidates < self.size
+            self._slot_events[candidates[replace]] = event_id
+            self._slot_rows[candidates[replace]] = rows[replace]
+
+        self._release_unreferenced()
+        return ready
+
+    def flush(self) -> List[dict]:
+        if self._kept == 0:
+            return []
+
+        weight = self._seen / self._kept
+        slot_events = self._slot_events[: self._kept]
+        slot_rows = self._slot_rows[: self._kept]
+
+        sampled = []
+        for event_id in np.unique(slot_events):
+            rows = np.sort(slot_rows[slot_events == event_id])
+            event = self._events[event_id]
+            sampled.append(select_rows(event, rows, np.full(len(rows), weight)))
+
+        self._reset(time.monotonic())
+        return sampled
+
+    def _reset(self, now: float):
+        self._window_end = now + self.window_seconds
+        self._events: Dict[int, dict] = {}
+        self._next_event = 0
+        self._seen = 0
+        self._kept = 0
+        self._slot_events = np.zeros(self.size, dtype=np.int64)
+        self._slot_rows = np.zeros(self.size, dtype=np.int64)
+
+    def _release_unreferenced(self):
+        if len(self._events) <= 1:
+            return
+
+        referenced = set(np.unique(self._slot_events[: self._kept]).tolist())
+        for event_id in list(self._events):
+            if event_id not in referenced:
+                del self._events[event_id]
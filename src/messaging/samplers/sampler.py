@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+import numpy as np
+
+
+class Sampler(ABC):
+    """
+    Selects which rows of the prediction events reach the monitoring queue.
+
+    Sampled events carry a per-row `weights` array with the number of scored
+    rows each sampled row stands for, so the drift side can reweight them.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.rng = np.random.default_rng(seed)
+
+    @abstractmethod
+    def sample(self, event: dict) -> List[dict]:
+        """Returns the events to publish for `event` (possibly none)."""
+        pass
+
+    def flush(self) -> List[dict]:
+        """Returns the events still held by the sampler."""
+        return []
+
+
+def select_rows(event: dict, rows: np.ndarray, weights: np.ndarray) -> dict:
+    """Keeps `rows` of the event, multiplying their weights by `weights`."""
+    probs = np.asarray(event["probabilities"])
+    previous = event.get("weights")
+    if previous is not None:
+        weights = weights * np.asarray(previous, dtype=float)[rows]
+
+    return {
+        **event,
+        "input_data": event["input_data"].iloc[rows].reset_index(drop=True),
+        "probabilities": probs[rows],
+        "weights": weights,
+    }
@@ -0,0 +1,42 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.messaging.samplers.sampler import Sampler, select_rows
+
+
+class StratifiedSampler(Sampler):
+    """
+    Samples each predicted class at its own rate, e.g. to keep most of the
+    rare positive predictions and a small share of the negative ones. Classes
+    missing from `rates` use `default_rate`.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[int, float]] = None,
+        default_rate: float = 0.1,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(seed)
+        self.rates = {int(label): rate for label, rate in (rates or {}).items()}
+        self.default_rate = default_rate
+
+        for rate in [*self.rates.values(), default_rate]:
+            if not 0 < rate <= 1:
+                raise ValueError(f"Sampling rate must be in (0, 1], got {rate}")
+
+    def sample(self, event: dict) -> List[dict]:
+        predicted = np.asarray(event["probabilities"]).argmax(axis=1)
+
+        n_classes = max([*self.rates, int(predicted.max(initial=0))]) + 1
+        class_rates = np.full(n_classes, self.default_rate)
+        for label, rate in self.rates.items():
+            class_rates[label] = rate
+
+        row_rates = class_rates[predicted]
+        rows = np.flatnonzero(self.rng.random(len(predicted)) < row_rates)
+        if len(rows) == 0:
+            return []
+
+        return [select_rows(event, rows, 1 / row_rates[rows])]
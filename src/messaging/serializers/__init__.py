@@ -0,0 +1,3 @@
+from .factory import SerializerType, create_serializer, decode_message
+from .json_serializer import JsonSerializer
+from .message_serializer import MessageSerializer
@@ -0,0 +1,98 @@
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.messaging.serializers.message_serializer import MessageSerializer
+
+PROBABILITY_PREFIX = "__probability_"
+EXTRA_PREFIX = "__"
+
+
+class ArrowSerializer(MessageSerializer):
+    """
+    Columnar binary format based on the Arrow IPC stream format.
+
+    Every event of a message is laid out as rows of a single record batch:
+    the schema (column names and types) is sent once and values travel as
+    typed buffers. Probabilities become one column per class and extra event
+    fields become `__<name>` columns, broadcasting scalars to every row of
+    their event. Decoding returns a single event holding all the rows.
+    """
+
+    content_type = "application/vnd.apache.arrow.stream"
+
+    def __init__(self, compression: str = None):
+        self.options = pa.ipc.IpcWriteOptions(compression=compression)
+
+    def dumps(self, message: dict) -> bytes:
+        events = message["events"] if "events" in message else [message]
+        events = [event for event in events if _n_rows(event)]
+        if not events:
+            return b""
+
+        frame = pd.concat(
+            [_as_frame(event["input_data"]) for event in events], ignore_index=True
+        )
+        columns = {name: frame[name].to_numpy() for name in frame.columns}
+
+        probs = np.concatenate(
+            [np.asarray(event["probabilities"], dtype=float) for event in events]
+        )
+        for i in range(probs.shape[1]):
+            columns[f"{PROBABILITY_PREFIX}{i}"] = probs[:, i]
+
+        extras = sorted(
+            set().union(*(event.keys() for event in events))
+            - {"input_data", "probabilities"}
+        )
+        for key in extras:
+            columns[f"{EXTRA_PREFIX}{key}"] = np.concatenate(
+                [
+                    np.broadcast_to(np.asarray(event.get(key)), _n_rows(event))
+                    for event in events
+                ]
+            )
+
+        batch = pa.RecordBatch.from_pydict(columns)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema, options=self.options) as writer:
+            writer.write_batch(batch)
+
+        return sink.getvalue().to_pybytes()
+
+    def loads(self, body: bytes) -> dict:
+        if not body:
+            return {"events": []}
+
+        table = pa.ipc.open_stream(body).read_all()
+
+        input_columns = [
+            name for name in table.column_names if not name.startswith(EXTRA_PREFIX)
+        ]
+        probability_columns = [
+            name for name in table.column_names if name.startswith(PROBABILITY_PREFIX)
+        ]
+
+        message = {
+            "input_data": table.select(input_columns).to_pandas(),
+            "probabilities": np.column_stack(
+                [table.column(name).to_numpy() for name in probability_columns]
+            ),
+        }
+        for name in table.column_names:
+            if name.startswith(EXTRA_PREFIX) and name not in probability_columns:
+                message[name[len(EXTRA_PREFIX) :]] = table.column(name).to_numpy()
+
+        return message
+
+
+def _as_frame(input_data) -> pd.DataFrame:
+    if isinstance(input_data, str):
+        return pd.read_json(StringIO(input_data))
+    return input_data
+
+
+def _n_rows(event: dict) -> int:
+    return len(event.get("probabilities", ()))
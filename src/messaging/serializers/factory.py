@@ -0,0 +1,46 @@
+import logging
+from typing import Dict, Literal, Optional
+
+from src.messaging.serializers.json_serializer import JsonSerializer
+from src.messaging.serializers.message_serializer import MessageSerializer
+
+logger = logging.getLogger()
+
+SerializerType = Literal["json", "arrow"]
+
+CONTENT_TYPES: Dict[str, SerializerType] = {
+    "application/json": "json",
+    "application/vnd.apache.arrow.stream": "arrow",
+}
+
+_serializers: Dict[str, MessageSerializer] = {}
+
+
+def create_serializer(serializer_type: SerializerType = "json") -> MessageSerializer:
+    if serializer_type == "json":
+        return JsonSerializer()
+
+    elif serializer_type == "arrow":
+        # pyarrow is only imported when the binary format is used
+        from src.messaging.serializers.arrow_serializer import ArrowSerializer
+
+        return ArrowSerializer()
+
+    raise ValueError(f"Unsupported message serializer: {serializer_type}")
+
+
+def decode_message(body: bytes, content_type: Optional[str] = None) -> dict:
+    """
+    Decodes a message with the serializer matching its content type. Messages
+    without content type use the original JSON format.
+    """
+    content_type = content_type or JsonSerializer.content_type
+    if content_type not in CONTENT_TYPES:
+        raise ValueError(f"Unsupported message content type: {content_type}")
+
+    serializer = _serializers.get(content_type)
+    if serializer is None:
+        serializer = create_serializer(CONTENT_TYPES[content_type])
+        _serializers[content_type] = serializer
+
+    return serializer.loads(body)
@@ -0,0 +1,57 @@
+import json
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+
+from src.messaging.serializers.message_serializer import MessageSerializer
+
+
+class JsonSerializer(MessageSerializer):
+    """
+    Original text format: the input frame is embedded as a records JSON
+    string and probabilities as nested lists.
+    """
+
+    content_type = "application/json"
+
+    def dumps(self, message: dict) -> bytes:
+        if "events" in message:
+            message = {
+                **message,
+                "events": [self._encode_event(e) for e in message["events"]],
+            }
+        else:
+            message = self._encode_event(message)
+
+        return json.dumps(message).encode()
+
+    def loads(self, body: bytes) -> dict:
+        message = json.loads(body)
+
+        if "events" in message:
+            message["events"] = [self._decode_event(e) for e in message["events"]]
+            return message
+
+        return self._decode_event(message)
+
+    @staticmethod
+    def _encode_event(event: dict) -> dict:
+        encoded = {}
+        for key, value in event.items():
+            if isinstance(value, pd.DataFrame):
+                value = value.to_json(orient="records")
+            elif isinstance(value, np.ndarray):
+                value = value.tolist()
+            elif isinstance(value, np.generic):
+                value = value.item()
+            encoded[key] = value
+        return encoded
+
+    @staticmethod
+    def _decode_event(event: dict) -> dict:
+        if isinstance(event.get("input_data"), str):
+            event["input_data"] = pd.read_json(StringIO(event["input_data"]))
+        if "probabilities" in event:
+            event["probabilities"] = np.asarray(event["probabilities"], dtype=float)
+        return event
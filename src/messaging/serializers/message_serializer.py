@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+
+class MessageSerializer(ABC):
+    """
+    Encodes prediction events to bytes and back.
+
+    An event is a dict with the transformed `input_data` (DataFrame), the
+    `probabilities` (2D array) and optional per-row or scalar extras. A batch
+    of events is sent as `{"events": [event, ...]}`. Decoded messages always
+    hold DataFrames and arrays, whatever the wire format.
+    """
+
+    content_type: str
+
+    @abstractmethod
+    def dumps(self, message: dict) -> bytes:
+        pass
+
+    @abstractmethod
+    def loads(self, body: bytes) -> dict:
+        pass
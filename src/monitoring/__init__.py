@@ -1,2 +1,7 @@
+from .base_drift_detector import BaseDriftDetector
 from .drift_detector import DriftDetector
 from .drift_state import DriftState
+from .factory import DriftBackend, create_drift_detector
+from .native_drift_detector import NativeDriftDetector
+from .reference_profile import ReferenceProfile
+from .streaming_drift import StreamingDriftDetector
@@ -0,0 +1,25 @@
+from abc import ABC, abstractmethod
+from typing import Dict
+
+import pandas as pd
+
+
+class BaseDriftDetector(ABC):
+    """
+    Compares the buffered data and predictions with the training reference.
+
+    `check_drift` returns the result of every frame under `data_drift` and
+    `prediction_drift`, the decisions under `is_data_drift_detected` and
+    `is_pred_drift_detected`, or an `error` when the check failed.
+    """
+
+    @abstractmethod
+    def check_drift(
+        self, current_data: pd.DataFrame, current_preds: pd.DataFrame
+    ) -> Dict:
+        pass
+
+    @abstractmethod
+    def save_report(self, path: str):
+        """Saves the report of the last check to the `path` directory."""
+        pass
@@ -5,16 +5,21 @@ import pandas as pd
 from evidently import Report
 from evidently.presets import DataDriftPreset
 
+from src.monitoring.base_drift_detector import BaseDriftDetector
+
 logger = logging.getLogger()
 
 
-class DriftDetector:
+class DriftDetector(BaseDriftDetector):
     def __init__(self, training_data, training_preds):
         self.training_data = training_data
         self.training_preds = training_preds
         self.last_data_drift_report: Report | None = None
         self.last_pred_drift_report: Report | None = None
 
+    def save_report(self, path: str):
+        self.save_report_html(path)
+
     def save_report_html(self, path: str):
         if self.last_data_drift_report is None or self.last_pred_drift_report is None:
             logger.info("No drift report generated")
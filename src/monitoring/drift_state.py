@@ -1,36 +1,95 @@
 from pathlib import Path
 from threading import Lock
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 
-from src.monitoring.utils import DataBuffer
+from src.monitoring.utils import DataBuffer, SegmentLog, resample_by_weight
 
 
 class DriftState:
-    def __init__(self, buffer_path, buffer_size: int):
+    """
+    Buffers of the last `buffer_size` inputs and predictions. Every batch is
+    logged as a single segment holding both, so after a restart the buffers
+    are recovered from the segments of the current window, row-aligned.
+    Without a `buffer_path` the buffers are only kept in memory.
+    """
+
+    def __init__(
+        self, buffer_path: Optional[Path], buffer_size: int, compact_factor: int = 4
+    ):
+        self.input_buffer = DataBuffer(None, buffer_size)
+        self.pred_buffer = DataBuffer(None, buffer_size)
+        self.log: Optional[SegmentLog] = None
+        self.lock = Lock()
+
+        if buffer_path is None:
+            return
+
         buffer_path = Path(buffer_path)
         buffer_path.mkdir(parents=True, exist_ok=True)
+        self.log = SegmentLog(buffer_path / "segments", buffer_size, compact_factor)
 
-        self.input_buffer = DataBuffer(buffer_path / "input_buffer.csv", buffer_size)
-        self.pred_buffer = DataBuffer(buffer_path / "pred_buffer.csv", buffer_size)
-        self.lock = Lock()
+        recovered = self.log.recover()
+        if recovered:
+            self.input_buffer.extend(recovered.get("input", pd.DataFrame()))
+            self.pred_buffer.extend(recovered.get("pred", pd.DataFrame()))
 
-    def add_input(self, input_data: pd.DataFrame, proba: pd.DataFrame) -> bool:
+    def add_input(
+        self,
+        input_data: pd.DataFrame,
+        proba: pd.DataFrame,
+        weights: Optional[np.ndarray] = None,
+    ) -> bool:
         """
         Adds new data and predictions to buffers. Returns True if buffers are full.
+        `weights` are the sampling weights of the rows (1 when not sampled).
         """
+        pred_df = proba.to_frame(name="proba").reset_index(drop=True)
+        pred_df["weight"] = 1.0 if weights is None else np.asarray(weights)
+        input_data = input_data.reset_index(drop=True)
+
         with self.lock:
-            self.input_buffer.append(input_data)
-            pred_df = proba.to_frame(name="proba")
+            if self.log is not None:
+                self.log.append({"input": input_data, "pred": pred_df})
+            self.input_buffer.extend(input_data)
+            full = self.pred_buffer.extend(pred_df)
 
-            full_buffer = self.pred_buffer.append(pred_df)
-            return full_buffer is not None
+            if self.log is not None and self.log.should_compact:
+                self.log.compact(
+                    {
+                        "input": self.input_buffer.get_data(),
+                        "pred": self.pred_buffer.get_data(),
+                    }
+                )
+
+            return full
 
     def reset(self):
         with self.lock:
             self.input_buffer.clear()
             self.pred_buffer.clear()
+            if self.log is not None:
+                self.log.clear()
 
-    def get_buffer_data(self) -> tuple[pd.DataFrame, pd.DataFrame]:
+    def get_buffer_data(
+        self, weighted: bool = True
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Returns the buffered data and predictions, resampled by their sampling
+        weights so they represent the scored traffic. With `weighted=False`
+        the rows are returned as stored, with their `weight` column.
+        """
         with self.lock:
-            return self.input_buffer.get_data(), self.pred_buffer.get_data()
+            data, preds = self.input_buffer.get_data(), self.pred_buffer.get_data()
+
+        if not weighted:
+            weights = preds["weight"] if "weight" in preds else 1.0
+            return data, preds.assign(weight=weights).fillna({"weight": 1.0})
+
+        if "weight" not in preds:
+            return data, preds
+
+        weights = preds["weight"].to_numpy()
+        return resample_by_weight(data, preds[["proba"]], weights)
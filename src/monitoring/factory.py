@@ -0,0 +1,39 @@
+import logging
+from typing import Literal, Optional
+
+import pandas as pd
+
+from src.monitoring.base_drift_detector import BaseDriftDetector
+from src.monitoring.drift_detector import DriftDetector
+from src.monitoring.native_drift_detector import NativeDriftDetector
+from src.monitoring.reference_profile import ReferenceProfile
+
+logger = logging.getLogger()
+
+DriftBackend = Literal["evidently", "native"]
+
+
+def create_drift_detector(
+    backend: DriftBackend,
+    reference_profile: Optional[ReferenceProfile] = None,
+    training_data: Optional[pd.DataFrame] = None,
+    training_preds: Optional[pd.DataFrame] = None,
+    **params,
+) -> BaseDriftDetector:
+    """
+    The Evidently backend compares against the training rows and renders HTML
+    reports; the native backend only needs the reference profile.
+    """
+    logger.info(f"Creating drift detector: '{backend}'")
+
+    if backend == "evidently":
+        if training_data is None or training_preds is None:
+            raise ValueError("The Evidently backend needs the training data")
+        return DriftDetector(training_data, training_preds, **params)
+
+    elif backend == "native":
+        if reference_profile is None:
+            raise ValueError("The native backend needs the reference profile")
+        return NativeDriftDetector(reference_profile, **params)
+
+    raise ValueError(f"Unsupported drift backend: {backend}")
@@ -0,0 +1,269 @@
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy.special import chdtrc, kolmogorov
+
+from src.monitoring.base_drift_detector import BaseDriftDetector
+from src.monitoring.reference_profile import ReferenceProfile
+from src.monitoring.sketches import FrameSketch
+from src.monitoring.sketches.category_sketch import MISSING
+from src.monitoring.utils import jensen_shannon, psi
+
+logger = logging.getLogger()
+
+
+class NativeDriftDetector(BaseDriftDetector):
+    """
+    Drift tests computed with NumPy against the reference profile, for all the
+    columns of a frame at once.
+
+    The test of every column follows Evidently's defaults: with up to
+    `small_reference` reference rows, numeric columns use the KS test and
+    categorical columns the chi-squared test (drift when p < `p_value`);
+    with more rows, the normed Wasserstein distance and the Jensen-Shannon
+    distance (drift above `distance_threshold`). The PSI is reported for every
+    column. As with the Evidently report, drift is detected in a frame when
+    any of its columns drifts.
+    """
+
+    def __init__(
+        self,
+        reference: ReferenceProfile,
+        small_reference: int = 1000,
+        p_value: float = 0.05,
+        distance_threshold: float = 0.1,
+        quantile_points: int = 1000,
+    ):
+        self.reference = reference
+        self.p_value = p_value
+        self.distance_threshold = distance_threshold
+        self.last_result: Optional[Dict] = None
+
+        self._frames = {
+            name: _ReferenceArrays(
+                getattr(reference, name),
+                reference.moments.get(name, {}),
+                quantile_points,
+                small=getattr(reference, name).rows <= small_reference,
+            )
+            for name in ("data", "preds")
+        }
+
+    def check_drift(
+        self, current_data: pd.DataFrame, current_preds: pd.DataFrame
+    ) -> Dict:
+        try:
+            data_drift = self._check_frame(self._frames["data"], current_data)
+            pred_drift = self._check_frame(self._frames["preds"], current_preds)
+
+            self.last_result = {
+                "data_drift": data_drift,
+                "is_data_drift_detected": data_drift["drift_detected"],
+                "prediction_drift": pred_drift,
+                "is_pred_drift_detected": pred_drift["drift_detected"],
+            }
+            return self.last_result
+        except Exception as e:
+            logger.exception("Failed to compute drift tests.")
+            return {"error": str(e)}
+
+    def save_report(self, path: str):
+        if self.last_result is None:
+            logger.info("No drift report generated")
+            return
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        (path / "drift_tests.json").write_text(json.dumps(self.last_result))
+        logger.info(f"Drift test results saved to {path}")
+
+    def _check_frame(self, reference: "_ReferenceArrays", current: pd.DataFrame):
+        columns = {}
+        if reference.numeric:
+            columns.update(self._numeric_tests(reference, current))
+        if reference.categorical:
+            columns.update(self._categorical_tests(reference, current))
+
+        drifted = sum(column["drift_detected"] for column in columns.values())
+        return {
+            "columns": columns,
+            "number_of_drifted_columns": drifted,
+            "share_of_drifted_columns": drifted / len(columns) if columns else 0.0,
+            "drift_detected": drifted > 0,
+        }
+
+    def _numeric_tests(self, reference: "_ReferenceArrays", current: pd.DataFrame):
+        values = current[reference.numeric].to_numpy(dtype=float, na_value=np.nan)
+        n_rows, n_columns = values.shape
+        present = ~np.isnan(values)
+        counts = present.sum(axis=0)
+        safe_counts = np.maximum(counts, 1)
+
+        # PSI over the reference bins, counting every column in one bincount
+        bins = (values[:, :, None] >= reference.edges[None]).sum(axis=-1)
+        width = reference.bin_frequencies.shape[1]
+        index = (np.arange(n_columns) * width + bins)[present]
+        histogram = np.bincount(index, minlength=n_columns * width)
+        frequencies = histogram.reshape(n_columns, width) / safe_counts[:, None]
+        psi_values = psi(reference.bin_frequencies, frequencies)
+
+        if reference.small:
+            # KS statistic at the reference quantiles: each column is mapped to
+            # its own band of a single sorted array so one searchsorted counts
+            # the values below every point of every column
+            low = np.minimum(np.nanmin(values, axis=0), reference.quantiles[:, 0])
+            high = np.maximum(np.nanmax(values, axis=0), reference.quantiles[:, -1])
+            scale = np.where(high > low, high - low, 1.0) * 2
+            offsets = np.arange(n_columns)
+
+            banded = np.where(present, (values - low) / scale, 0.75) + offsets
+            points = (reference.quantiles - low[:, None]) / scale[:, None]
+            points = points + offsets[:, None]
+
+            below = np.searchsorted(np.sort(banded, axis=None), points, side="right")
+            cdf = (below - offsets[:, None] * n_rows) / safe_counts[:, None]
+            statistic = np.abs(cdf - reference.levels[None]).max(axis=1)
+
+            n_reference = reference.rows
+            effective = np.sqrt(counts * n_reference / (counts + n_reference))
+            values_out = kolmogorov(effective * statistic)
+            stattest, threshold = "ks", self.p_value
+            drifted = values_out < threshold
+        else:
+            # Normed Wasserstein distance from the two quantile functions
+            current_quantiles = _quantiles(values, counts, reference.levels)
+            distance = np.abs(current_quantiles - reference.quantiles).mean(axis=1)
+            values_out = distance / reference.std
+            stattest, threshold = "wasserstein", self.distance_threshold
+            drifted = values_out > threshold
+
+        return _column_results(
+            reference.numeric,
+            stattest,
+            threshold,
+            values_out,
+            drifted,
+            psi_values,
+            counts,
+        )
+
+    def _categorical_tests(self, reference: "_ReferenceArrays", current: pd.DataFrame):
+        # Categories differ between columns, so their counts are padded into a
+        # matrix with one row per column
+        labels = current[reference.categorical].astype(object)
+        labels = labels.where(labels.notna(), MISSING).astype(str)
+        all_counts = labels.melt().value_counts()
+
+        observed, expected = [], []
+        for name, reference_counts in zip(reference.categorical, reference.counts):
+            current_counts = all_counts.get(name, pd.Series(dtype=float)).to_dict()
+            categories = sorted(set(reference_counts) | set(current_counts))
+            observed.append([current_counts.get(c, 0.0) for c in categories])
+            expected.append([reference_counts.get(c, 0.0) for c in categories])
+
+        observed, expected = _pad(observed), _pad(expected)
+        counts = observed.sum(axis=1)
+        reference_frequencies = expected / expected.sum(axis=1, keepdims=True)
+        current_frequencies = observed / np.maximum(counts, 1)[:, None]
+        psi_values = psi(reference_frequencies, current_frequencies)
+
+        if reference.small:
+            expected_counts = reference_frequencies * counts[:, None]
+            used = (expected_counts > 0) | (observed > 0)
+            chi2 = np.where(
+                used,
+                (observed - expected_counts) ** 2 / np.maximum(expected_counts, 1e-4),
+                0.0,
+            ).sum(axis=1)
+            dof = np.maximum(used.sum(axis=1) - 1, 1)
+            values_out = chdtrc(dof, chi2)
+            stattest, threshold = "chisquare", self.p_value
+            drifted = values_out < threshold
+        else:
+            values_out = jensen_shannon(reference_frequencies, current_frequencies)
+            stattest, threshold = "jensenshannon", self.distance_threshold
+            drifted = values_out > threshold
+
+        return _column_results(
+            reference.categorical,
+            stattest,
+            threshold,
+            values_out,
+            drifted,
+            psi_values,
+            counts,
+        )
+
+
+class _ReferenceArrays:
+    """Arrays of the reference profile of a frame, stacked by column."""
+
+    def __init__(self, sketch: FrameSketch, moments: Dict, points: int, small: bool):
+        self.rows = sketch.rows
+        self.small = small
+        self.levels = (np.arange(points) + 0.5) / points
+
+        self.numeric: List[str] = list(sketch.histograms)
+        edges = [sketch.histograms[name].edges for name in self.numeric]
+        width = max((len(e) for e in edges), default=0)
+        self.edges = np.array(
+            [np.pad(e, (0, width - len(e)), constant_values=np.inf) for e in edges]
+        ).reshape(len(edges), width)
+
+        # Frequencies of the non-missing values, padded with empty bins
+        present = [sketch.histograms[name].counts[:-1] for name in self.numeric]
+        self.bin_frequencies = _pad(
+            [counts / max(counts.sum(), 1.0) for counts in present]
+        ).reshape(len(self.numeric), width + 1)
+        self.quantiles = np.array(
+            [sketch.quantiles[name].quantiles(self.levels) for name in self.numeric]
+        ).reshape(len(self.numeric), points)
+        std = np.array(
+            [moments.get(name, {}).get("std") or np.nan for name in self.numeric]
+        )
+        spread = self.quantiles.std(axis=1) if len(self.numeric) else std
+        self.std = np.where(np.isnan(std) | (std == 0), np.maximum(spread, 1e-8), std)
+
+        self.categorical: List[str] = list(sketch.categories)
+        self.counts = [sketch.categories[name].counts for name in self.categorical]
+
+
+def _quantiles(values: np.ndarray, counts: np.ndarray, levels: np.ndarray):
+    """Quantiles of every column at `levels`, from a single sort (NaNs last)."""
+    ordered = np.sort(values, axis=0).T
+    positions = levels[None] * np.maximum(counts - 1, 0)[:, None]
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, np.maximum(counts - 1, 0)[:, None])
+    fraction = positions - lower
+
+    low_values = np.take_along_axis(ordered, lower, axis=1)
+    high_values = np.take_along_axis(ordered, upper, axis=1)
+    return low_values + (high_values - low_values) * fraction
+
+
+def _pad(rows: List) -> np.ndarray:
+    width = max((len(row) for row in rows), default=0)
+    return np.array(
+        [np.pad(np.asarray(row, dtype=float), (0, width - len(row))) for row in rows]
+    ).reshape(len(rows), width)
+
+
+def _column_results(
+    names, stattest, threshold, values, drifted, psi_values, counts
+) -> Dict:
+    return {
+        name: {
+            "stattest": stattest,
+            "threshold": threshold,
+            "value": float(value) if count else None,
+            "drift_detected": bool(drift) and bool(count),
+            "psi": float(psi_value) if count else None,
+        }
+        for name, value, drift, psi_value, count in zip(
+            names, values, drifted, psi_values, counts
+        )
+    }
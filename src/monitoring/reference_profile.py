@@ -0,0 +1,90 @@
+import json
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring.sketches import FrameSketch
+from src.monitoring.sketches.frame_sketch import is_numeric_column
+
+
+class ReferenceProfile:
+    """
+    Summary of the training snapshot that drift is measured against: for the
+    inputs and the predictions, the bin edges and per-bin counts of numeric
+    columns, their quantile sketches and moments, and category counts.
+
+    It is computed once per model version at training time and stored as JSON,
+    so the drift side loads it instead of re-reading the reference rows.
+    """
+
+    def __init__(
+        self,
+        data: FrameSketch,
+        preds: FrameSketch,
+        moments: Dict[str, Dict[str, Dict[str, float]]],
+        bins: int,
+    ):
+        self.data = data
+        self.preds = preds
+        self.moments = moments
+        self.bins = bins
+
+    @classmethod
+    def from_frames(
+        cls, data: pd.DataFrame, preds: pd.DataFrame, bins: int = 10
+    ) -> "ReferenceProfile":
+        return cls(
+            data=FrameSketch.from_reference(data, bins),
+            preds=FrameSketch.from_reference(preds, bins),
+            moments={"data": _moments(data), "preds": _moments(preds)},
+            bins=bins,
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "bins": self.bins,
+            "data": self.data.to_dict(),
+            "preds": self.preds.to_dict(),
+            "moments": self.moments,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "ReferenceProfile":
+        return cls(
+            data=FrameSketch.from_dict(state["data"]),
+            preds=FrameSketch.from_dict(state["preds"]),
+            moments=state["moments"],
+            bins=state["bins"],
+        )
+
+    @classmethod
+    def load(cls, path) -> "ReferenceProfile":
+        with open(path, "r") as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+
+def _moments(data: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    moments = {}
+    for name in data.columns:
+        if not is_numeric_column(data[name]):
+            continue
+
+        values = data[name].to_numpy(dtype=float, na_value=np.nan)
+        present = values[~np.isnan(values)]
+        moments[name] = {
+            "count": int(len(present)),
+            "missing": int(len(values) - len(present)),
+            "mean": float(present.mean()) if len(present) else None,
+            "std": float(present.std()) if len(present) else None,
+            "min": float(present.min()) if len(present) else None,
+            "max": float(present.max()) if len(present) else None,
+        }
+    return moments
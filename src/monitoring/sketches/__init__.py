@@ -0,0 +1,5 @@
+from .category_sketch import CategorySketch
+from .frame_sketch import FrameSketch
+from .histogram_sketch import HistogramSketch
+from .quantile_sketch import QuantileSketch
+from .sketch import Sketch
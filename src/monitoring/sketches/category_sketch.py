@@ -0,0 +1,57 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring.sketches.sketch import Sketch, as_weights
+
+MISSING = "__missing__"
+
+
+class CategorySketch(Sketch):
+    """Weighted count of every category, missing values counted as `MISSING`."""
+
+    def __init__(self):
+        self.counts: Dict[str, float] = {}
+
+    def update(self, values: np.ndarray, weights: Optional[np.ndarray] = None):
+        weights = as_weights(values, weights)
+        codes, uniques = pd.factorize(pd.Series(values).astype("object"))
+
+        counts = np.bincount(codes[codes >= 0], weights=weights[codes >= 0])
+        for category, count in zip(uniques, counts):
+            self._add(str(category), count)
+
+        missing = weights[codes < 0].sum()
+        if missing:
+            self._add(MISSING, missing)
+
+    def merge(self, other: "CategorySketch") -> "CategorySketch":
+        for category, count in other.counts.items():
+            self._add(category, count)
+        return self
+
+    def empty(self) -> "CategorySketch":
+        return CategorySketch()
+
+    @property
+    def total(self) -> float:
+        return float(sum(self.counts.values()))
+
+    def to_dict(self) -> Dict:
+        return {"counts": dict(self.counts)}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "CategorySketch":
+        sketch = cls()
+        sketch.counts = {str(k): float(v) for k, v in state["counts"].items()}
+        return sketch
+
+    def frequencies(self, categories: List[str]) -> np.ndarray:
+        """Frequencies of `categories`, in that order."""
+        total = self.total
+        counts = np.array([self.counts.get(category, 0.0) for category in categories])
+        return counts / total if total else counts
+
+    def _add(self, category: str, count: float):
+        self.counts[category] = self.counts.get(category, 0.0) + float(count)
@@ -0,0 +1,102 @@
+import copy
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring.sketches.category_sketch import CategorySketch
+from src.monitoring.sketches.histogram_sketch import HistogramSketch
+from src.monitoring.sketches.quantile_sketch import QuantileSketch
+
+
+class FrameSketch:
+    """
+    Mergeable sketches of every column of a DataFrame: a histogram over the
+    bins of the reference and a quantile sketch for numeric columns, and
+    category counts for the rest.
+    """
+
+    def __init__(self, edges: Dict[str, np.ndarray], categorical: List[str]):
+        self.histograms = {name: HistogramSketch(e) for name, e in edges.items()}
+        self.quantiles = {name: QuantileSketch() for name in edges}
+        self.categories = {name: CategorySketch() for name in categorical}
+        self.rows = 0
+
+    @classmethod
+    def from_reference(
+        cls,
+        data: pd.DataFrame,
+        n_bins: int = 10,
+        weights: Optional[np.ndarray] = None,
+    ) -> "FrameSketch":
+        """Sketches `data`, with bins of equal frequency in it."""
+        edges, categorical = {}, []
+        for name in data.columns:
+            if is_numeric_column(data[name]):
+                quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+                values = data[name].to_numpy(dtype=float, na_value=np.nan)
+                edges[name] = np.unique(np.nanquantile(values, quantiles))
+            else:
+                categorical.append(name)
+
+        sketch = cls(edges, categorical)
+        sketch.update(data, weights)
+        return sketch
+
+    def update(self, data: pd.DataFrame, weights: Optional[np.ndarray] = None):
+        for name, histogram in self.histograms.items():
+            values = data[name].to_numpy(dtype=float, na_value=np.nan)
+            histogram.update(values, weights)
+            self.quantiles[name].update(values, weights)
+
+        for name, counts in self.categories.items():
+            counts.update(data[name].to_numpy(dtype=object), weights)
+
+        self.rows += len(data)
+
+    def merge(self, other: "FrameSketch") -> "FrameSketch":
+        for name, histogram in self.histograms.items():
+            histogram.merge(other.histograms[name])
+            self.quantiles[name].merge(other.quantiles[name])
+        for name, counts in self.categories.items():
+            counts.merge(other.categories[name])
+        self.rows += other.rows
+        return self
+
+    def empty(self) -> "FrameSketch":
+        sketch = copy.copy(self)
+        sketch.histograms = {n: h.empty() for n, h in self.histograms.items()}
+        sketch.quantiles = {n: q.empty() for n, q in self.quantiles.items()}
+        sketch.categories = {n: c.empty() for n, c in self.categories.items()}
+        sketch.rows = 0
+        return sketch
+
+    def to_dict(self) -> Dict:
+        return {
+            "rows": self.rows,
+            "histograms": {n: h.to_dict() for n, h in self.histograms.items()},
+            "quantiles": {n: q.to_dict() for n, q in self.quantiles.items()},
+            "categories": {n: c.to_dict() for n, c in self.categories.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "FrameSketch":
+        sketch = cls({}, [])
+        sketch.rows = state["rows"]
+        sketch.histograms = {
+            n: HistogramSketch.from_dict(h) for n, h in state["histograms"].items()
+        }
+        sketch.quantiles = {
+            n: QuantileSketch.from_dict(q) for n, q in state["quantiles"].items()
+        }
+        sketch.categories = {
+            n: CategorySketch.from_dict(c) for n, c in state["categories"].items()
+        }
+        return sketch
+
+
+def is_numeric_column(column: pd.Series) -> bool:
+    """Numeric columns are binned; booleans are counted as categories."""
+    return pd.api.types.is_numeric_dtype(column) and not (
+        pd.api.types.is_bool_dtype(column)
+    )
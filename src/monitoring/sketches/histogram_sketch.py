@@ -0,0 +1,50 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.monitoring.sketches.sketch import Sketch, as_weights
+
+
+class HistogramSketch(Sketch):
+    """
+    Weighted counts over fixed bins. With `n` edges there are `n + 1` bins,
+    the first and last open-ended, plus a last slot for missing values.
+    """
+
+    def __init__(self, edges: np.ndarray):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 2)
+
+    def update(self, values: np.ndarray, weights: Optional[np.ndarray] = None):
+        values = np.asarray(values, dtype=float)
+        weights = as_weights(values, weights)
+
+        bins = np.searchsorted(self.edges, values, side="right")
+        bins[np.isnan(values)] = len(self.counts) - 1
+        self.counts += np.bincount(bins, weights=weights, minlength=len(self.counts))
+
+    def merge(self, other: "HistogramSketch") -> "HistogramSketch":
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Histograms with different edges cannot be merged")
+        self.counts += other.counts
+        return self
+
+    def empty(self) -> "HistogramSketch":
+        return HistogramSketch(self.edges)
+
+    @property
+    def total(self) -> float:
+        return float(self.counts.sum())
+
+    def to_dict(self) -> Dict:
+        return {"edges": self.edges.tolist(), "counts": self.counts.tolist()}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "HistogramSketch":
+        sketch = cls(state["edges"])
+        sketch.counts = np.asarray(state["counts"], dtype=float)
+        return sketch
+
+    def frequencies(self) -> np.ndarray:
+        total = self.total
+        return self.counts / total if total else self.counts.copy()
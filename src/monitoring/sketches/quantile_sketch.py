@@ -0,0 +1,110 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.monitoring.sketches.sketch import Sketch, as_weights
+
+
+class QuantileSketch(Sketch):
+    """
+    Weighted quantile sketch made of at most `size` centroids (value, weight).
+
+    New values are buffered and, once the buffer holds `size` more values, the
+    whole sketch is sorted and folded into `size` groups of equal weight, each
+    replaced by its weighted mean. Merging concatenates the centroids of both
+    sketches and folds them again, so the rank error stays around 1 / `size`
+    however many values or merges the sketch goes through.
+    """
+
+    def __init__(self, size: int = 200):
+        self.size = size
+        self.values = np.empty(0)
+        self.weights = np.empty(0)
+        self.minimum = np.inf
+        self.maximum = -np.inf
+        self._compressed = 0
+
+    def update(self, values: np.ndarray, weights: Optional[np.ndarray] = None):
+        values = np.asarray(values, dtype=float)
+        weights = as_weights(values, weights)
+        valid = ~np.isnan(values)
+        values, weights = values[valid], weights[valid]
+        if not len(values):
+            return
+
+        self.values = np.concatenate([self.values, values])
+        self.weights = np.concatenate([self.weights, weights])
+        self.minimum = min(self.minimum, values.min())
+        self.maximum = max(self.maximum, values.max())
+
+        if len(self.values) - self._compressed > self.size:
+            self._compress()
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        self.values = np.concatenate([self.values, other.values])
+        self.weights = np.concatenate([self.weights, other.weights])
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._compress()
+        return self
+
+    def empty(self) -> "QuantileSketch":
+        return QuantileSketch(self.size)
+
+    @property
+    def total(self) -> float:
+        return float(self.weights.sum())
+
+    def to_dict(self) -> Dict:
+        self._compress()
+        return {
+            "size": self.size,
+            "values": self.values.tolist(),
+            "weights": self.weights.tolist(),
+            "min": float(self.minimum),
+            "max": float(self.maximum),
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "QuantileSketch":
+        sketch = cls(state["size"])
+        sketch.values = np.asarray(state["values"], dtype=float)
+        sketch.weights = np.asarray(state["weights"], dtype=float)
+        sketch.minimum = state["min"]
+        sketch.maximum = state["max"]
+        sketch._compressed = len(sketch.values)
+        return sketch
+
+    def quantiles(self, q: np.ndarray) -> np.ndarray:
+        q = np.asarray(q, dtype=float)
+        if not len(self.values):
+            return np.full(q.shape, np.nan)
+
+        order = np.argsort(self.values, kind="stable")
+        values, weights = self.values[order], self.weights[order]
+
+        # Every centroid sits at the middle of the weight it represents
+        ranks = (np.cumsum(weights) - weights / 2) / weights.sum()
+        positions = np.concatenate([[0.0], ranks, [1.0]])
+        points = np.concatenate([[self.minimum], values, [self.maximum]])
+        return np.interp(q, positions, points)
+
+    def _compress(self):
+        if len(self.values) <= self.size:
+            self._compressed = len(self.values)
+            return
+
+        order = np.argsort(self.values, kind="stable")
+        values, weights = self.values[order], self.weights[order]
+
+        cumulative = np.cumsum(weights) - weights
+        groups = np.minimum(
+            (cumulative / weights.sum() * self.size).astype(np.int64), self.size - 1
+        )
+        group_weights = np.bincount(groups, weights=weights, minlength=self.size)
+        group_sums = np.bincount(groups, weights=values * weights, minlength=self.size)
+
+        kept = group_weights > 0
+        self.weights = group_weights[kept]
+        self.values = group_sums[kept] / self.weights
+        self._compressed = len(self.values)
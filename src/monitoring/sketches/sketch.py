@@ -0,0 +1,48 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class Sketch(ABC):
+    """
+    Fixed-size summary of the values of a column. Sketches are updated in
+    batches, with optional per-row weights (e.g. sampling weights), and two
+    sketches of the same layout can be merged into the summary of both streams.
+    """
+
+    @abstractmethod
+    def update(self, values: np.ndarray, weights: Optional[np.ndarray] = None):
+        pass
+
+    @abstractmethod
+    def merge(self, other: "Sketch") -> "Sketch":
+        """Adds `other` to this sketch and returns it."""
+        pass
+
+    @abstractmethod
+    def empty(self) -> "Sketch":
+        """Returns a sketch with the same layout and no values."""
+        pass
+
+    @property
+    @abstractmethod
+    def total(self) -> float:
+        """Total weight of the values seen."""
+        pass
+
+    @abstractmethod
+    def to_dict(self) -> Dict:
+        """JSON-serializable state, restored with `from_dict`."""
+        pass
+
+    @classmethod
+    @abstractmethod
+    def from_dict(cls, state: Dict) -> "Sketch":
+        pass
+
+
+def as_weights(values: np.ndarray, weights: Optional[np.ndarray]) -> np.ndarray:
+    if weights is None:
+        return np.ones(len(values))
+    return np.broadcast_to(np.asarray(weights, dtype=float), len(values))
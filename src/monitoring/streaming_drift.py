@@ -0,0 +1,120 @@
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring.reference_profile import ReferenceProfile
+from src.monitoring.sketches import FrameSketch
+from src.monitoring.utils import jensen_shannon, psi
+
+
+class StreamingDriftDetector:
+    """
+    Incremental drift scoring over roughly the last `window_rows` rows.
+
+    Each batch updates the sketches of the current pane, and the window is
+    kept as `panes` panes of `window_rows / panes` rows that are merged when
+    scoring, so old rows drop out a pane at a time. Scoring compares the
+    window with the sketches of the reference profile in O(bins) per column:
+    a column drifts when its PSI exceeds `psi_threshold`, and a frame drifts
+    when the share of drifted columns reaches `drift_share`.
+    """
+
+    def __init__(
+        self,
+        reference: ReferenceProfile,
+        window_rows: int = 1000,
+        panes: int = 10,
+        psi_threshold: float = 0.2,
+        drift_share: float = 0.5,
+    ):
+        self.reference = {"data": reference.data, "preds": reference.preds}
+        self.pane_rows = max(1, window_rows // panes)
+        self.psi_threshold = psi_threshold
+        self.drift_share = drift_share
+
+        self._panes = deque(maxlen=max(panes - 1, 0))
+        self._current = self._new_pane()
+
+    def update(
+        self,
+        input_data: pd.DataFrame,
+        preds: pd.DataFrame,
+        weights: Optional[np.ndarray] = None,
+    ):
+        self._current["data"].update(input_data, weights)
+        self._current["preds"].update(preds, weights)
+
+        if self._current["data"].rows >= self.pane_rows:
+            self._panes.append(self._current)
+            self._current = self._new_pane()
+
+    def score(self) -> Dict:
+        window = self._window()
+        data_drift = self._score_frame(self.reference["data"], window["data"])
+        pred_drift = self._score_frame(self.reference["preds"], window["preds"])
+
+        return {
+            "rows": window["data"].rows,
+            "data_drift": data_drift,
+            "is_data_drift_detected": data_drift["drift_detected"],
+            "prediction_drift": pred_drift,
+            "is_pred_drift_detected": pred_drift["drift_detected"],
+        }
+
+    def _new_pane(self) -> Dict[str, FrameSketch]:
+        return {name: sketch.empty() for name, sketch in self.reference.items()}
+
+    def _window(self) -> Dict[str, FrameSketch]:
+        window = self._new_pane()
+        for pane in [*self._panes, self._current]:
+            for name, sketch in window.items():
+                sketch.merge(pane[name])
+        return window
+
+    def _score_frame(self, reference: FrameSketch, current: FrameSketch) -> Dict:
+        columns = {}
+
+        for name, histogram in reference.histograms.items():
+            expected = histogram.frequencies()
+            actual = current.histograms[name].frequencies()
+            columns[name] = self._score_column(expected, actual)
+
+            # Distance between the quantile functions, sampled at the bins
+            q = np.linspace(0, 1, len(expected) + 1)
+            distance = np.abs(
+                current.quantiles[name].quantiles(q)
+                - reference.quantiles[name].quantiles(q)
+            )
+            columns[name]["wasserstein"] = (
+                float(distance.mean()) if current.quantiles[name].total else None
+            )
+
+        for name, counts in reference.categories.items():
+            seen = set(counts.counts) | set(current.categories[name].counts)
+            categories = sorted(seen)
+            expected = counts.frequencies(categories)
+            actual = current.categories[name].frequencies(categories)
+            columns[name] = self._score_column(expected, actual)
+
+        drifted = sum(column["drift_detected"] for column in columns.values())
+        share = drifted / len(columns) if columns else 0.0
+
+        return {
+            "columns": columns,
+            "number_of_drifted_columns": drifted,
+            "share_of_drifted_columns": share,
+            "drift_detected": bool(current.rows) and share >= self.drift_share,
+        }
+
+    def _score_column(self, expected: np.ndarray, actual: np.ndarray) -> Dict:
+        if not actual.sum():
+            return {"psi": None, "jensen_shannon": None, "drift_detected": False}
+
+        value = float(psi(expected, actual))
+        return {
+            "psi": value,
+            "jensen_shannon": float(jensen_shannon(expected, actual)),
+            "drift_detected": value > self.psi_threshold,
+        }
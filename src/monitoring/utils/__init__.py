@@ -1 +1,4 @@
 from .data_buffer import DataBuffer
+from .segment_log import SegmentLog
+from .statistics import jensen_shannon, psi
+from .weighting import resample_by_weight
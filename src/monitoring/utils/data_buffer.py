@@ -1,36 +1,194 @@
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 
+import numpy as np
 import pandas as pd
 
+# Kinds stored in typed arrays, everything else is kept as objects
+NUMERIC_KINDS = "biuf"
+
 
 class DataBuffer:
-    def __init__(self, buffer_path: Path, buffer_size: int):
-        self.buffer_path = buffer_path
+    """
+    Fixed-capacity ring buffer holding the last `buffer_size` rows.
+
+    Every column lives in an array preallocated to the buffer capacity, so
+    appending a batch costs O(batch). The buffer is persisted incrementally:
+    batches are appended to the CSV file, which is only rewritten with the
+    current rows (compacted) once it holds `compact_factor` times the
+    capacity or the columns change. Without `buffer_path` the buffer is only
+    kept in memory.
+    """
+
+    def __init__(
+        self,
+        buffer_path: Optional[Path],
+        buffer_size: int,
+        compact_factor: int = 4,
+    ):
+        self.buffer_path = Path(buffer_path) if buffer_path is not None else None
         self.buffer_size = buffer_size
-        self.buffer = None
+        self.compact_factor = compact_factor
+
+        self._columns: Dict[str, np.ndarray] = {}
+        self._dtypes: Dict[str, object] = {}
+        self._start = 0  # index of the oldest row
+        self._size = 0
+        self._file_rows = 0
 
-        if self.buffer_path.exists():
-            self.buffer = pd.read_csv(self.buffer_path)
+        if self.buffer_path is not None and self.buffer_path.exists():
+            data = pd.read_csv(self.buffer_path)
+            self._file_rows = len(data)
+            self.extend(data, persist=False)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def is_full(self) -> bool:
+        return self._size >= self.buffer_size
 
     def append(self, data: pd.DataFrame) -> Optional[pd.DataFrame]:
-        if self.buffer is None:
-            self.buffer = data
-        else:
-            self.buffer = pd.concat([self.buffer, data], ignore_index=True)
-            self.buffer = self.buffer[-self.buffer_size :]
+        """Appends `data` and returns a copy of the buffer once it is full."""
+        self.extend(data)
+        return self.get_data() if self.is_full else None
+
+    def extend(self, data: pd.DataFrame, persist: bool = True) -> bool:
+        """Appends `data` in O(len(data)) and returns whether the buffer is full."""
+        schema_changed = self._ensure_columns(data)
 
-        self.buffer.to_csv(self.buffer_path, index=False)
+        # Only the last `buffer_size` rows of a large batch can be kept
+        batch = data.iloc[-self.buffer_size :] if len(data) > self.buffer_size else data
+        n_rows = len(batch)
 
-        if len(self.buffer) >= self.buffer_size:
-            return self.buffer.copy()
+        if n_rows:
+            # The batch is written in at most two slices, wrapping at the end
+            end = (self._start + self._size) % self.buffer_size
+            head = min(n_rows, self.buffer_size - end)
 
-        return None
+            for name, values in self._columns.items():
+                if name in batch:
+                    column = self._as_array(batch[name], values.dtype)
+                    values[end : end + head] = column[:head]
+                    values[: n_rows - head] = column[head:]
+                else:
+                    values[end : end + head] = _missing(values.dtype)
+                    values[: n_rows - head] = _missing(values.dtype)
+
+            overflow = max(self._size + n_rows - self.buffer_size, 0)
+            self._start = (self._start + overflow) % self.buffer_size
+            self._size = min(self._size + n_rows, self.buffer_size)
+
+        if persist and self.buffer_path is not None:
+            self._persist(data, schema_changed)
+
+        return self.is_full
 
     def clear(self):
-        self.buffer = None
-        if self.buffer_path.exists():
+        self._columns = {}
+        self._dtypes = {}
+        self._start = 0
+        self._size = 0
+        self._file_rows = 0
+        if self.buffer_path is not None and self.buffer_path.exists():
             self.buffer_path.unlink()
 
     def get_data(self) -> pd.DataFrame:
-        return self.buffer.copy() if self.buffer is not None else pd.DataFrame()
+        if not self._columns:
+            return pd.DataFrame()
+
+        order = (self._start + np.arange(self._size)) % self.buffer_size
+        data = pd.DataFrame(
+            {name: values[order] for name, values in self._columns.items()}
+        )
+
+        for name, dtype in self._dtypes.items():
+            if data[name].dtype != dtype:
+                try:
+                    data[name] = data[name].astype(dtype)
+                except (TypeError, ValueError):
+                    pass
+
+        return data
+
+    # -----------------------------
+    # Columns
+    # -----------------------------
+
+    def _ensure_columns(self, data: pd.DataFrame) -> bool:
+        """Allocates new columns and widens dtypes. Returns if the schema changed."""
+        changed = False
+
+        for name in data.columns:
+            dtype = data[name].dtype
+            storage = _storage_dtype(dtype)
+
+            if name not in self._columns:
+                values = np.empty(self.buffer_size, dtype=storage)
+                values[:] = _missing(storage)
+                self._columns[name] = values
+                self._dtypes[name] = dtype
+                changed = True
+                continue
+
+            if dtype != self._dtypes[name]:
+                self._dtypes[name] = _common_dtype(self._dtypes[name], dtype)
+
+            current = self._columns[name].dtype
+            widened = (
+                np.result_type(current, storage)
+                if current.kind in NUMERIC_KINDS and storage.kind in NUMERIC_KINDS
+                else np.dtype(object)
+            )
+            if widened != current:
+                self._columns[name] = self._columns[name].astype(widened)
+                changed = True
+
+        return changed
+
+    @staticmethod
+    def _as_array(series: pd.Series, dtype: np.dtype) -> np.ndarray:
+        if dtype.kind in NUMERIC_KINDS:
+            return series.to_numpy(dtype=dtype, na_value=_missing(dtype))
+        return series.to_numpy(dtype=object)
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+
+    def _persist(self, data: pd.DataFrame, schema_changed: bool):
+        columns = list(self._columns)
+        compact = (
+            schema_changed
+            or list(data.columns) != columns
+            or self._file_rows + len(data) > self.compact_factor * self.buffer_size
+        )
+
+        if compact:
+            current = self.get_data()
+            current.to_csv(self.buffer_path, index=False)
+            self._file_rows = len(current)
+        else:
+            header = not self.buffer_path.exists()
+            data.to_csv(self.buffer_path, mode="a", header=header, index=False)
+            self._file_rows += len(data)
+
+
+def _storage_dtype(dtype) -> np.dtype:
+    if isinstance(dtype, np.dtype) and dtype.kind in NUMERIC_KINDS:
+        # Integers and booleans are widened to floats so rows can be missing
+        return np.dtype(np.float64) if dtype.kind in "biu" else dtype
+    return np.dtype(object)
+
+
+def _common_dtype(left, right):
+    if all(
+        isinstance(dtype, np.dtype) and dtype.kind in NUMERIC_KINDS
+        for dtype in (left, right)
+    ):
+        return np.result_type(left, right)
+    return np.dtype(object)
+
+
+def _missing(dtype: np.dtype):
+    return np.nan if dtype.kind in NUMERIC_KINDS else None
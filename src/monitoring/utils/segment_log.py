@@ -0,0 +1,180 @@
+import logging
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger()
+
+# Every segment starts with its number of rows, payload length and payload CRC32
+SEGMENT_HEADER = struct.Struct(">III")
+SEGMENT_SUFFIX = ".arrow"
+COLUMN_SEPARATOR = "/"
+
+
+class SegmentLog:
+    """
+    Append-only log of row-aligned DataFrames stored as columnar segments.
+
+    Each `append` writes one segment: the frames passed together (e.g. the
+    inputs and the predictions of a batch) are laid out as the columns of a
+    single Arrow IPC record batch, so they can only be recovered together.
+    Segments are written to a temporary file and renamed into place, and the
+    CRC32 in their header discards any segment damaged after a crash.
+
+    `recover` reads the newest segments back until they cover `capacity` rows
+    and drops the older ones. Once the log holds `compact_factor` times the
+    capacity, `compact` replaces it with a single segment of the current rows.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        capacity: int,
+        compact_factor: int = 4,
+        fsync: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.capacity = capacity
+        self.compact_factor = compact_factor
+        self.fsync = fsync
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments = self._segments()
+        self._next_sequence = int(segments[-1].stem) + 1 if segments else 0
+        self._rows = sum(self._read_header(path)[0] for path in segments)
+        self._corrupt = 0
+
+    @property
+    def should_compact(self) -> bool:
+        return self._rows > self.compact_factor * self.capacity
+
+    def append(self, frames: Dict[str, pd.DataFrame]):
+        n_rows = _aligned_rows(frames)
+        if n_rows:
+            self._write(frames, n_rows)
+
+    def compact(self, frames: Dict[str, pd.DataFrame]):
+        """Replaces every segment with a single one holding `frames`."""
+        previous = self._segments()
+        n_rows = _aligned_rows(frames)
+
+        # The new segment is in place before the old ones are removed, so a
+        # crash in between only leaves segments that recovery skips
+        if n_rows:
+            self._write(frames, n_rows)
+        for path in previous:
+            path.unlink(missing_ok=True)
+
+        self._rows = n_rows
+
+    def recover(self) -> Dict[str, pd.DataFrame]:
+        """
+        Returns the last `capacity` logged rows of every frame, reading only
+        the segments that cover them.
+        """
+        segments = self._segments()
+        tables, n_rows = [], 0
+
+        for index in range(len(segments) - 1, -1, -1):
+            if n_rows >= self.capacity:
+                # Older segments are outside the window
+                for path in segments[: index + 1]:
+                    path.unlink(missing_ok=True)
+                break
+
+            table = self._read(segments[index])
+            if table is not None:
+                tables.append(table)
+                n_rows += table.num_rows
+
+        self._rows = n_rows
+        if not tables:
+            return {}
+
+        frames = [table.to_pandas() for table in reversed(tables)]
+        combined = pd.concat(frames, ignore_index=True).iloc[-self.capacity :]
+        return _split(combined.reset_index(drop=True))
+
+    def clear(self):
+        for path in self._segments():
+            path.unlink(missing_ok=True)
+        self._rows = 0
+
+    def stats(self) -> Dict:
+        return {
+            "log_segments": len(self._segments()),
+            "log_rows": self._rows,
+            "log_corrupt_segments": self._corrupt,
+        }
+
+    # -----------------------------
+    # Segments
+    # -----------------------------
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def _write(self, frames: Dict[str, pd.DataFrame], n_rows: int):
+        columns = {
+            f"{name}{COLUMN_SEPARATOR}{column}": frame[column].to_numpy()
+            for name, frame in frames.items()
+            for column in frame.columns
+        }
+        batch = pa.RecordBatch.from_pydict(columns)
+
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        payload = sink.getvalue().to_pybytes()
+
+        path = self.directory / f"{self._next_sequence:012d}{SEGMENT_SUFFIX}"
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as file:
+            file.write(SEGMENT_HEADER.pack(n_rows, len(payload), zlib.crc32(payload)))
+            file.write(payload)
+            file.flush()
+            if self.fsync:
+                os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+
+        self._next_sequence += 1
+        self._rows += n_rows
+
+    def _read_header(self, path: Path) -> Tuple[int, int, int]:
+        with open(path, "rb") as file:
+            header = file.read(SEGMENT_HEADER.size)
+        if len(header) < SEGMENT_HEADER.size:
+            return 0, 0, 0
+        return SEGMENT_HEADER.unpack(header)
+
+    def _read(self, path: Path):
+        data = path.read_bytes()
+        if len(data) >= SEGMENT_HEADER.size:
+            n_rows, size, crc = SEGMENT_HEADER.unpack_from(data)
+            payload = data[SEGMENT_HEADER.size : SEGMENT_HEADER.size + size]
+            if len(payload) == size and zlib.crc32(payload) == crc:
+                return pa.ipc.open_stream(payload).read_all()
+
+        self._corrupt += 1
+        logger.warning(f"Skipping corrupt drift buffer segment {path.name}")
+        return None
+
+
+def _aligned_rows(frames: Dict[str, pd.DataFrame]) -> int:
+    lengths = {len(frame) for frame in frames.values()}
+    if len(lengths) > 1:
+        raise ValueError("The frames of a segment must have the same number of rows")
+    return lengths.pop() if lengths else 0
+
+
+def _split(combined: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    frames: Dict[str, Dict[str, pd.Series]] = {}
+    for column in combined.columns:
+        name, _, original = column.partition(COLUMN_SEPARATOR)
+        frames.setdefault(name, {})[original] = combined[column]
+    return {name: pd.DataFrame(columns) for name, columns in frames.items()}
@@ -0,0 +1,25 @@
+import numpy as np
+
+# Floor applied to empty bins so the log ratios stay finite
+EPSILON = 1e-4
+
+
+def psi(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """Population stability index between frequencies, along the last axis."""
+    reference = np.clip(reference, EPSILON, None)
+    current = np.clip(current, EPSILON, None)
+    return np.sum((current - reference) * np.log(current / reference), axis=-1)
+
+
+def jensen_shannon(reference: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """Jensen-Shannon distance between frequencies, along the last axis."""
+    reference = reference / np.clip(reference.sum(-1, keepdims=True), EPSILON, None)
+    current = current / np.clip(current.sum(-1, keepdims=True), EPSILON, None)
+    middle = (reference + current) / 2
+
+    def _kl(p, m):
+        ratio = np.where(p > 0, p / np.where(m > 0, m, 1.0), 1.0)
+        return np.sum(p * np.log(ratio), axis=-1)
+
+    divergence = (_kl(reference, middle) + _kl(current, middle)) / 2
+    return np.sqrt(np.clip(divergence, 0.0, None))
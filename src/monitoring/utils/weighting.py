@@ -0,0 +1,29 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def resample_by_weight(
+    data: pd.DataFrame,
+    preds: pd.DataFrame,
+    weights: np.ndarray,
+    seed: Optional[int] = 0,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Draws as many rows as there are, with replacement and probability
+    proportional to their sampling weight, so that a sample taken at different
+    rates per row matches the distribution of the scored traffic. Rows with
+    uniform weights are returned untouched.
+    """
+    weights = np.nan_to_num(np.asarray(weights, dtype=float), nan=1.0)
+    if len(weights) == 0 or np.allclose(weights, weights[0]):
+        return data, preds
+
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(weights), size=len(weights), p=weights / weights.sum())
+
+    return (
+        data.iloc[rows].reset_index(drop=True),
+        preds.iloc[rows].reset_index(drop=True),
+    )
@@ -1,2 +1,8 @@
-from .inference_pipeline import run_inference_pipeline
+from .inference_pipeline import (
+    publish_predictions,
+    record_scoring,
+    run_inference_pipeline,
+    run_inference_plan,
+)
+from .inference_plan import InferencePlan
 from .train_pipeline import run_training_pipeline
@@ -4,8 +4,9 @@ import numpy as np
 import pandas as pd
 from sklearn.base import BaseEstimator, TransformerMixin
 
-from src.features import preprocess_data
 from src.messaging import MqClient
+from src.pipeline.inference_plan import InferencePlan
+from src.telemetry import BATCH_ROWS, ROWS_TOTAL, observe_stages, time_stage
 
 logger = logging.getLogger()
 
@@ -15,18 +16,21 @@ def run_inference_pipeline(
     transformer: TransformerMixin,
     X: pd.DataFrame,
     messaging_client: MqClient,
+) -> np.ndarray:
+    return run_inference_plan(InferencePlan(model, transformer), X, messaging_client)
+
+
+def run_inference_plan(
+    plan: InferencePlan, X: pd.DataFrame, messaging_client: MqClient
 ) -> np.ndarray:
     try:
         logger.info(f"Running prediction on input shape: {X.shape}")
-        X = preprocess_data(X)
-        X = transformer.transform(X)
-
-        preds = model.predict(X)
-        probs = model.predict_proba(X)
+        X, preds, probs, timings = plan.score_timed(X)
+        record_scoring(len(X), timings)
 
         logger.info("Prediction completed.")
 
-        _send_mq_message(messaging_client, X.to_json(orient="records"), probs.tolist())
+        publish_predictions(messaging_client, X, probs)
 
         return preds, probs
 
@@ -35,6 +39,24 @@ def run_inference_pipeline(
         raise RuntimeError("Prediction failed.") from e
 
 
+def publish_predictions(
+    messaging_client: MqClient, X: pd.DataFrame, probs: np.ndarray
+) -> None:
+    """
+    Sends the transformed inputs and probabilities to the monitoring queue.
+    They are encoded by the serializer of the messaging client.
+    """
+    with time_stage("publish"):
+        _send_mq_message(messaging_client, X, probs)
+
+
+def record_scoring(n_rows: int, timings: dict) -> None:
+    """Records the stage timings and the size of a scored frame."""
+    observe_stages(timings)
+    BATCH_ROWS.observe(n_rows)
+    ROWS_TOTAL.inc(n_rows)
+
+
 def _send_mq_message(messaging_client: MqClient, input_data, probs):
     message = {
         "input_data": input_data,
@@ -0,0 +1,52 @@
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from src.features import preprocess_data
+
+
+class InferencePlan:
+    """
+    Fused scoring plan built once from a fitted model and feature transformer.
+
+    Predictions are derived from a single `predict_proba` pass (the class with
+    the highest probability, as `predict` does for the supported classifiers)
+    and the caller's frame is never modified.
+    """
+
+    def __init__(self, model: BaseEstimator, transformer: TransformerMixin):
+        if not hasattr(model, "predict_proba"):
+            raise ValueError("Inference plan requires a model with predict_proba")
+
+        self.model = model
+        self.transformer = transformer
+        self.classes = np.asarray(model.classes_)
+
+    def score(self, X: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """
+        Runs preprocessing, feature transformation and a single probability
+        pass. Returns the transformed frame, the predictions and the
+        probabilities.
+        """
+        X, preds, probs, _ = self.score_timed(X)
+        return X, preds, probs
+
+    def score_timed(
+        self, X: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray, Dict[str, float]]:
+        """Same as `score`, also returning the duration of each stage in seconds."""
+        t0 = time.perf_counter()
+        X = preprocess_data(X, inplace=False)
+        t1 = time.perf_counter()
+        X = self.transformer.transform(X)
+        t2 = time.perf_counter()
+
+        probs = self.model.predict_proba(X)
+        preds = self.classes.take(probs.argmax(axis=1))
+        t3 = time.perf_counter()
+
+        timings = {"preprocess": t1 - t0, "transform": t2 - t1, "predict": t3 - t2}
+        return X, preds, probs, timings
@@ -13,6 +13,7 @@ from src.experiment_tracker import create_experiment_tracker
 from src.explainer import explain_model
 from src.features import prepare_training_data, preprocess_data
 from src.models import create_model
+from src.monitoring import ReferenceProfile
 from src.target import encode_target
 from src.tuning import create_tuner
 
@@ -81,12 +82,22 @@ def run_training_pipeline(cfg) -> None:
         train_data_snapshot["pred"] = y_train_pred
         train_data_snapshot["proba"] = y_train_proba
 
+        # Reference profile the drift detector compares against
+        reference_profile = ReferenceProfile.from_frames(
+            X_train,
+            train_data_snapshot[["proba"]],
+            bins=cfg["drift"].get("reference_bins", 10),
+        )
+
         # Save artifacts to local directory
         save_artifact(model, artifacts_path / "model.pkl")
         save_artifact(best_params, artifacts_path / "params.json")
         save_artifact(transformer, artifacts_path / "transformer.pkl")
         save_artifact(transformations, artifacts_path / "transformations.json")
         save_artifact(train_data_snapshot, artifacts_path / "train_data.csv")
+        save_artifact(
+            reference_profile.to_dict(), artifacts_path / "reference_profile.json"
+        )
         save_artifact(metrics, artifacts_path / "metrics.json")
 
         # Experiment tracking
@@ -113,6 +124,9 @@ def run_training_pipeline(cfg) -> None:
                 artifacts_path / "transformations.json", category="artifact"
             )
             tracker.log_artifact(artifacts_path / "train_data.csv", category="dataset")
+            tracker.log_artifact(
+                artifacts_path / "reference_profile.json", category="dataset"
+            )
             tracker.log_artifact(artifacts_path / "cm.png", category="images")
             tracker.log_artifact(artifacts_path / "pr_curve.png", category="images")
             tracker.log_artifact(artifacts_path / "roc_curve.png", category="images")
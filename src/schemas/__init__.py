@@ -1,2 +1,3 @@
+from .columnar_request import ColumnarPredictionRequest, decode_columnar_request
 from .request import PredictionRequest
 from .response import PredictionResponse
@@ -0,0 +1,70 @@
+from typing import Annotated, Dict, List
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, create_model, model_validator
+from pydantic.fields import FieldInfo
+
+from src.schemas.request import PredictionRequest
+
+NUMPY_DTYPES = {int: np.int64, float: np.float64}
+
+
+class _ColumnarBase(BaseModel):
+    @model_validator(mode="after")
+    def check_column_lengths(self):
+        lengths = {name: len(values) for name, values in self}
+        if len(set(lengths.values())) > 1:
+            raise ValueError(f"All columns must have the same length: {lengths}")
+        return self
+
+
+def _element_type(field: FieldInfo):
+    # Elements keep the constraints of the row field (e.g. the int64 range)
+    if field.metadata:
+        return Annotated[(field.annotation, *field.metadata)]
+    return field.annotation
+
+
+# One list per PredictionRequest field, so element validation stays identical
+ColumnarPredictionRequest = create_model(
+    "ColumnarPredictionRequest",
+    __base__=_ColumnarBase,
+    **{
+        name: (List[_element_type(field)], ...)
+        for name, field in PredictionRequest.model_fields.items()
+    },
+)
+
+
+def decode_columnar_request(body: bytes) -> pd.DataFrame:
+    """
+    Validates a columnar JSON body and builds the input frame column by column.
+
+    Numeric fields become typed NumPy arrays and categorical fields object
+    arrays of the validated strings, the same dtypes `/predict` produces, so
+    no per-row dict or model instance is allocated.
+
+    Args:
+        body (bytes): Raw JSON body with one array per feature.
+
+    Returns:
+        pd.DataFrame: Input frame equivalent to the row-oriented request.
+
+    Raises:
+        pydantic.ValidationError: If the body does not match the schema.
+    """
+    request = ColumnarPredictionRequest.model_validate_json(body)
+
+    columns: Dict[str, np.ndarray] = {}
+    for name, field in PredictionRequest.model_fields.items():
+        values = getattr(request, name)
+
+        if field.annotation is str:
+            columns[name] = np.array(values, dtype=object)
+        else:
+            columns[name] = np.fromiter(
+                values, dtype=NUMPY_DTYPES[field.annotation], count=len(values)
+            )
+
+    return pd.DataFrame(columns, copy=False)
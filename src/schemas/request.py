@@ -1,8 +1,13 @@
-from pydantic import BaseModel
+from typing import Annotated
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Integer features are scored as int64 columns
+Int64 = Annotated[int, Field(ge=-(2**63), le=2**63 - 1)]
 
 
 class PredictionRequest(BaseModel):
-    age: int
+    age: Int64
     job: str
     marital: str
     education: str
@@ -11,16 +16,16 @@ class PredictionRequest(BaseModel):
     housing: str
     loan: str
     contact: str
-    day: int
+    day: Int64
     month: str
     duration: float
-    campaign: int
+    campaign: Int64
     pdays: float
-    previous: int
+    previous: Int64
     poutcome: str
 
-    class Config:
-        schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "age": 48,
                 "job": "management",
@@ -40,3 +45,4 @@ class PredictionRequest(BaseModel):
                 "poutcome": "failure",
             }
         }
+    )
@@ -0,0 +1,87 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.monitoring import ReferenceProfile, create_drift_detector
+from src.scripts.serving import generate_random_prediction
+
+
+def build_frames(n_rows: int, shift: float = 0.0):
+    """Random prediction inputs and probabilities, numeric columns shifted by
+    `shift` standard deviations."""
+    data = pd.DataFrame(
+        [generate_random_prediction().model_dump() for _ in range(n_rows)]
+    )
+    numeric = data.select_dtypes("number").columns
+    data[numeric] = data[numeric] + shift * data[numeric].std()
+
+    preds = pd.DataFrame({"proba": np.clip(np.random.rand(n_rows) + shift, 0, 1)})
+    return data, preds
+
+
+def benchmark(backend: str, reference, windows, repeat: int) -> dict:
+    training_data, training_preds, profile = reference
+    detector = create_drift_detector(
+        backend,
+        reference_profile=profile,
+        training_data=training_data,
+        training_preds=training_preds,
+    )
+
+    decisions = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for current_data, current_preds in windows:
+            result = detector.check_drift(current_data, current_preds)
+            decisions.append(result["is_data_drift_detected"])
+    elapsed = time.perf_counter() - start
+
+    checks = repeat * len(windows)
+    return {
+        "backend": backend,
+        "checks_per_s": checks / elapsed,
+        "ms_per_check": elapsed / checks * 1000,
+        "decisions": decisions[: len(windows)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compares how many drift checks per second each detector "
+        "backend sustains."
+    )
+    parser.add_argument("--reference-rows", type=int, default=5000)
+    parser.add_argument("--window-rows", type=int, default=1000)
+    parser.add_argument(
+        "--shifts",
+        nargs="+",
+        type=float,
+        default=[0.0, 0.5],
+        help="Shift of each window, in standard deviations",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--backends", nargs="+", default=["evidently", "native"], help="Backends"
+    )
+    args = parser.parse_args()
+
+    training_data, training_preds = build_frames(args.reference_rows)
+    profile = ReferenceProfile.from_frames(training_data, training_preds)
+    reference = (training_data, training_preds, profile)
+    windows = [build_frames(args.window_rows, shift) for shift in args.shifts]
+
+    results = pd.DataFrame(
+        [benchmark(name, reference, windows, args.repeat) for name in args.backends]
+    ).set_index("backend")
+
+    print(
+        f"{args.reference_rows} reference rows, windows of {args.window_rows} rows "
+        f"with shifts {args.shifts}, {args.repeat} repetitions"
+    )
+    print(results.round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from omegaconf import OmegaConf
+
+from src.messaging import LocalBroker, create_messaging_client, decode_message
+from src.scripts.serving import generate_random_prediction
+
+CONFIG_DIR = Path(__file__).resolve().parents[2] / "config" / "messaging"
+
+
+def build_events(n_events: int, rows_per_event: int) -> list:
+    """Synthetic prediction events, reused round-robin by the producer."""
+    n_distinct = min(n_events, 100)
+    events = []
+    for _ in range(n_distinct):
+        input_data = pd.DataFrame(
+            [generate_random_prediction().model_dump() for _ in range(rows_per_event)]
+        )
+        positive = np.random.rand(rows_per_event)
+        events.append(
+            {
+                "input_data": input_data,
+                "probabilities": np.column_stack([1 - positive, positive]),
+            }
+        )
+    return events
+
+
+# -----------------------------
+# Consumer process
+# -----------------------------
+
+
+def consume(messaging_cfg: dict, expected_rows: int, batch_size, timeout, results):
+    client = create_messaging_client(messaging_cfg["type"], messaging_cfg["params"])
+    client.connect(delay=0.5)
+    results.put("ready")
+
+    lags, state = [], {"rows": 0, "messages": 0, "last": None}
+    done = threading.Event()
+    lock = threading.Lock()
+
+    def handle(bodies):
+        received_at = time.time()
+        for body, content_type in bodies:
+            message = decode_message(body, content_type)
+            events = message["events"] if "events" in message else [message]
+            with lock:
+                state["messages"] += 1
+                for event in events:
+                    n_rows = len(event["probabilities"])
+                    sent_at = np.broadcast_to(np.asarray(event["sent_at"]), n_rows)
+                    lags.append(received_at - sent_at.astype(float))
+                    state["rows"] += n_rows
+                state["last"] = received_at
+                if state["rows"] >= expected_rows:
+                    done.set()
+
+    def callback(ch, method, properties, body):
+        handle([(body, getattr(properties, "content_type", None))])
+
+    def batch_callback(messages):
+        handle([(message.body, message.content_type) for message in messages])
+
+    cpu_start = time.process_time()
+    threading.Thread(
+        target=client.start_consuming,
+        args=(batch_callback, batch_size) if batch_size else (callback,),
+        daemon=True,
+    ).start()
+    done.wait(timeout)
+    cpu = time.process_time() - cpu_start
+
+    with lock:
+        results.put(
+            {
+                "rows": state["rows"],
+                "messages": state["messages"],
+                "last_received_at": state["last"],
+                "lags": np.concatenate(lags).tolist() if lags else [],
+                "cpu_seconds": cpu,
+            }
+        )
+    results.close()
+    results.join_thread()
+    # The consuming thread never returns, leave without waiting for it
+    os._exit(0)
+
+
+# -----------------------------
+# Benchmark
+# -----------------------------
+
+
+def run(args) -> dict:
+    messaging_cfg = OmegaConf.to_container(
+        OmegaConf.load(CONFIG_DIR / f"{args.messaging}.yaml"), resolve=True
+    )
+    messaging_cfg.setdefault("params", {})
+    if args.serializer:
+        messaging_cfg["params"]["serializer"] = args.serializer
+    if not args.publisher:
+        messaging_cfg.pop("publisher", None)
+
+    broker = None
+    if args.start_broker:
+        broker = LocalBroker(messaging_cfg["params"]["address"])
+        broker.start()
+
+    events = build_events(args.events, args.rows)
+    expected_rows = args.events * args.rows
+
+    consumer, results = None, None
+    if messaging_cfg["type"] != "dummy":
+        context = mp.get_context("spawn")
+        results = context.Queue()
+        consumer = context.Process(
+            target=consume,
+            args=(messaging_cfg, expected_rows, args.batch_size, args.timeout, results),
+        )
+        consumer.start()
+        # Publishing starts once the consumer is connected, so the lag does not
+        # include its start-up
+        results.get(timeout=args.timeout)
+
+    client = create_messaging_client(
+        messaging_cfg["type"],
+        messaging_cfg["params"],
+        messaging_cfg.get("publisher"),
+    )
+    client.connect(delay=0.5)
+
+    # Spread the events evenly over time when a target rate is given
+    interval = 1 / args.rate if args.rate else 0.0
+    start = time.time()
+    for i in range(args.events):
+        if interval:
+            delay = start + i * interval - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        client.send_message({**events[i % len(events)], "sent_at": time.time()})
+    publish_seconds = time.time() - start
+    client.close()
+
+    report = {
+        "commit": _git_commit(),
+        "backend": messaging_cfg["type"],
+        "serializer": messaging_cfg["params"].get("serializer", "json"),
+        "publisher": bool(args.publisher),
+        "events": args.events,
+        "rows_per_event": args.rows,
+        "target_rate": args.rate,
+        "publish_events_per_s": args.events / publish_seconds,
+    }
+
+    if consumer is not None:
+        consumed = results.get(timeout=args.timeout + 60)
+        consumer.join()
+
+        events_consumed = consumed["rows"] / args.rows
+        lags_ms = np.asarray(consumed["lags"]) * 1000
+        elapsed = (consumed["last_received_at"] or time.time()) - start
+
+        report.update(
+            {
+                "events_consumed": events_consumed,
+                "messages_consumed": consumed["messages"],
+                "end_to_end_events_per_s": events_consumed / elapsed,
+                "lag_ms": {
+                    f"p{q}": float(np.percentile(lags_ms, q)) if len(lags_ms) else None
+                    for q in (50, 90, 99)
+                }
+                | {"max": float(lags_ms.max()) if len(lags_ms) else None},
+                "consumer_cpu_us_per_event": consumed["cpu_seconds"]
+                / max(events_consumed, 1)
+                * 1e6,
+            }
+        )
+
+    if broker is not None:
+        broker.stop()
+
+    return report
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Publishes synthetic prediction events through a messaging "
+        "backend and measures the publish and consume path."
+    )
+    parser.add_argument(
+        "--messaging", default="local", help="Config in config/messaging/"
+    )
+    parser.add_argument("--serializer", choices=["json", "arrow"], default=None)
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--rows", type=int, default=1, help="Rows per event")
+    parser.add_argument(
+        "--rate", type=float, default=None, help="Target events/s (default: max)"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=100, help="Consumer batch size (0: off)"
+    )
+    parser.add_argument(
+        "--publisher",
+        action="store_true",
+        help="Publish through the publisher layers of the config",
+    )
+    parser.add_argument(
+        "--start-broker",
+        action="store_true",
+        help="Start a local broker in this process",
+    )
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--output", default=".benchmarks/messaging.json")
+    args = parser.parse_args()
+
+    report = run(args)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    print(json.dumps(report, indent=2))
+    print(f"Saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.messaging import create_serializer
+from src.scripts.serving import generate_random_prediction
+
+
+def build_message(n_rows: int, n_events: int) -> dict:
+    """Batched prediction message with `n_events` events of `n_rows` rows each."""
+    events = []
+    for _ in range(n_events):
+        input_data = pd.DataFrame(
+            [generate_random_prediction().model_dump() for _ in range(n_rows)]
+        )
+        positive = np.random.rand(n_rows)
+        probs = np.column_stack([1 - positive, positive])
+        events.append({"input_data": input_data, "probabilities": probs})
+
+    return {"events": events}
+
+
+def benchmark(serializer_type: str, message: dict, repeat: int) -> dict:
+    serializer = create_serializer(serializer_type)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = serializer.dumps(message)
+    encode_time = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        serializer.loads(body)
+    decode_time = (time.perf_counter() - start) / repeat
+
+    return {
+        "serializer": serializer_type,
+        "size_bytes": len(body),
+        "encode_ms": encode_time * 1000,
+        "decode_ms": decode_time * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compares the size and speed of the message serializers."
+    )
+    parser.add_argument("--rows", type=int, default=500, help="Rows per event")
+    parser.add_argument("--events", type=int, default=1, help="Events per message")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--serializers", nargs="+", default=["json", "arrow"], help="Formats to run"
+    )
+    args = parser.parse_args()
+
+    message = build_message(args.rows, args.events)
+    results = pd.DataFrame(
+        [benchmark(name, message, args.repeat) for name in args.serializers]
+    ).set_index("serializer")
+
+    n_rows = args.rows * args.events
+    results["bytes_per_row"] = results["size_bytes"] / n_rows
+
+    print(f"{n_rows} rows in {args.events} event(s), {args.repeat} repetitions")
+    print(results.round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
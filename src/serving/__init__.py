@@ -0,0 +1,8 @@
+from .active_model import ActiveModel
+from .inference_executor import ExecutorSaturatedError, InferenceExecutor
+from .memory import read_memory_usage
+from .micro_batcher import MicroBatcher
+from .model_loader import ModelBundle, load_model_bundle, warmup_plan
+from .model_watcher import ModelWatcher
+from .prediction_cache import CacheLookup, PredictionCache
+from .readiness import ReadinessStatus
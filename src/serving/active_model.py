@@ -0,0 +1,102 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+from src.serving.model_loader import ModelBundle
+
+logger = logging.getLogger()
+
+
+class ActiveModel:
+    """
+    Holds the model bundle currently serving traffic.
+
+    Requests lease the bundle for the duration of their inference, so a swap
+    never changes the model under a running request. Replaced bundles are
+    kept referenced until their last lease is released.
+    """
+
+    def __init__(self, bundle: ModelBundle):
+        self._bundle = bundle
+        self._loaded_at = time.time()
+        self._leases: Dict[int, int] = {id(bundle): 0}
+        self._draining: List[ModelBundle] = []
+        self._condition = threading.Condition()
+
+    @property
+    def bundle(self) -> ModelBundle:
+        return self._bundle
+
+    @property
+    def version(self):
+        return self._bundle.version
+
+    # -----------------------------
+    # Leases
+    # -----------------------------
+
+    def lease(self) -> ModelBundle:
+        with self._condition:
+            bundle = self._bundle
+            self._leases[id(bundle)] += 1
+            return bundle
+
+    def release(self, bundle: ModelBundle):
+        with self._condition:
+            self._leases[id(bundle)] -= 1
+
+            if self._leases[id(bundle)] == 0 and bundle in self._draining:
+                self._draining.remove(bundle)
+                del self._leases[id(bundle)]
+                logger.info(f"Model version {bundle.version} drained and released")
+                self._condition.notify_all()
+
+    @contextmanager
+    def acquire(self) -> Iterator[ModelBundle]:
+        bundle = self.lease()
+        try:
+            yield bundle
+        finally:
+            self.release(bundle)
+
+    # -----------------------------
+    # Swap
+    # -----------------------------
+
+    def swap(self, bundle: ModelBundle) -> ModelBundle:
+        """Atomically replaces the active bundle and returns the previous one."""
+        with self._condition:
+            previous = self._bundle
+            self._bundle = bundle
+            self._loaded_at = time.time()
+            self._leases.setdefault(id(bundle), 0)
+
+            if self._leases[id(previous)] > 0:
+                self._draining.append(previous)
+            else:
+                del self._leases[id(previous)]
+
+        logger.info(f"Model version {previous.version} -> {bundle.version}")
+        return previous
+
+    def wait_drained(self, bundle: ModelBundle, timeout: float = None) -> bool:
+        """Waits until no request holds `bundle`. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: bundle not in self._draining, timeout=timeout
+            )
+
+    def status(self) -> Dict:
+        with self._condition:
+            return {
+                "version": self._bundle.version,
+                "loaded_at": self._loaded_at,
+                "in_flight": self._leases[id(self._bundle)],
+                "timings": self._bundle.timings,
+                "draining": [
+                    {"version": b.version, "in_flight": self._leases[id(b)]}
+                    for b in self._draining
+                ],
+            }
@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.messaging import MqClient
+from src.pipeline import (
+    InferencePlan,
+    publish_predictions,
+    record_scoring,
+    run_inference_plan,
+)
+from src.serving.active_model import ActiveModel
+from src.serving.model_loader import ModelBundle, warmup_plan
+
+logger = logging.getLogger()
+
+ExecutorType = Literal["thread", "process"]
+
+# Inference plan of each worker process (process executor only)
+_worker_plan: Optional[InferencePlan] = None
+
+
+def _init_worker(plan: InferencePlan, warmup_rows: int = 0):
+    global _worker_plan
+    _worker_plan = plan
+
+    # Each worker warms its own copy of the plan before its first request
+    warmup_plan(plan, warmup_rows)
+
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+
+def _score_in_worker(X: pd.DataFrame):
+    return _worker_plan.score_timed(X)
+
+
+def _set_prediction_error(result: Future, cause: Exception):
+    logger.error("Error during prediction.", exc_info=cause)
+    error = RuntimeError("Prediction failed.")
+    error.__cause__ = cause
+    result.set_exception(error)
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when the inference executor queue is full."""
+
+
+class InferenceExecutor:
+    """
+    Runs model scoring on a dedicated, sized executor so that the event loop
+    (and the default anyio threadpool) never executes CPU-bound work or the
+    blocking publication of monitoring messages.
+
+    With a `process` executor the model is scored in worker processes and the
+    monitoring message is published from a local I/O thread, since messaging
+    connections cannot be shared across processes. Every worker scores
+    `warmup_rows` synthetic rows when it starts, before its first request.
+
+    Each model version gets its own worker pool: `prepare` starts the pool of
+    a new bundle before it is swapped in, and `retire` stops the pool of the
+    previous bundle once its in-flight requests have drained, so requests
+    never wait for worker processes to start.
+    """
+
+    def __init__(
+        self,
+        active_model: ActiveModel,
+        messaging_client: MqClient,
+        executor_type: ExecutorType = "thread",
+        max_workers: int = 4,
+        max_queue_size: int = 256,
+        warmup_rows: int = 0,
+    ):
+        if executor_type not in ("thread", "process"):
+            raise ValueError(f"Unsupported executor type: {executor_type}")
+
+        self.active_model = active_model
+        self.messaging_client = messaging_client
+        self.executor_type = executor_type
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self.warmup_rows = warmup_rows
+
+        self._running = False
+        self._pool = None
+        self._io_pool = None
+        self._process_pools: List[Tuple[ModelBundle, ProcessPoolExecutor]] = []
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+
+    def start(self):
+        if self.executor_type == "thread":
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="inference"
+            )
+        else:
+            self.prepare(self.active_model.bundle)
+            self._io_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="inference-io"
+            )
+        self._running = True
+
+        logger.info(
+            f"Inference executor started ({self.executor_type}, "
+            f"max_workers={self.max_workers}, max_queue_size={self.max_queue_size})"
+        )
+
+    def prepare(self, bundle: ModelBundle):
+        """Starts and warms the worker pool of `bundle` (process executor only)."""
+        if self.executor_type != "process":
+            return
+
+        pool = self._start_process_pool(bundle)
+        with self._lock:
+            self._process_pools.append((bundle, pool))
+
+    def retire(self, bundle: ModelBundle):
+        """Stops the worker pool of a bundle that no longer serves requests."""
+        with self._lock:
+            retired = [pool for b, pool in self._process_pools if b is bundle]
+            self._process_pools = [
+                (b, pool) for b, pool in self._process_pools if b is not bundle
+            ]
+
+        # Tasks still queued on the retired workers are completed
+        for pool in retired:
+            pool.shutdown(wait=False)
+
+    def _start_process_pool(self, bundle: ModelBundle) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            initializer=_init_worker,
+            initargs=(bundle.plan, self.warmup_rows),
+        )
+
+        # Start (and warm) every worker now instead of on the first requests
+        wait([pool.submit(_worker_pid) for _ in range(self.max_workers)])
+        return pool
+
+    def shutdown(self, wait: bool = True):
+        self._running = False
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+        with self._lock:
+            process_pools, self._process_pools = self._process_pools, []
+        for _, pool in process_pools:
+            pool.shutdown(wait=wait)
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=wait)
+            self._io_pool = None
+
+    # -----------------------------
+    # Submission
+    # -----------------------------
+
+    def submit(self, X: pd.DataFrame) -> Future:
+        """Schedules the inference of `X` and returns a future with (preds, probs)."""
+        if not self._running:
+            raise RuntimeError("Inference executor is not running. Call start() first.")
+
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue_size:
+                self._rejected += 1
+                raise ExecutorSaturatedError("Inference executor queue is full.")
+
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
+        bundle = self.active_model.lease()
+        try:
+            if self.executor_type == "thread":
+                future = self._pool.submit(
+                    run_inference_plan, bundle.plan, X, self.messaging_client
+                )
+            else:
+                future = self._submit_to_process(bundle, X)
+
+        except Exception:
+            self.active_model.release(bundle)
+            self._on_done(None)
+            raise
+
+        future.add_done_callback(lambda f: self.active_model.release(bundle))
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def predict(self, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Awaits the inference of `X` without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(X))
+
+    def run(self, X: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Blocking helper for callers that already run off the event loop."""
+        return self.submit(X).result()
+
+    def _submit_to_process(self, bundle: ModelBundle, X: pd.DataFrame) -> Future:
+        with self._lock:
+            pool = next((p for b, p in self._process_pools if b is bundle), None)
+            if pool is None:
+                # The bundle was swapped in without `prepare`
+                logger.warning(
+                    f"Starting the worker pool of model version {bundle.version} "
+                    "on the request path"
+                )
+                pool = self._start_process_pool(bundle)
+                self._process_pools.append((bundle, pool))
+
+        result = Future()
+
+        def on_scored(scored: Future):
+            try:
+                X_transformed, preds, probs, timings = scored.result()
+            except Exception as e:
+                _set_prediction_error(result, e)
+                return
+
+            # Stage timings are measured in the worker and recorded here
+            record_scoring(len(X_transformed), timings)
+
+            # Publishing blocks on the broker, keep it out of the pool manager
+            self._io_pool.submit(self._publish, result, X_transformed, preds, probs)
+
+        pool.submit(_score_in_worker, X).add_done_callback(on_scored)
+        return result
+
+    def _publish(self, result: Future, X: pd.DataFrame, preds, probs):
+        try:
+            publish_predictions(self.messaging_client, X, probs)
+            result.set_result((preds, probs))
+        except Exception as e:
+            _set_prediction_error(result, e)
+
+    def _on_done(self, future: Optional[Future]):
+        with self._lock:
+            self._in_flight -= 1
+            if future is None:
+                return
+            if future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+
+    def stats(self) -> Dict:
+        with self._lock:
+            in_flight = self._in_flight
+            return {
+                "type": self.executor_type,
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "in_flight": in_flight,
+                "queue_depth": max(in_flight - self.max_workers, 0),
+                "saturation": min(in_flight / self.max_workers, 1.0),
+                "peak_in_flight": self._peak_in_flight,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "worker_pools": len(self._process_pools),
+            }
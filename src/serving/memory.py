@@ -0,0 +1,49 @@
+from pathlib import Path
+from typing import Dict, Optional
+
+SMAPS_FIELDS = (
+    "Rss",
+    "Pss",
+    "Shared_Clean",
+    "Shared_Dirty",
+    "Private_Clean",
+    "Private_Dirty",
+)
+
+
+def read_memory_usage(pid: Optional[int] = None) -> Dict[str, int]:
+    """
+    Reads the resident, proportional, shared and private memory of a process
+    in bytes from `/proc/<pid>/smaps_rollup`. Returns an empty dict where the
+    file is not available (non-Linux systems or exited processes).
+
+    Args:
+        pid (int, optional): Process id. Defaults to the current process.
+
+    Returns:
+        Dict[str, int]: `rss`, `pss`, `shared` and `private` sizes in bytes.
+    """
+    path = Path("/proc") / (str(pid) if pid else "self") / "smaps_rollup"
+
+    try:
+        content = path.read_text()
+    except OSError:
+        return {}
+
+    return parse_smaps_rollup(content)
+
+
+def parse_smaps_rollup(content: str) -> Dict[str, int]:
+    """Sums the `smaps_rollup` fields (in kB) into sizes in bytes."""
+    values = {}
+    for line in content.splitlines():
+        key, _, rest = line.partition(":")
+        if key in SMAPS_FIELDS:
+            values[key] = int(rest.split()[0]) * 1024
+
+    return {
+        "rss": values.get("Rss", 0),
+        "pss": values.get("Pss", 0),
+        "shared": values.get("Shared_Clean", 0) + values.get("Shared_Dirty", 0),
+        "private": values.get("Private_Clean", 0) + values.get("Private_Dirty", 0),
+    }
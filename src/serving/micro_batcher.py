@@ -0,0 +1,253 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass
+from queue import Empty, Queue
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger()
+
+SubmitFn = Callable[[pd.DataFrame], Future]
+
+FILL_RATIO_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0)
+
+
+@dataclass
+class _PendingRequest:
+    data: pd.DataFrame
+    future: Future
+    enqueued_at: float
+
+
+class MicroBatcher:
+    """
+    Groups concurrent prediction requests into a single inference call.
+
+    Requests are held until either `max_batch_size` rows are collected or
+    `max_wait_ms` milliseconds have passed since the first request of the
+    batch arrived. The merged frame is handed to `submit_fn`, which must not
+    block and returns a future with (preds, probs); the results are split
+    back to each caller in submission order when it resolves. Several
+    batches can therefore be in flight, bounded by whatever queue backs
+    `submit_fn`. If a batch fails, its requests are resubmitted one by one
+    so only the failing request gets the error.
+
+    On `stop` the queued requests are still scored; those left when the
+    timeout expires fail instead of waiting forever.
+    """
+
+    def __init__(
+        self,
+        submit_fn: SubmitFn,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be greater than zero")
+
+        self.submit_fn = submit_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue: Queue = Queue()
+        self._carry: Optional[_PendingRequest] = None
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._rows = 0
+        self._fill_ratio_sum = 0.0
+        self._queue_wait_sum = 0.0
+        self._fill_ratio_counts = [0] * len(FILL_RATIO_BUCKETS)
+
+    # -----------------------------
+    # Lifecycle
+    # -----------------------------
+
+    def start(self):
+        if self._running:
+            return
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Micro-batcher started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait * 1000:g})"
+        )
+
+    def stop(self, timeout: float = 5.0):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            if self._thread.is_alive():
+                logger.warning("Micro-batcher did not drain before the timeout.")
+            self._thread = None
+
+        self._fail_pending(RuntimeError("Micro-batcher stopped."))
+
+    # -----------------------------
+    # Submission
+    # -----------------------------
+
+    def submit(self, data: pd.DataFrame) -> Future:
+        """Queues a frame for scoring and returns a future with (preds, probs)."""
+        if not self._running:
+            raise RuntimeError("Micro-batcher is not running. Call start() first.")
+
+        future = Future()
+        self._queue.put(_PendingRequest(data, future, time.perf_counter()))
+        return future
+
+    def predict(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Blocking helper that waits for the batched result of `data`."""
+        return self.submit(data).result()
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            batches = self._batches or 1
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches": self._batches,
+                "requests": self._requests,
+                "rows": self._rows,
+                "mean_batch_rows": self._rows / batches,
+                "mean_requests_per_batch": self._requests / batches,
+                "mean_fill_ratio": self._fill_ratio_sum / batches,
+                "mean_queue_wait_ms": self._queue_wait_sum
+                / (self._requests or 1)
+                * 1000,
+                "fill_ratio_histogram": {
+                    f"le_{bucket:g}": count
+                    for bucket, count in zip(
+                        FILL_RATIO_BUCKETS, self._fill_ratio_counts
+                    )
+                },
+            }
+
+    def _record_batch(self, batch: List[_PendingRequest], rows: int, started: float):
+        fill_ratio = min(rows / self.max_batch_size, 1.0)
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._rows += rows
+            self._fill_ratio_sum += fill_ratio
+            self._queue_wait_sum += sum(started - r.enqueued_at for r in batch)
+            for i, bucket in enumerate(FILL_RATIO_BUCKETS):
+                if fill_ratio <= bucket:
+                    self._fill_ratio_counts[i] += 1
+                    break
+
+    # -----------------------------
+    # Worker loop
+    # -----------------------------
+
+    def _run(self):
+        while self._running or self._carry is not None or not self._queue.empty():
+            batch = self._collect()
+            if batch:
+                self._dispatch(batch)
+
+    def _fail_pending(self, error: Exception):
+        pending = [self._carry] if self._carry is not None else []
+        self._carry = None
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except Empty:
+                break
+
+        for request in pending:
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def _next_request(self, timeout: float) -> Optional[_PendingRequest]:
+        if self._carry is not None:
+            request, self._carry = self._carry, None
+            return request
+
+        try:
+            return self._queue.get(timeout=max(timeout, 0))
+        except Empty:
+            return None
+
+    def _collect(self) -> List[_PendingRequest]:
+        first = self._next_request(timeout=0.1)
+        if first is None:
+            return []
+
+        batch = [first]
+        rows = len(first.data)
+        deadline = time.perf_counter() + self.max_wait
+
+        while rows < self.max_batch_size:
+            request = self._next_request(deadline - time.perf_counter())
+            if request is None:
+                break
+
+            # Keep requests whole: an overflowing one opens the next batch
+            if rows + len(request.data) > self.max_batch_size:
+                self._carry = request
+                break
+
+            batch.append(request)
+            rows += len(request.data)
+
+        return batch
+
+    def _dispatch(self, batch: List[_PendingRequest]):
+        started = time.perf_counter()
+
+        try:
+            if len(batch) == 1:
+                merged = batch[0].data
+            else:
+                merged = pd.concat([r.data for r in batch], ignore_index=True)
+
+            scored = self.submit_fn(merged)
+
+        except Exception as e:
+            # Rejected before scoring (e.g. a saturated executor): retrying
+            # the requests one by one would only be rejected again
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        scored.add_done_callback(lambda future: self._complete(batch, future, started))
+
+    def _complete(self, batch: List[_PendingRequest], scored: Future, started: float):
+        error = scored.exception()
+        if error is not None:
+            if len(batch) == 1:
+                batch[0].future.set_exception(error)
+                return
+
+            # Score the requests one by one so only the failing one errors
+            logger.warning("Batched prediction failed, retrying request by request.")
+            for request in batch:
+                self._dispatch([request])
+            return
+
+        preds, probs = scored.result()
+        sizes = [len(r.data) for r in batch]
+        self._record_batch(batch, sum(sizes), started)
+
+        offset = 0
+        for request, size in zip(batch, sizes):
+            request.future.set_result(
+                (preds[offset : offset + size], probs[offset : offset + size])
+            )
+            offset += size
@@ -0,0 +1,86 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+import joblib
+import pandas as pd
+
+from src.experiment_tracker import ExperimentTracker
+from src.pipeline import InferencePlan
+from src.schemas import PredictionRequest
+
+logger = logging.getLogger()
+
+
+@dataclass
+class ModelBundle:
+    """Model, transformer and inference plan of a single model version."""
+
+    version: Optional[str]
+    plan: InferencePlan
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+def load_model_bundle(
+    tracker: ExperimentTracker, model_name: str, alias: str = "production"
+) -> ModelBundle:
+    """
+    Loads the model and its fitted transformer concurrently and builds the
+    inference plan.
+
+    Args:
+        tracker (ExperimentTracker): Tracker holding the registered model.
+        model_name (str): Registered model name.
+        alias (str): Model alias to resolve.
+
+    Returns:
+        ModelBundle: Loaded bundle with the load timings in seconds.
+    """
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+
+    version = tracker.get_model_version(model_name, alias)
+
+    def timed(name, fn, *args):
+        step_start = time.perf_counter()
+        result = fn(*args)
+        timings[name] = time.perf_counter() - step_start
+        return result
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-loader") as pool:
+        model = pool.submit(timed, "model", tracker.load_model, model_name, alias)
+        transformer = pool.submit(
+            timed, "transformer", _load_transformer, tracker, model_name, alias
+        )
+        plan = InferencePlan(model.result(), transformer.result())
+
+    timings["bundle"] = time.perf_counter() - start
+    logger.info(f"Loaded model '{model_name}' version {version} in {timings}")
+
+    return ModelBundle(version=version, plan=plan, timings=timings)
+
+
+def warmup_plan(plan: InferencePlan, n_rows: int = 64) -> float:
+    """
+    Scores a synthetic batch built from the request example so that lazy
+    initialisation and page faults happen before the first real request.
+
+    Returns:
+        float: Warmup duration in seconds.
+    """
+    if n_rows <= 0:
+        return 0.0
+
+    example = PredictionRequest.model_config["json_schema_extra"]["example"]
+    start = time.perf_counter()
+    plan.score(pd.DataFrame([example] * n_rows))
+    return time.perf_counter() - start
+
+
+def _load_transformer(tracker: ExperimentTracker, model_name: str, alias: str):
+    transformer_path = tracker.get_artifact(
+        model_name, path="artifact/transformer.pkl", alias=alias
+    )
+    return joblib.load(transformer_path)
@@ -0,0 +1,121 @@
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from src.experiment_tracker import ExperimentTracker
+from src.serving.active_model import ActiveModel
+from src.serving.model_loader import ModelBundle, load_model_bundle, warmup_plan
+
+logger = logging.getLogger()
+
+
+class ModelWatcher:
+    """
+    Background thread that polls the model alias and hot-swaps the active
+    model when it points to a new version.
+
+    The new bundle is loaded and warmed up off the request path; the previous
+    one keeps serving until the swap and is released once its in-flight
+    requests have drained.
+
+    `on_prepare` runs in the watcher thread before the swap (e.g. to start
+    worker processes for the new bundle), `on_swap` right after it and
+    `on_retire` with the previous bundle once it has drained.
+    """
+
+    def __init__(
+        self,
+        tracker: ExperimentTracker,
+        model_name: str,
+        active_model: ActiveModel,
+        alias: str = "production",
+        poll_interval: float = 30,
+        warmup_rows: int = 64,
+        drain_timeout: float = 60,
+        on_prepare: Optional[Callable[[ModelBundle], None]] = None,
+        on_swap: Optional[Callable[[ModelBundle], None]] = None,
+        on_retire: Optional[Callable[[ModelBundle], None]] = None,
+    ):
+        self.tracker = tracker
+        self.model_name = model_name
+        self.active_model = active_model
+        self.alias = alias
+        self.poll_interval = poll_interval
+        self.warmup_rows = warmup_rows
+        self.drain_timeout = drain_timeout
+        self.on_prepare = on_prepare
+        self.on_swap = on_swap
+        self.on_retire = on_retire
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.last_checked_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.reloads = 0
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="model-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Watching alias '{self.alias}' of '{self.model_name}' "
+            f"every {self.poll_interval}s"
+        )
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def check_now(self) -> bool:
+        """Reloads the model if the alias moved. Returns True if it was swapped."""
+        self.last_checked_at = time.time()
+        version = self.tracker.get_model_version(self.model_name, self.alias)
+        if version == self.active_model.version:
+            return False
+
+        logger.info(f"Alias '{self.alias}' now points to version {version}, reloading")
+        bundle = load_model_bundle(self.tracker, self.model_name, self.alias)
+        bundle.timings["warmup"] = warmup_plan(bundle.plan, self.warmup_rows)
+        if self.on_prepare is not None:
+            self.on_prepare(bundle)
+
+        previous = self.active_model.swap(bundle)
+        self.reloads += 1
+
+        if self.on_swap is not None:
+            self.on_swap(bundle)
+
+        if not self.active_model.wait_drained(previous, self.drain_timeout):
+            logger.warning(
+                f"Model version {previous.version} still has in-flight requests "
+                f"after {self.drain_timeout}s"
+            )
+
+        if self.on_retire is not None:
+            self.on_retire(previous)
+
+        return True
+
+    def status(self) -> Dict:
+        return {
+            "alias": self.alias,
+            "poll_interval": self.poll_interval,
+            "last_checked_at": self.last_checked_at,
+            "last_error": self.last_error,
+            "reloads": self.reloads,
+        }
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check_now()
+                self.last_error = None
+            except Exception as e:
+                logger.exception("Model reload failed, keeping the active model.")
+                self.last_error = repr(e)
@@ -0,0 +1,266 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.schemas import PredictionRequest
+
+logger = logging.getLogger()
+
+SubmitFn = Callable[[pd.DataFrame], Future]
+
+FEATURES = list(PredictionRequest.model_fields)
+
+
+@dataclass
+class _CacheEntry:
+    pred: object
+    prob: np.ndarray
+    expires_at: float
+
+
+@dataclass
+class CacheLookup:
+    """Result of checking a whole frame against the cache."""
+
+    version: Optional[str]
+    keys: np.ndarray
+    hits: Dict[int, _CacheEntry]
+
+    @property
+    def misses(self) -> np.ndarray:
+        mask = np.ones(len(self.keys), dtype=bool)
+        mask[list(self.hits)] = False
+        return np.flatnonzero(mask)
+
+
+class PredictionCache:
+    """
+    In-process LRU/TTL cache of predictions keyed by a stable hash of the
+    normalized feature vector and the model version.
+
+    Rows served from the cache are not scored again, so they are not
+    published to the monitoring queue either.
+
+    With a `version_fn`, `start` polls the model version every
+    `version_check_interval` seconds from a background thread, so lookups
+    never wait on the tracker.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        ttl_seconds: float = 3600,
+        version_fn: Optional[Callable[[], str]] = None,
+        version_check_interval: float = 30,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.version_fn = version_fn
+        self.version_check_interval = version_check_interval
+
+        self._entries: "OrderedDict[Tuple[str, int], _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    # -----------------------------
+    # Versioning
+    # -----------------------------
+
+    def set_version(self, version: Optional[str]):
+        """Sets the active model version, dropping every entry if it changed."""
+        with self._lock:
+            if version == self._version:
+                return
+
+            if self._entries:
+                logger.info(
+                    f"Model version changed ({self._version} -> {version}), "
+                    f"invalidating {len(self._entries)} cached predictions"
+                )
+                self._invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def refresh_version(self):
+        """Resolves the model version with `version_fn`, if any."""
+        if self.version_fn is None:
+            return
+
+        try:
+            self.set_version(self.version_fn())
+        except Exception:
+            logger.exception("Failed to resolve model version for the cache.")
+
+    def start(self):
+        if self.version_fn is None or self._thread is not None:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="cache-version", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.version_check_interval):
+            self.refresh_version()
+
+    # -----------------------------
+    # Lookup
+    # -----------------------------
+
+    @staticmethod
+    def hash_rows(X: pd.DataFrame) -> np.ndarray:
+        """Stable 64-bit hash of each normalized feature vector."""
+        normalized = pd.DataFrame(
+            {
+                name: (
+                    X[name].astype(str)
+                    if PredictionRequest.model_fields[name].annotation is str
+                    else X[name].astype(np.float64)
+                )
+                for name in FEATURES
+            }
+        )
+        return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+    def lookup(self, X: pd.DataFrame) -> CacheLookup:
+        """Checks every row of `X` at once and returns the hits."""
+        keys = self.hash_rows(X)
+        hits: Dict[int, _CacheEntry] = {}
+        now = time.monotonic()
+
+        with self._lock:
+            version = self._version
+            for i, key in enumerate(keys.tolist()):
+                entry = self._entries.get((version, key))
+                if entry is None:
+                    continue
+
+                if entry.expires_at <= now:
+                    del self._entries[(version, key)]
+                    self._expirations += 1
+                    continue
+
+                self._entries.move_to_end((version, key))
+                hits[i] = entry
+
+            self._hits += len(hits)
+            self._misses += len(keys) - len(hits)
+
+        return CacheLookup(version, keys, hits)
+
+    def complete(
+        self, lookup: CacheLookup, preds: np.ndarray, probs: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stores the results of the missed rows and merges them with the hits,
+        in the original row order.
+        """
+        misses = lookup.misses
+        self._store(lookup.version, lookup.keys[misses], preds, probs)
+
+        if not lookup.hits:
+            return preds, probs
+
+        sample = next(iter(lookup.hits.values()))
+        all_preds = np.empty(len(lookup.keys), dtype=np.asarray(sample.pred).dtype)
+        all_probs = np.empty((len(lookup.keys), len(sample.prob)), dtype=np.float64)
+
+        for i, entry in lookup.hits.items():
+            all_preds[i] = entry.pred
+            all_probs[i] = entry.prob
+
+        if len(misses):
+            all_preds[misses] = preds
+            all_probs[misses] = probs
+
+        return all_preds, all_probs
+
+    def predict(self, X: pd.DataFrame, submit_fn: SubmitFn) -> Future:
+        """
+        Submits only the rows of `X` that are not cached to `submit_fn` and
+        returns a future with (preds, probs) for every row of `X`. Only the
+        lookup runs in the calling thread.
+        """
+        lookup = self.lookup(X)
+        misses = lookup.misses
+        result = Future()
+
+        if len(misses) == 0:
+            result.set_result(self.complete(lookup, np.empty(0), np.empty((0, 0))))
+            return result
+
+        def on_scored(scored: Future):
+            try:
+                result.set_result(self.complete(lookup, *scored.result()))
+            except Exception as e:
+                result.set_exception(e)
+
+        submit_fn(X.iloc[misses].reset_index(drop=True)).add_done_callback(on_scored)
+        return result
+
+    def _store(self, version, keys: np.ndarray, preds: np.ndarray, probs):
+        if len(keys) == 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            # Results computed with a model that is no longer active are dropped
+            if version != self._version:
+                return
+
+            for key, pred, prob in zip(keys.tolist(), preds, probs):
+                self._entries[(version, key)] = _CacheEntry(
+                    pred, np.array(prob, dtype=np.float64), expires_at
+                )
+                self._entries.move_to_end((version, key))
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    # -----------------------------
+    # Stats
+    # -----------------------------
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "version": self._version,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
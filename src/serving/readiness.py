@@ -0,0 +1,47 @@
+import time
+from threading import Lock
+from typing import Dict, Literal, Optional
+
+Phase = Literal["booting", "ready", "failed"]
+
+
+class ReadinessStatus:
+    """Startup phase and load timings reported by the health endpoints."""
+
+    def __init__(self):
+        self.phase: Phase = "booting"
+        self.started_at = time.monotonic()
+        self.ready_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self._lock = Lock()
+
+    @property
+    def is_ready(self) -> bool:
+        return self.phase == "ready"
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            self.timings[name] = round(seconds, 6)
+
+    def mark_ready(self):
+        self.ready_at = time.monotonic()
+        self.phase = "ready"
+
+    def mark_failed(self, error: Exception):
+        self.error = repr(error)
+        self.phase = "failed"
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            timings = dict(self.timings)
+
+        return {
+            "status": self.phase,
+            "uptime_seconds": time.monotonic() - self.started_at,
+            "startup_seconds": (
+                self.ready_at - self.started_at if self.ready_at else None
+            ),
+            "timings": timings,
+            "error": self.error,
+        }
@@ -0,0 +1,10 @@
+from .inference_metrics import (
+    BATCH_ROWS,
+    REQUEST_SECONDS,
+    ROWS_TOTAL,
+    STAGE_SECONDS,
+    observe_stage,
+    observe_stages,
+    time_stage,
+)
+from .metrics import REGISTRY, Counter, Histogram, MetricsRegistry
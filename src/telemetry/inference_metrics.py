@@ -0,0 +1,51 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from src.telemetry.metrics import REGISTRY, Counter, Histogram
+
+STAGE_SECONDS = REGISTRY.register(
+    Histogram(
+        "inference_stage_seconds",
+        "Time spent in each stage of the inference path.",
+        labelnames=("stage",),
+    )
+)
+
+REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "inference_request_seconds",
+        "End-to-end latency of prediction requests.",
+        labelnames=("endpoint",),
+    )
+)
+
+BATCH_ROWS = REGISTRY.register(
+    Histogram(
+        "inference_batch_rows",
+        "Number of rows per scored frame.",
+        buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+    )
+)
+
+ROWS_TOTAL = REGISTRY.register(
+    Counter("inference_rows_total", "Number of rows scored by the model.")
+)
+
+
+def observe_stage(stage: str, seconds: float):
+    STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+def observe_stages(timings: Dict[str, float]):
+    for stage, seconds in timings.items():
+        STAGE_SECONDS.labels(stage).observe(seconds)
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.labels(stage).observe(time.perf_counter() - start)
@@ -0,0 +1,321 @@
+import asyncio
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from hydra import compose, initialize
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import FunctionTransformer
+
+from src.api import endpoints
+from src.features import preprocess_data
+from src.pipeline import InferencePlan
+from src.schemas import PredictionRequest
+from src.serving import ModelBundle
+
+EXAMPLE = PredictionRequest.model_config["json_schema_extra"]["example"]
+CATEGORICAL = [
+    name
+    for name, field in PredictionRequest.model_fields.items()
+    if field.annotation is str
+]
+
+
+def _encode(X):
+    X = X.copy()
+    for name in CATEGORICAL:
+        if name != "month":
+            X[name] = X[name].eq(EXAMPLE[name])
+    return X.astype(float)
+
+
+def _make_rows(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for _ in range(n_rows):
+        row = dict(EXAMPLE)
+        row["age"] = int(rng.integers(18, 90))
+        row["balance"] = float(rng.normal(1500, 500))
+        row["job"] = str(rng.choice(["management", "services", "retired"]))
+        row["month"] = str(rng.choice(["jan", "may", "jun", "nov"]))
+        rows.append(row)
+    return rows
+
+
+def _make_bundle():
+    X = pd.DataFrame(_make_rows(200))
+    y = (X["balance"] > 1500).astype(int) | X["job"].eq("retired")
+    transformer = FunctionTransformer(_encode)
+    model = LogisticRegression(max_iter=1000)
+    model.fit(transformer.transform(preprocess_data(X.copy())), y)
+    return ModelBundle(version="1", plan=InferencePlan(model, transformer))
+
+
+def _compose(overrides):
+    with initialize(config_path="../../config", version_base=None):
+        return compose(
+            config_name="config",
+            overrides=["serving.reload.enabled=false", *overrides],
+        )
+
+
+def _wait_ready(client, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if client.get("/readyz").status_code == 200:
+            return
+        time.sleep(0.02)
+    raise TimeoutError("API did not become ready")
+
+
+@pytest.fixture
+def serve(monkeypatch, tmp_path):
+    """
+    Starts the API on a small in-memory model with the given overrides. With
+    `preload=False` the model goes through the regular load and warmup path.
+    """
+    monkeypatch.chdir(tmp_path)
+
+    def start(*overrides, bundle=None, preload=True):
+        cfg = _compose(list(overrides))
+        bundle = bundle or _make_bundle()
+        if preload:
+            monkeypatch.setattr(endpoints, "_preloaded", (cfg, bundle))
+        else:
+            monkeypatch.setattr(endpoints, "_preloaded", None)
+            monkeypatch.setattr(endpoints, "compose", lambda config_name: cfg)
+            monkeypatch.setattr(endpoints, "load_model_bundle", lambda *a: bundle)
+
+        client = TestClient(endpoints.app)
+        client.__enter__()
+        clients.append(client)
+        return client
+
+    clients = []
+    yield start
+    for client in clients:
+        client.__exit__(None, None, None)
+
+
+def _columnar(rows):
+    return {name: [row[name] for row in rows] for name in EXAMPLE}
+
+
+def test_columnar_and_row_requests_score_the_same(serve):
+    # Arrange
+    client = serve("serving.cache.enabled=false")
+    _wait_ready(client)
+    rows = _make_rows(20, seed=1)
+
+    # Act
+    by_row = client.post("/predict", json=rows)
+    by_column = client.post("/predict/columnar", json=_columnar(rows))
+
+    # Assert
+    assert by_row.status_code == by_column.status_code == 200
+    assert len(by_row.json()) == len(rows)
+    assert by_column.json() == by_row.json()
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [
+        ("age", "forty"),
+        ("age", 40.5),
+        ("age", 2**63),
+        ("age", None),
+        ("balance", "lots"),
+        ("job", 7),
+        ("month", None),
+    ],
+)
+def test_columnar_and_row_requests_reject_the_same_fields(serve, field, value):
+    # Arrange
+    client = serve("serving.cache.enabled=false")
+    _wait_ready(client)
+    rows = _make_rows(3, seed=2)
+    rows[1][field] = value
+
+    # Act
+    by_row = client.post("/predict", json=rows)
+    by_column = client.post("/predict/columnar", json=_columnar(rows))
+
+    # Assert
+    assert by_row.status_code == by_column.status_code == 422
+    row_errors = {(e["loc"][-1], e["type"]) for e in by_row.json()["detail"]}
+    column_errors = {(e["loc"][0], e["type"]) for e in by_column.json()["detail"]}
+    assert column_errors == row_errors
+
+
+def test_columnar_request_rejects_missing_and_ragged_columns(serve):
+    # Arrange
+    client = serve("serving.cache.enabled=false")
+    _wait_ready(client)
+    missing = _columnar(_make_rows(2))
+    del missing["age"]
+    ragged = _columnar(_make_rows(2))
+    ragged["age"] = ragged["age"][:1]
+
+    # Act
+    missing_response = client.post("/predict/columnar", json=missing)
+    ragged_response = client.post("/predict/columnar", json=ragged)
+
+    # Assert
+    assert missing_response.status_code == 422
+    assert ragged_response.status_code == 422
+
+
+def test_cached_predictions_match_scored_ones(serve):
+    # Arrange
+    client = serve()
+    _wait_ready(client)
+    rows = _make_rows(10, seed=3)
+
+    # Act
+    scored = client.post("/predict", json=rows[:6])
+    mixed = client.post("/predict", json=rows)
+
+    # Assert
+    assert mixed.status_code == 200
+    assert mixed.json()[:6] == scored.json()
+    assert client.get("/stats").json()["cache"]["hits"] == 6
+
+
+def test_readiness_waits_for_warmup(serve, monkeypatch):
+    # Arrange
+    warming = threading.Event()
+    release = threading.Event()
+
+    def blocking_warmup(plan, n_rows):
+        warming.set()
+        release.wait(5)
+        return 0.0
+
+    monkeypatch.setattr(endpoints, "warmup_plan", blocking_warmup)
+    client = serve(preload=False)
+    assert warming.wait(5)
+
+    # Act
+    booting = client.get("/readyz")
+    booting_health = client.get("/healthz")
+    booting_predict = client.post("/predict", json=_make_rows(1))
+    release.set()
+    _wait_ready(client)
+
+    # Assert
+    assert booting.status_code == 503
+    assert booting_health.status_code == 200
+    assert booting_health.json()["status"] == "booting"
+    assert booting_predict.status_code == 503
+    assert client.get("/healthz").json()["status"] == "ready"
+    assert "warmup" in client.get("/healthz").json()["timings"]
+    assert client.post("/predict", json=_make_rows(1)).status_code == 200
+
+
+def test_failed_warmup_is_reported(serve, monkeypatch):
+    # Arrange
+    def failing_warmup(plan, n_rows):
+        raise ValueError("broken model")
+
+    monkeypatch.setattr(endpoints, "warmup_plan", failing_warmup)
+    client = serve(preload=False)
+
+    # Act
+    deadline = time.monotonic() + 10
+    while client.get("/healthz").status_code != 503:
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+    # Assert
+    health = client.get("/healthz").json()
+    assert health["status"] == "failed"
+    assert "broken model" in health["error"]
+    assert client.get("/readyz").status_code == 503
+    assert client.post("/predict", json=_make_rows(1)).status_code == 503
+
+
+async def _post_in_chunks(path, chunks):
+    """Drives the ASGI app directly so the body arrives as several messages."""
+    pending = list(chunks)
+    done = asyncio.Event()
+    body = []
+
+    async def receive():
+        if pending:
+            chunk = pending.pop(0)
+            more_body = bool(pending)
+            await asyncio.sleep(0.01)
+            return {"type": "http.request", "body": chunk, "more_body": more_body}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", b"application/x-ndjson")],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    await endpoints.app(scope, receive, send)
+    return b"".join(body)
+
+
+def test_stream_scores_every_row_of_a_chunked_body(serve):
+    # Arrange
+    client = serve("serving.stream.chunk_size=7")
+    _wait_ready(client)
+    rows = _make_rows(40, seed=4)
+    rows[5]["age"] = "forty"
+    payload = "\n".join(json.dumps(row) for row in rows).encode()
+    # Chunk boundaries fall in the middle of the lines
+    chunks = [payload[i : i + 333] for i in range(0, len(payload), 333)]
+
+    # Act
+    output = client.portal.call(_post_in_chunks, "/predict/stream", chunks)
+
+    # Assert
+    lines = [json.loads(line) for line in output.splitlines()]
+    assert len(chunks) > 1
+    assert len(lines) == len(rows)
+    assert lines[5]["line"] == 6
+    assert all("prediction" in line for i, line in enumerate(lines) if i != 5)
+
+
+def test_predict_times_decoding_and_keeps_fastapi_errors(serve):
+    # Arrange
+    client = serve("serving.cache.enabled=false")
+    _wait_ready(client)
+    rows = _make_rows(2)
+    rows[1]["age"] = "forty"
+
+    # Act
+    invalid = client.post("/predict", json=rows)
+    client.post("/predict", json=_make_rows(2))
+    metrics = client.get("/metrics").text
+    schema = client.get("/openapi.json").json()
+
+    # Assert
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"][0]["loc"] == ["body", 1, "age"]
+    assert 'inference_stage_seconds_count{stage="decode"}' in metrics
+    assert f"process_pid {float(os.getpid())!r}" in metrics
+    body = schema["paths"]["/predict"]["post"]["requestBody"]
+    assert body["content"]["application/json"]["schema"]["type"] == "array"
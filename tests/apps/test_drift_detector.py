@@ -0,0 +1,175 @@
+import queue
+import threading
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+from omegaconf import OmegaConf
+
+from src.apps import drift_detector
+from src.apps.drift_detector import DriftMerger, DriftShard, decode_events
+from src.messaging import LocalBroker, create_serializer, decode_message
+from src.messaging.clients import LocalMQClient
+from src.monitoring import DriftState
+
+
+def _event(value):
+    return {
+        "input_data": pd.DataFrame({"age": [value]}),
+        "probabilities": np.array([[0.5, 0.5]]),
+    }
+
+
+def _rows(ages, p1, **extra):
+    return {
+        "input_data": pd.DataFrame({"age": ages}),
+        "probabilities": np.column_stack([1 - np.asarray(p1), p1]),
+        **extra,
+    }
+
+
+@pytest.mark.parametrize("serializer_type", ["json", "arrow"])
+def test_decode_events_merges_batches_and_single_events(serializer_type):
+    # Arrange
+    serializer = create_serializer(serializer_type)
+    batch = {
+        "events": [
+            _rows([20, 21], [0.1, 0.2], weights=np.array([2.0, 4.0])),
+            _rows([22, 23, 24], [0.3, 0.4, 0.5]),
+        ]
+    }
+    single = _rows([25], [0.6], weights=5.0)
+    messages = [
+        decode_message(serializer.dumps(message), serializer.content_type)
+        for message in (batch, single)
+    ]
+
+    # Act
+    input_data, proba, weights = decode_events(messages)
+
+    # Assert
+    assert input_data["age"].tolist() == [20, 21, 22, 23, 24, 25]
+    np.testing.assert_allclose(proba, [0.1, 0.2, 0.3, 0.4, 0.5, 0.6])
+    np.testing.assert_allclose(weights, [2.0, 4.0, 1.0, 1.0, 1.0, 5.0])
+
+
+def test_decode_events_skips_empty_events():
+    # Arrange
+    messages = [{"events": [_rows([], [])]}, {"events": []}]
+
+    # Act
+    decoded = decode_events(messages)
+
+    # Assert
+    assert decoded is None
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    return OmegaConf.create(
+        {
+            "model": {"name": "bank"},
+            "experiment_tracker": {"type": "local", "params": {}},
+            "messaging": {
+                "type": "local",
+                "params": {
+                    "address": str(tmp_path / "broker.sock"),
+                    "consume_timeout": 0.05,
+                },
+            },
+            "drift": {
+                "buffer_size": 8,
+                "consume_batch_size": 100,
+                "shards": 2,
+                "path": str(tmp_path / "drift"),
+                "backend": "native",
+            },
+        }
+    )
+
+
+def test_shard_keeps_its_buffer_until_the_merger_acknowledges_it(cfg, tmp_path):
+    # Arrange
+    broker = LocalBroker(cfg["messaging"]["params"]["address"])
+    broker.start()
+    producer = LocalMQClient(**cfg["messaging"]["params"])
+    producer.connect(delay=0.05)
+    for value in range(4):
+        producer.send_message(_event(value))
+    partials, acks = queue.Queue(), queue.Queue()
+    shard_path = tmp_path / "drift" / "shards" / "0"
+
+    # Act
+    threading.Thread(
+        target=DriftShard, args=(cfg, 0, partials, acks), daemon=True
+    ).start()
+    index, _, data, preds = partials.get(timeout=5)
+    unmerged = DriftState(shard_path, buffer_size=4).get_buffer_data(weighted=False)
+    acks.put(len(data))
+
+    # Assert
+    assert index == 0
+    assert sorted(data["age"]) == [0, 1, 2, 3]
+    assert len(unmerged[0]) == 4
+    assert _wait_for(lambda: not list((shard_path / "segments").glob("*")))
+    broker.stop()
+
+
+def test_merger_keeps_merged_rows_in_memory_and_drops_stale_partials(
+    cfg, tmp_path, monkeypatch
+):
+    # Arrange
+    monkeypatch.setattr(drift_detector, "create_experiment_tracker", lambda *a: None)
+    monkeypatch.setattr(DriftMerger, "_load_reference_profile", lambda self: None)
+    merger = DriftMerger(cfg)
+    merger.shards = {0: SimpleNamespace(pid=100)}
+    merger.acks = {0: queue.Queue()}
+    data = pd.DataFrame({"age": [30, 40]})
+    preds = pd.DataFrame({"proba": [0.2, 0.7], "weight": [1.0, 1.0]})
+
+    # Act
+    merger._merge(0, 100, data, preds)
+    merger._merge(0, 99, data, preds)
+
+    # Assert
+    assert merger.acks[0].get_nowait() == 2
+    assert merger.acks[0].empty()
+    assert len(merger.drift_state.get_buffer_data()[0]) == 2
+    assert not (tmp_path / "drift").exists()
+
+
+class _FailingReportDetector:
+    def check_drift(self, current_data, current_preds):
+        return {}
+
+    def save_report(self, path):
+        raise OSError("disk full")
+
+
+def test_merger_acknowledges_shard_before_a_failing_check(cfg, monkeypatch):
+    # Arrange
+    cfg["drift"]["buffer_size"] = 2
+    monkeypatch.setattr(drift_detector, "create_experiment_tracker", lambda *a: None)
+    monkeypatch.setattr(DriftMerger, "_load_reference_profile", lambda self: None)
+    merger = DriftMerger(cfg)
+    merger.drift_detector = _FailingReportDetector()
+    merger.shards = {0: SimpleNamespace(pid=100)}
+    merger.acks = {0: queue.Queue()}
+    data = pd.DataFrame({"age": [30, 40]})
+    preds = pd.DataFrame({"proba": [0.2, 0.7], "weight": [1.0, 1.0]})
+
+    # Act
+    merger._merge(0, 100, data, preds)
+    merger._merge(0, 100, data, preds)
+
+    # Assert
+    assert merger.acks[0].qsize() == 2
@@ -0,0 +1,96 @@
+import gc
+import signal
+
+import pytest
+from omegaconf import OmegaConf
+
+from src.api import endpoints
+from src.apps import prefork_server
+from src.apps.prefork_server import PreforkServer
+from src.serving import ModelBundle
+
+
+class _FakeTracker:
+    def __init__(self, version):
+        self.version = version
+
+    def get_model_version(self, model_name, alias="production"):
+        return self.version
+
+
+@pytest.fixture
+def server(monkeypatch):
+    cfg = OmegaConf.create(
+        {
+            "model": {"name": "bank"},
+            "experiment_tracker": {"type": "local", "params": {}},
+            "serving": {
+                "warmup_rows": 8,
+                "reload": {"enabled": True, "poll_interval": 30},
+                "prefork": {
+                    "host": "127.0.0.1",
+                    "port": 0,
+                    "workers": 2,
+                    "memory_report_interval": 60,
+                },
+            },
+        }
+    )
+    tracker = _FakeTracker("1")
+    monkeypatch.setattr(endpoints, "_preloaded", None)
+    monkeypatch.setattr(prefork_server, "create_experiment_tracker", lambda *a: tracker)
+    monkeypatch.setattr(
+        prefork_server,
+        "load_model_bundle",
+        lambda tracker, name: ModelBundle(version=tracker.version, plan=None),
+    )
+    monkeypatch.setattr(prefork_server, "warmup_plan", lambda plan, rows: 0.0)
+
+    yield PreforkServer(cfg)
+    gc.unfreeze()
+
+
+def test_master_freezes_the_heap_before_forking(server, monkeypatch):
+    # Arrange
+    forks = []
+    monkeypatch.setattr(signal, "signal", lambda *args: None)
+    monkeypatch.setattr(server, "_bind", lambda: None)
+    monkeypatch.setattr(server, "_supervise", lambda: None)
+    monkeypatch.setattr(
+        server, "_spawn", lambda index: forks.append(gc.get_freeze_count())
+    )
+    gc.unfreeze()
+
+    # Act
+    server.run()
+
+    # Assert
+    assert len(forks) == 2
+    assert all(frozen > 0 for frozen in forks)
+    assert endpoints._preloaded[1].version == "1"
+
+
+def test_master_reloads_and_replaces_workers(server, monkeypatch):
+    # Arrange
+    killed = []
+    server._preload()
+    server.workers = {101: 0, 102: 1}
+    next_pid = iter([201, 202])
+    monkeypatch.setattr(
+        server, "_spawn", lambda index: server.workers.update({next(next_pid): index})
+    )
+    monkeypatch.setattr(prefork_server.os, "kill", lambda pid, sig: killed.append(pid))
+
+    # Act
+    unchanged = server.check_reload()
+    server.tracker.version = "2"
+    reloaded = server.check_reload()
+
+    # Assert
+    assert not unchanged
+    assert reloaded
+    assert server.workers == {201: 0, 202: 1}
+    assert server.retiring == {101, 102}
+    assert killed == [101, 102]
+    assert endpoints._preloaded[1].version == "2"
+    assert gc.get_freeze_count() > 0
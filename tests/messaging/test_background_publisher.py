@@ -0,0 +1,140 @@
+import threading
+import time
+
+from src.messaging import BackgroundPublisher, MqClient
+
+
+class _RecordingClient(MqClient):
+    def __init__(self, gate: threading.Event = None):
+        self.messages = []
+        self.gate = gate
+
+    def connect(self, max_retries=10, delay=5):
+        pass
+
+    def send_message(self, message: dict):
+        if self.gate is not None:
+            self.gate.wait()
+        self.messages.append(message)
+
+    def start_consuming(self, callback):
+        pass
+
+    def close(self):
+        pass
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_background_publisher_drains_queue():
+    # Arrange
+    client = _RecordingClient()
+    publisher = BackgroundPublisher(client, queue_size=100)
+    publisher.connect()
+
+    # Act
+    for i in range(50):
+        publisher.send_message({"id": i})
+    publisher.close()
+
+    # Assert
+    assert [m["id"] for m in client.messages] == list(range(50))
+    assert publisher.stats()["published"] == 50
+
+
+def test_background_publisher_drops_on_overflow():
+    # Arrange
+    gate = threading.Event()
+    client = _RecordingClient(gate)
+    publisher = BackgroundPublisher(client, queue_size=2, overflow="drop")
+    publisher.connect()
+
+    # Act
+    for i in range(10):
+        publisher.send_message({"id": i})
+    gate.set()
+    publisher.close()
+
+    # Assert
+    stats = publisher.stats()
+    assert stats["dropped"] > 0
+    assert stats["published"] + stats["dropped"] == 10
+
+
+def test_background_publisher_spills_and_replays(tmp_path):
+    # Arrange
+    gate = threading.Event()
+    client = _RecordingClient(gate)
+    publisher = BackgroundPublisher(
+        client,
+        queue_size=1,
+        overflow="spill",
+        spool_dir=str(tmp_path / "spool"),
+    )
+    publisher.connect()
+
+    # Act
+    for i in range(10):
+        publisher.send_message({"id": i})
+    gate.set()
+    _wait_for(lambda: len(client.messages) == 10)
+    publisher.close()
+
+    # Assert
+    stats = publisher.stats()
+    assert stats["spilled"] > 0
+    assert stats["replayed"] == stats["spilled"]
+    assert sorted(m["id"] for m in client.messages) == list(range(10))
+
+
+class _FlakyClient(_RecordingClient):
+    def __init__(self):
+        super().__init__()
+        self.available = False
+
+    def connect(self, max_retries=10, delay=5):
+        if not self.available:
+            raise ConnectionError("broker down")
+
+    def send_message(self, message: dict):
+        if not self.available:
+            raise ConnectionError("broker down")
+        super().send_message(message)
+
+
+def test_background_publisher_spools_while_broker_is_down(tmp_path):
+    # Arrange
+    client = _FlakyClient()
+    publisher = BackgroundPublisher(
+        client,
+        queue_size=100,
+        overflow="spill",
+        spool_dir=str(tmp_path / "spool"),
+        backoff_initial=0.01,
+        backoff_max=0.05,
+    )
+    publisher.connect()
+
+    # Act
+    start = time.perf_counter()
+    for i in range(20):
+        publisher.send_message({"id": i})
+    enqueue_time = time.perf_counter() - start
+    _wait_for(lambda: publisher.stats()["spilled"] == 20)
+    spooled = publisher.stats()["spool_bytes"]
+
+    client.available = True
+    _wait_for(lambda: len(client.messages) == 20)
+    publisher.close()
+
+    # Assert
+    assert enqueue_time < 0.5
+    assert spooled > 0
+    assert [m["id"] for m in client.messages] == list(range(20))
+    stats = publisher.stats()
+    assert stats["replayed"] == 20
+    assert stats["spool_bytes"] == 0
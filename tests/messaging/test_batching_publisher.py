@@ -0,0 +1,56 @@
+import time
+
+from src.messaging import BatchingPublisher, MqClient
+
+
+class _RecordingClient(MqClient):
+    def __init__(self):
+        self.messages = []
+
+    def connect(self, max_retries=10, delay=5):
+        pass
+
+    def send_message(self, message: dict):
+        self.messages.append(message)
+
+    def start_consuming(self, callback):
+        pass
+
+    def close(self):
+        pass
+
+
+def _event(n_rows):
+    return {"input_data": "[]", "probabilities": [[0.5, 0.5]] * n_rows}
+
+
+def test_batching_publisher_coalesces_events_by_rows():
+    # Arrange
+    client = _RecordingClient()
+    publisher = BatchingPublisher(client, max_rows=10, max_delay_ms=10_000)
+    publisher.connect()
+
+    # Act
+    for _ in range(10):
+        publisher.send_message(_event(2))
+    publisher.close()
+
+    # Assert
+    assert sum(len(m["events"]) for m in client.messages) == 10
+    assert len(client.messages) <= 3
+    assert publisher.stats()["batched_rows"] == 20
+
+
+def test_batching_publisher_flushes_after_max_delay():
+    # Arrange
+    client = _RecordingClient()
+    publisher = BatchingPublisher(client, max_rows=1000, max_delay_ms=10)
+    publisher.connect()
+
+    # Act
+    publisher.send_message(_event(1))
+    time.sleep(0.2)
+
+    # Assert
+    assert len(client.messages) == 1
+    publisher.close()
@@ -0,0 +1,168 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pika
+import pytest
+
+from src.messaging import ChannelPool, create_messaging_client
+from src.messaging.clients import RabbitMQClient
+
+
+class _Concurrency:
+    """Tracks how many channels publish at the same time."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def enter(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+    def exit(self):
+        with self.lock:
+            self.active -= 1
+
+
+class _FakeChannel:
+    """Fails if two threads publish on it at the same time."""
+
+    def __init__(self, concurrency=None):
+        self.concurrency = concurrency or _Concurrency()
+        self.busy = False
+        self.published = []
+        self.is_open = True
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        assert not self.busy, "channel used by two threads at once"
+        self.busy = True
+        self.concurrency.enter()
+
+        time.sleep(0.001)
+        self.published.append(body)
+
+        self.concurrency.exit()
+        self.busy = False
+
+
+class _DeadChannel(_FakeChannel):
+    """Channel whose connection the broker dropped while it was idle."""
+
+    def basic_publish(self, exchange, routing_key, body, properties=None):
+        raise pika.exceptions.StreamLostError("missed heartbeats")
+
+
+@pytest.fixture
+def concurrency():
+    return _Concurrency()
+
+
+def test_rabbitmq_client_publishes_concurrently_on_pooled_channels(concurrency):
+    # Arrange
+    channels = []
+
+    def factory():
+        channel = _FakeChannel(concurrency)
+        channels.append(channel)
+        return channel
+
+    client = RabbitMQClient("localhost", 5672, "queue")
+    client.pool = ChannelPool(factory, size=4)
+
+    # Act
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        list(executor.map(lambda i: client.send_message({"id": i}), range(2000)))
+
+    # Assert
+    assert sum(len(channel.published) for channel in channels) == 2000
+    assert len(channels) <= 4
+    assert concurrency.max_active > 1
+    assert client.stats()["pool_in_use"] == 0
+
+
+def test_channel_pool_replaces_failed_channel():
+    # Arrange
+    closed = []
+    pool = ChannelPool(_FakeChannel, size=1, close=closed.append)
+
+    # Act
+    with pytest.raises(RuntimeError):
+        with pool.acquire():
+            raise RuntimeError("connection lost")
+    with pool.acquire() as channel:
+        channel.basic_publish("", "queue", b"body")
+
+    # Assert
+    assert len(closed) == 1
+    assert closed[0] is not channel
+    assert pool.stats()["pool_discarded"] == 1
+
+
+@pytest.mark.parametrize("mode, pool_size", [("sync", 4), ("background", 1)])
+def test_background_publisher_uses_a_single_pooled_channel(mode, pool_size):
+    # Arrange
+    params = {"host": "localhost", "port": 5672, "queue": "queue", "pool_size": 4}
+
+    # Act
+    client = create_messaging_client("rabbitmq", params, {"mode": mode})
+
+    # Assert
+    rabbitmq_client = client.client if mode == "background" else client
+    assert rabbitmq_client.pool_size == pool_size
+
+
+def test_rabbitmq_client_retries_publish_on_a_fresh_channel():
+    # Arrange
+    channels = [_DeadChannel(), _FakeChannel()]
+    closed = []
+    client = RabbitMQClient("localhost", 5672, "queue", serializer="json")
+    client.pool = ChannelPool(lambda: channels.pop(0), size=1, close=closed.append)
+
+    # Act
+    client.send_message({"id": 1})
+
+    # Assert
+    assert len(closed) == 1
+    assert isinstance(closed[0], _DeadChannel)
+    assert client.stats()["pool_discarded"] == 1
+    with client.pool.acquire() as channel:
+        assert len(channel.published) == 1
+
+
+def test_channel_pool_replaces_closed_idle_channel_on_checkout():
+    # Arrange
+    pool = ChannelPool(_FakeChannel, size=2, is_open=lambda c: c.is_open)
+    with pool.acquire() as stale:
+        pass
+    stale.is_open = False
+
+    # Act
+    with pool.acquire() as channel:
+        pass
+
+    # Assert
+    assert channel is not stale
+    assert pool.stats()["pool_open"] == 1
+    assert pool.stats()["pool_discarded"] == 1
+
+
+def test_rabbitmq_client_only_opens_the_consumer_channel_when_consuming(
+    monkeypatch,
+):
+    # Arrange
+    opened = []
+    monkeypatch.setattr(
+        RabbitMQClient, "_open_channel", lambda self: opened.append(1) or object()
+    )
+    client = RabbitMQClient("localhost", 5672, "queue")
+
+    # Act
+    client.connect(max_retries=1, delay=0)
+
+    # Assert
+    assert client.channel is None
+    assert len(opened) == 1
+    assert client.stats()["pool_open"] == 1
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.messaging import LocalBroker
+from src.messaging.clients import LocalMQClient
+
+
+def _event(value):
+    return {
+        "input_data": pd.DataFrame({"age": [value]}),
+        "probabilities": np.array([[0.5, 0.5]]),
+    }
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def _start_broker(tmp_path):
+    address = str(tmp_path / "broker.sock")
+    broker = LocalBroker(address)
+    broker.start()
+    return broker, address
+
+
+def test_local_client_delivers_messages_across_connections(tmp_path):
+    # Arrange
+    broker, address = _start_broker(tmp_path)
+    producer = LocalMQClient(address, consume_timeout=0.05)
+    consumer = LocalMQClient(address, consume_timeout=0.05)
+    producer.connect(delay=0.05)
+    consumer.connect(delay=0.05)
+    received = []
+
+    # Act
+    for value in range(5):
+        producer.send_message(_event(value))
+    threading.Thread(
+        target=consumer.start_consuming,
+        args=(lambda ch, method, props, body: received.append(body),),
+        daemon=True,
+    ).start()
+
+    # Assert
+    assert _wait_for(lambda: len(received) == 5)
+    assert _wait_for(lambda: broker.stats("predictions_queue")["acked"] == 5)
+    assert producer.stats()["broker"]["queue_depth"] == 0
+    broker.stop()
+
+
+def test_local_broker_requeues_unacked_messages_of_closed_consumer(tmp_path):
+    # Arrange
+    broker, address = _start_broker(tmp_path)
+    client = LocalMQClient(address)
+    client.connect(delay=0.05)
+    for value in range(3):
+        client.send_message(_event(value))
+
+    # Act
+    client._consumer = client._open()
+    delivered = client._get(max_messages=2)
+    client.close()
+
+    # Assert
+    assert len(delivered) == 2
+    assert _wait_for(lambda: broker.stats("predictions_queue")["queue_depth"] == 3)
+    assert broker.stats("predictions_queue")["unacked"] == 0
+    broker.stop()
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+from src.messaging.clients import RabbitMQClient
+
+
+class _FakeChannel:
+    def __init__(self, deliveries):
+        self.deliveries = deliveries
+        self.prefetch_count = None
+        self.acks = []
+        self.nacks = []
+
+    def basic_qos(self, prefetch_count):
+        self.prefetch_count = prefetch_count
+
+    def consume(self, queue, auto_ack, inactivity_timeout):
+        assert auto_ack is False
+        return iter(self.deliveries)
+
+    def basic_ack(self, delivery_tag, multiple=False):
+        self.acks.append((delivery_tag, multiple))
+
+    def basic_nack(self, delivery_tag, multiple=False, requeue=True):
+        self.nacks.append((delivery_tag, multiple, requeue))
+
+
+def _delivery(tag):
+    method = SimpleNamespace(delivery_tag=tag)
+    properties = SimpleNamespace(content_type="application/json")
+    return method, properties, f"message-{tag}".encode()
+
+
+_IDLE = (None, None, None)
+
+
+def _client(deliveries, **kwargs):
+    client = RabbitMQClient("localhost", 5672, "queue", **kwargs)
+    client.channel = _FakeChannel(deliveries)
+    return client
+
+
+def test_start_consuming_acks_processed_messages_in_batches():
+    # Arrange
+    client = _client(
+        [_delivery(1), _delivery(2), _delivery(3), _IDLE],
+        prefetch_count=10,
+        ack_every=2,
+    )
+    received = []
+
+    # Act
+    client.start_consuming(lambda ch, method, props, body: received.append(body))
+
+    # Assert
+    assert len(received) == 3
+    assert client.channel.prefetch_count == 10
+    assert client.channel.acks == [(2, True), (3, True)]
+
+
+def test_start_consuming_nacks_failed_message():
+    # Arrange
+    client = _client([_delivery(1), _delivery(2), _IDLE], ack_every=10)
+
+    def callback(ch, method, props, body):
+        if method.delivery_tag == 2:
+            raise ValueError("boom")
+
+    # Act
+    client.start_consuming(callback)
+
+    # Assert
+    assert client.channel.acks == [(1, True)]
+    assert client.channel.nacks == [(2, False, False)]
+
+
+def test_start_consuming_hands_batches_to_callback():
+    # Arrange
+    client = _client(
+        [_delivery(1), _delivery(2), _delivery(3), _IDLE], consume_timeout=60
+    )
+    batches = []
+
+    # Act
+    client.start_consuming(batches.append, batch_size=2)
+
+    # Assert
+    assert [[m.body for m in batch] for batch in batches] == [
+        [b"message-1", b"message-2"],
+        [b"message-3"],
+    ]
+    assert client.channel.acks == [(2, True), (3, True)]
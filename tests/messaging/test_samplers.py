@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.messaging import create_messaging_client, create_sampler
+from src.messaging.publishers import SamplingPublisher
+
+
+def _event(n_rows, positive_every=10):
+    positive = (np.arange(n_rows) % positive_every == 0).astype(float)
+    return {
+        "input_data": pd.DataFrame({"row": np.arange(n_rows)}),
+        "probabilities": np.column_stack([1 - positive, positive]),
+    }
+
+
+def test_fixed_rate_sampler_weights_rows_by_inverse_rate():
+    # Arrange
+    sampler = create_sampler("fixed_rate", rate=0.1, seed=0)
+
+    # Act
+    (sampled,) = sampler.sample(_event(10_000))
+
+    # Assert
+    assert 800 < len(sampled["input_data"]) < 1200
+    np.testing.assert_allclose(sampled["weights"], 10.0)
+    assert len(sampled["probabilities"]) == len(sampled["input_data"])
+
+
+def test_stratified_sampler_keeps_rare_class():
+    # Arrange
+    sampler = create_sampler("stratified", rates={1: 1.0}, default_rate=0.05, seed=0)
+
+    # Act
+    (sampled,) = sampler.sample(_event(10_000))
+
+    # Assert
+    predicted = sampled["probabilities"].argmax(axis=1)
+    assert (predicted == 1).sum() == 1000
+    np.testing.assert_allclose(sampled["weights"][predicted == 1], 1.0)
+    np.testing.assert_allclose(sampled["weights"][predicted == 0], 20.0)
+
+
+def test_reservoir_sampler_keeps_bounded_uniform_sample_per_window():
+    # Arrange
+    sampler = create_sampler("reservoir", size=100, window_seconds=3600, seed=0)
+
+    # Act
+    held = [sampler.sample(_event(500)) for _ in range(10)]
+    sampled = sampler.flush()
+
+    # Assert
+    assert all(events == [] for events in held)
+    rows = sum(len(event["input_data"]) for event in sampled)
+    assert rows == 100
+    assert len(sampled) > 1
+    for event in sampled:
+        np.testing.assert_allclose(event["weights"], 50.0)
+
+
+@pytest.mark.parametrize(
+    "sampling, sampled",
+    [
+        (None, False),
+        ({"policy": "none"}, False),
+        ({"policy": "fixed_rate", "rate": 0.1}, True),
+    ],
+)
+def test_sampling_is_opt_in(sampling, sampled):
+    # Act
+    client = create_messaging_client("dummy", publisher={"sampling": sampling})
+
+    # Assert
+    assert isinstance(client, SamplingPublisher) == sampled
@@ -0,0 +1,61 @@
+from src.messaging.publishers.segment_spool import SegmentSpool
+
+
+def test_segment_spool_rotates_and_survives_restart(tmp_path):
+    # Arrange
+    spool = SegmentSpool(str(tmp_path), segment_bytes=32)
+    spool.append([b"a" * 20, b"b" * 20])
+    spool.append([b"c" * 20])
+    spool.close()
+
+    # Act
+    reopened = SegmentSpool(str(tmp_path), segment_bytes=32)
+    path, records = reopened.read_oldest()
+    reopened.remove(path)
+    _, remaining = reopened.read_oldest()
+
+    # Assert
+    assert records == [b"a" * 20, b"b" * 20]
+    assert remaining == [b"c" * 20]
+    assert reopened.stats()["spool_segments"] == 1
+
+
+def test_segment_spool_skips_corrupt_records(tmp_path):
+    # Arrange
+    spool = SegmentSpool(str(tmp_path))
+    spool.append([b"first", b"second"])
+    spool.close()
+    path = next(spool.directory.glob("*.seg"))
+    data = bytearray(path.read_bytes())
+    data[8] ^= 0xFF  # corrupt the body of the first record
+    path.write_bytes(bytes(data))
+
+    # Act
+    _, records = spool.read_oldest()
+
+    # Assert
+    assert records == [b"second"]
+    assert spool.stats()["spool_corrupt_records"] == 1
+
+
+def test_segment_spools_sharing_a_directory_use_separate_slots(tmp_path):
+    # Arrange
+    first = SegmentSpool(str(tmp_path))
+    second = SegmentSpool(str(tmp_path))
+
+    # Act
+    first.append([b"from-first"])
+    second.append([b"from-second"])
+    first.close()
+    second.close()
+    first_segment = first.read_oldest()
+    second_segment = second.read_oldest()
+    restarted = SegmentSpool(str(tmp_path))
+
+    # Assert
+    assert first.directory != second.directory
+    assert first_segment[1] == [b"from-first"]
+    assert second_segment[1] == [b"from-second"]
+    assert first_segment[0].name == second_segment[0].name
+    assert restarted.directory == first.directory
+    assert restarted.read_oldest()[1] == [b"from-first"]
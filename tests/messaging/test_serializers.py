@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.messaging import create_serializer, decode_message
+
+
+def _event(n_rows):
+    input_data = pd.DataFrame(
+        {"age": np.arange(n_rows, dtype=np.int64), "job": ["admin."] * n_rows}
+    )
+    probs = np.column_stack([np.full(n_rows, 0.25), np.full(n_rows, 0.75)])
+    return {"input_data": input_data, "probabilities": probs}
+
+
+@pytest.mark.parametrize("serializer_type", ["json", "arrow"])
+def test_serializer_round_trips_batched_events(serializer_type):
+    # Arrange
+    if serializer_type == "arrow":
+        pytest.importorskip("pyarrow")
+    serializer = create_serializer(serializer_type)
+    message = {"events": [_event(3), _event(2)]}
+
+    # Act
+    body = serializer.dumps(message)
+    decoded = decode_message(body, serializer.content_type)
+
+    # Assert
+    events = decoded["events"] if "events" in decoded else [decoded]
+    input_data = pd.concat([e["input_data"] for e in events], ignore_index=True)
+    probs = np.concatenate([e["probabilities"] for e in events])
+    assert input_data["age"].tolist() == [0, 1, 2, 0, 1]
+    assert input_data["job"].tolist() == ["admin."] * 5
+    np.testing.assert_allclose(probs[:, 1], 0.75)
+
+
+def test_decode_message_without_content_type_uses_json():
+    # Arrange
+    body = create_serializer("json").dumps(_event(2))
+
+    # Act
+    decoded = decode_message(body)
+
+    # Assert
+    assert len(decoded["input_data"]) == 2
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from src.monitoring.utils import DataBuffer
+
+
+def _frame(start, n_rows):
+    values = np.arange(start, start + n_rows)
+    return pd.DataFrame({"x": values, "label": [f"row-{v}" for v in values]})
+
+
+def test_data_buffer_keeps_last_rows_in_order(tmp_path):
+    # Arrange
+    buffer = DataBuffer(tmp_path / "buffer.csv", buffer_size=5)
+
+    # Act
+    first = buffer.append(_frame(0, 3))
+    full = buffer.append(_frame(3, 4))
+
+    # Assert
+    assert first is None
+    assert full["x"].tolist() == [2, 3, 4, 5, 6]
+    assert full["label"].tolist() == [f"row-{v}" for v in range(2, 7)]
+    assert full["x"].dtype == np.int64
+
+
+def test_data_buffer_keeps_tail_of_large_batch(tmp_path):
+    # Arrange
+    buffer = DataBuffer(tmp_path / "buffer.csv", buffer_size=4)
+
+    # Act
+    data = buffer.append(_frame(0, 10))
+
+    # Assert
+    assert data["x"].tolist() == [6, 7, 8, 9]
+
+
+def test_data_buffer_restores_persisted_rows(tmp_path):
+    # Arrange
+    path = tmp_path / "buffer.csv"
+    buffer = DataBuffer(path, buffer_size=6, compact_factor=2)
+    for start in range(0, 20, 2):
+        buffer.append(_frame(start, 2))
+
+    # Act
+    restored = DataBuffer(path, buffer_size=6)
+
+    # Assert
+    pd.testing.assert_frame_equal(restored.get_data(), buffer.get_data())
+    assert len(pd.read_csv(path)) <= 2 * 6
+
+
+def test_data_buffer_adds_new_columns(tmp_path):
+    # Arrange
+    buffer = DataBuffer(tmp_path / "buffer.csv", buffer_size=4)
+    buffer.append(pd.DataFrame({"proba": [0.1, 0.2]}))
+
+    # Act
+    data = buffer.append(pd.DataFrame({"proba": [0.3, 0.4], "weight": [2.0, 2.0]}))
+
+    # Assert
+    assert data["proba"].tolist() == [0.1, 0.2, 0.3, 0.4]
+    assert np.isnan(data["weight"].iloc[:2]).all()
+    assert data["weight"].iloc[2:].tolist() == [2.0, 2.0]
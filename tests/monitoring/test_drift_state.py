@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from src.monitoring import DriftState
+
+
+def _batch(start, n_rows):
+    values = np.arange(start, start + n_rows)
+    input_data = pd.DataFrame({"x": values, "city": [f"city-{v}" for v in values]})
+    proba = pd.Series(values / 100.0)
+    return input_data, proba
+
+
+def test_drift_state_recovers_aligned_window(tmp_path):
+    # Arrange
+    state = DriftState(tmp_path, buffer_size=5, compact_factor=2)
+    for start in range(0, 18, 3):
+        state.add_input(*_batch(start, 3))
+
+    # Act
+    recovered = DriftState(tmp_path, buffer_size=5)
+    data, preds = recovered.get_buffer_data(weighted=False)
+
+    # Assert
+    assert data["x"].tolist() == [13, 14, 15, 16, 17]
+    assert data["x"].dtype == np.int64
+    np.testing.assert_allclose(preds["proba"], data["x"] / 100.0)
+    assert recovered.log.stats()["log_rows"] <= 2 * 5
+
+
+def test_drift_state_skips_corrupt_segment(tmp_path):
+    # Arrange
+    state = DriftState(tmp_path, buffer_size=10)
+    state.add_input(*_batch(0, 3))
+    state.add_input(*_batch(3, 3))
+    newest = sorted((tmp_path / "segments").glob("*.arrow"))[-1]
+    newest.write_bytes(newest.read_bytes()[:-8])
+
+    # Act
+    recovered = DriftState(tmp_path, buffer_size=10)
+    data, preds = recovered.get_buffer_data(weighted=False)
+
+    # Assert
+    assert data["x"].tolist() == [0, 1, 2]
+    assert len(preds) == 3
+    assert recovered.log.stats()["log_corrupt_segments"] == 1
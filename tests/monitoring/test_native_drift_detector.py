@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from src.monitoring import ReferenceProfile, create_drift_detector
+
+
+def _frames(rng, n_rows, shift=0.0):
+    data = pd.DataFrame(
+        {
+            "age": rng.normal(40 + 10 * shift, 10, n_rows),
+            "balance": rng.normal(1000, 300, n_rows),
+            "job": rng.choice(["admin", "services", "retired"], n_rows),
+        }
+    )
+    preds = pd.DataFrame({"proba": rng.random(n_rows)})
+    return data, preds
+
+
+@pytest.mark.parametrize("reference_rows", [800, 5000])
+def test_native_detector_flags_shifted_columns(reference_rows):
+    # Arrange
+    rng = np.random.default_rng(1)
+    profile = ReferenceProfile.from_frames(*_frames(rng, reference_rows))
+    detector = create_drift_detector("native", reference_profile=profile)
+
+    # Act
+    stable = detector.check_drift(*_frames(rng, 500))
+    shifted = detector.check_drift(*_frames(rng, 500, shift=1.0))
+
+    # Assert
+    assert not stable["is_data_drift_detected"]
+    assert not stable["is_pred_drift_detected"]
+    assert shifted["is_data_drift_detected"]
+    assert shifted["data_drift"]["columns"]["age"]["drift_detected"]
+    assert not shifted["data_drift"]["columns"]["job"]["drift_detected"]
+
+
+def test_native_detector_tests_match_scipy():
+    # Arrange
+    rng = np.random.default_rng(2)
+    reference_data, reference_preds = _frames(rng, 800)
+    profile = ReferenceProfile.from_frames(reference_data, reference_preds)
+    detector = create_drift_detector("native", reference_profile=profile)
+    current_data, current_preds = _frames(rng, 400, shift=0.2)
+    current_data.loc[::10, "job"] = "retired"
+
+    # Act
+    columns = detector.check_drift(current_data, current_preds)["data_drift"]["columns"]
+
+    # Assert
+    ks = stats.ks_2samp(reference_data["age"], current_data["age"], method="asymp")
+    assert columns["age"]["stattest"] == "ks"
+    assert columns["age"]["value"] == pytest.approx(ks.pvalue, abs=0.02)
+
+    table = pd.crosstab(
+        pd.concat([reference_data["job"], current_data["job"]]),
+        np.repeat([0, 1], [800, 400]),
+    )
+    expected = table[0] / 800 * 400
+    chi2 = stats.chisquare(table[1], expected)
+    assert columns["job"]["stattest"] == "chisquare"
+    assert columns["job"]["value"] == pytest.approx(chi2.pvalue, abs=1e-6)
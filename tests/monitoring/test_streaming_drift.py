@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+from src.monitoring import ReferenceProfile, StreamingDriftDetector
+from src.monitoring.sketches import FrameSketch, QuantileSketch
+
+
+def _frame(rng, n_rows, mean=40.0, jobs="abc"):
+    return pd.DataFrame(
+        {
+            "age": rng.normal(mean, 10, n_rows),
+            "job": rng.choice(list(jobs), n_rows),
+        }
+    )
+
+
+def test_merged_sketches_match_single_sketch():
+    # Arrange
+    rng = np.random.default_rng(0)
+    reference = _frame(rng, 1000)
+    first, second = _frame(rng, 300), _frame(rng, 200)
+    whole = FrameSketch.from_reference(reference).empty()
+    merged = whole.empty()
+    part = whole.empty()
+
+    # Act
+    whole.update(pd.concat([first, second]))
+    merged.update(first)
+    part.update(second)
+    merged.merge(part)
+
+    # Assert
+    np.testing.assert_allclose(
+        merged.histograms["age"].counts, whole.histograms["age"].counts
+    )
+    assert merged.categories["job"].counts == whole.categories["job"].counts
+    assert merged.rows == 500
+
+
+def test_quantile_sketch_is_accurate_after_merges():
+    # Arrange
+    rng = np.random.default_rng(1)
+    values = rng.normal(size=20_000)
+    sketch = QuantileSketch(size=200)
+
+    # Act
+    for chunk in np.array_split(values, 40):
+        part = QuantileSketch(size=200)
+        part.update(chunk)
+        sketch.merge(part)
+
+    # Assert
+    q = np.array([0.1, 0.5, 0.9])
+    np.testing.assert_allclose(sketch.quantiles(q), np.quantile(values, q), atol=0.05)
+    assert len(sketch.values) <= 200
+
+
+def test_streaming_detector_flags_shifted_window():
+    # Arrange
+    rng = np.random.default_rng(2)
+    preds = pd.DataFrame({"proba": rng.random(2000)})
+    profile = ReferenceProfile.from_frames(_frame(rng, 2000), preds)
+    detector = StreamingDriftDetector(profile, window_rows=500)
+
+    # Act
+    detector.update(_frame(rng, 500), pd.DataFrame({"proba": rng.random(500)}))
+    stable = detector.score()
+    for _ in range(10):
+        shifted = _frame(rng, 100, mean=60.0, jobs="ab")
+        detector.update(shifted, pd.DataFrame({"proba": rng.random(100)}))
+    drifted = detector.score()
+
+    # Assert
+    assert not stable["is_data_drift_detected"]
+    assert not stable["is_pred_drift_detected"]
+    assert drifted["is_data_drift_detected"]
+    assert drifted["data_drift"]["columns"]["age"]["psi"] > 0.2
+
+
+def test_reference_profile_round_trip_keeps_scores(tmp_path):
+    # Arrange
+    rng = np.random.default_rng(3)
+    profile = ReferenceProfile.from_frames(
+        _frame(rng, 2000), pd.DataFrame({"proba": rng.random(2000)})
+    )
+    current = _frame(rng, 300, mean=45.0)
+    preds = pd.DataFrame({"proba": rng.random(300)})
+
+    # Act
+    profile.save(tmp_path / "reference_profile.json")
+    loaded = ReferenceProfile.load(tmp_path / "reference_profile.json")
+    scores = []
+    for reference in (profile, loaded):
+        detector = StreamingDriftDetector(reference)
+        detector.update(current, preds)
+        scores.append(detector.score())
+
+    # Assert
+    assert scores[0] == scores[1]
+    assert loaded.moments["data"]["age"]["count"] == 2000
@@ -0,0 +1,50 @@
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import FunctionTransformer
+
+from src.features import preprocess_data
+from src.pipeline import InferencePlan
+
+
+def _make_data(n_rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(
+        {
+            "age": rng.integers(18, 90, n_rows),
+            "balance": rng.normal(1500, 500, n_rows),
+            "month": rng.choice(["jan", "may", "jun", "nov"], n_rows),
+        }
+    )
+    y = (X["balance"] + rng.normal(0, 300, n_rows) > 1500).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        LogisticRegression(max_iter=1000),
+        lgb.LGBMClassifier(n_estimators=10, verbose=-1),
+    ],
+)
+def test_inference_plan_matches_predict_and_predict_proba(model):
+    # Arrange
+    X, y = _make_data()
+    transformer = FunctionTransformer(lambda df: df.astype(float))
+    X_train = transformer.fit_transform(preprocess_data(X.copy()))
+    model.fit(X_train, y)
+
+    X_new, _ = _make_data(seed=1)
+    X_original = X_new.copy()
+    X_expected = transformer.transform(preprocess_data(X_new.copy()))
+
+    # Act
+    X_transformed, preds, probs = InferencePlan(model, transformer).score(X_new)
+
+    # Assert
+    pd.testing.assert_frame_equal(X_transformed, X_expected)
+    np.testing.assert_array_equal(preds, model.predict(X_expected))
+    np.testing.assert_array_equal(probs, model.predict_proba(X_expected))
+    pd.testing.assert_frame_equal(X_new, X_original)
@@ -0,0 +1,22 @@
+from src.serving import ActiveModel, ModelBundle
+
+
+def test_swap_keeps_previous_bundle_until_drained():
+    # Arrange
+    v1 = ModelBundle(version="v1", plan=None)
+    v2 = ModelBundle(version="v2", plan=None)
+    active_model = ActiveModel(v1)
+    leased = active_model.lease()
+
+    # Act
+    previous = active_model.swap(v2)
+
+    # Assert
+    assert previous is leased
+    assert active_model.lease() is v2
+    assert active_model.status()["draining"] == [{"version": "v1", "in_flight": 1}]
+    assert not active_model.wait_drained(v1, timeout=0.01)
+
+    active_model.release(leased)
+    assert active_model.wait_drained(v1, timeout=0.01)
+    assert active_model.status()["draining"] == []
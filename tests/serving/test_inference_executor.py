@@ -0,0 +1,162 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.serving import (
+    ActiveModel,
+    ExecutorSaturatedError,
+    InferenceExecutor,
+    ModelBundle,
+)
+
+
+class _BlockingPlan:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def score_timed(self, X):
+        self.release.wait(5)
+        preds = np.zeros(len(X), dtype=int)
+        probs = np.column_stack([np.ones(len(X)), np.zeros(len(X))])
+        return X, preds, probs, {}
+
+
+class _RecordingClient:
+    def __init__(self):
+        self.messages = []
+
+    def send_message(self, message):
+        self.messages.append(message)
+
+
+@pytest.fixture
+def plan():
+    return _BlockingPlan()
+
+
+@pytest.fixture
+def executor(plan):
+    active_model = ActiveModel(ModelBundle(version="v1", plan=plan))
+    executor = InferenceExecutor(
+        active_model, _RecordingClient(), max_workers=1, max_queue_size=1
+    )
+    executor.start()
+    yield executor
+    plan.release.set()
+    executor.shutdown()
+
+
+def test_inference_executor_rejects_when_queue_is_full(executor, plan):
+    # Arrange
+    X = pd.DataFrame({"value": [1, 2]})
+    running = executor.submit(X)
+    queued = executor.submit(X)
+
+    # Act
+    with pytest.raises(ExecutorSaturatedError):
+        executor.submit(X)
+    saturated = executor.stats()
+    plan.release.set()
+    running.result(timeout=5)
+    queued.result(timeout=5)
+
+    # Assert
+    assert saturated["in_flight"] == 2
+    assert saturated["queue_depth"] == 1
+    assert saturated["saturation"] == 1.0
+    assert saturated["rejected"] == 1
+
+
+def test_inference_executor_stats_count_outcomes(executor, plan):
+    # Arrange
+    plan.release.set()
+    X = pd.DataFrame({"value": [1, 2, 3]})
+
+    # Act
+    preds, probs = executor.submit(X).result(timeout=5)
+    executor.active_model.swap(ModelBundle(version="v2", plan=None))
+    failed = executor.submit(X)
+
+    # Assert
+    assert list(preds) == [0, 0, 0]
+    assert probs.shape == (3, 2)
+    assert isinstance(failed.exception(timeout=5), RuntimeError)
+
+    stats = executor.stats()
+    assert stats["in_flight"] == 0
+    assert stats["peak_in_flight"] == 1
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["rejected"] == 0
+    assert executor.messaging_client.messages[0]["probabilities"] is probs
+
+
+class _WarmupRecordingPlan:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def score(self, X):
+        (self.directory / str(os.getpid())).write_text(str(len(X)))
+
+    def score_timed(self, X):
+        # Predictions carry the pid of the worker that scored them
+        preds = np.full(len(X), os.getpid())
+        return X, preds, np.zeros((len(X), 2)), {}
+
+
+def test_process_executor_warms_every_worker(tmp_path):
+    # Arrange
+    plan = _WarmupRecordingPlan(tmp_path)
+    active_model = ActiveModel(ModelBundle(version="v1", plan=plan))
+    executor = InferenceExecutor(
+        active_model,
+        _RecordingClient(),
+        executor_type="process",
+        max_workers=2,
+        warmup_rows=8,
+    )
+
+    # Act
+    executor.start()
+    executor.shutdown()
+
+    # Assert
+    warmed = list(tmp_path.iterdir())
+    assert len(warmed) == 2
+    assert all(path.read_text() == "8" for path in warmed)
+
+
+def test_process_executor_prepares_pool_before_swap(tmp_path):
+    # Arrange
+    v1_dir, v2_dir = tmp_path / "v1", tmp_path / "v2"
+    v1_dir.mkdir()
+    v2_dir.mkdir()
+    v1 = ModelBundle(version="v1", plan=_WarmupRecordingPlan(v1_dir))
+    v2 = ModelBundle(version="v2", plan=_WarmupRecordingPlan(v2_dir))
+    active_model = ActiveModel(v1)
+    executor = InferenceExecutor(
+        active_model,
+        _RecordingClient(),
+        executor_type="process",
+        max_workers=2,
+        warmup_rows=1,
+    )
+    executor.start()
+    X = pd.DataFrame({"value": [1, 2]})
+
+    # Act
+    executor.prepare(v2)
+    prepared = executor.stats()["worker_pools"]
+    active_model.swap(v2)
+    preds, _ = executor.submit(X).result(timeout=10)
+    executor.retire(v1)
+    retired = executor.stats()["worker_pools"]
+    executor.shutdown()
+
+    # Assert
+    assert prepared == 2
+    assert retired == 1
+    assert str(preds[0]) in {path.name for path in v2_dir.iterdir()}
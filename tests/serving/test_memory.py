@@ -0,0 +1,64 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.serving import read_memory_usage
+from src.serving.memory import parse_smaps_rollup
+
+SMAPS_ROLLUP = """\
+55d0c6a00000-7ffd2b5f2000 ---p 00000000 00:00 0                          [rollup]
+Rss:              102400 kB
+Pss:               40960 kB
+Pss_Anon:          30720 kB
+Shared_Clean:      61440 kB
+Shared_Dirty:       4096 kB
+Private_Clean:      8192 kB
+Private_Dirty:     28672 kB
+Referenced:       102400 kB
+Anonymous:         32768 kB
+Swap:                  0 kB
+"""
+
+
+def test_parse_smaps_rollup_sums_shared_and_private():
+    # Act
+    usage = parse_smaps_rollup(SMAPS_ROLLUP)
+
+    # Assert
+    assert usage == {
+        "rss": 102400 * 1024,
+        "pss": 40960 * 1024,
+        "shared": (61440 + 4096) * 1024,
+        "private": (8192 + 28672) * 1024,
+    }
+
+
+def test_parse_smaps_rollup_defaults_missing_fields_to_zero():
+    # Act
+    usage = parse_smaps_rollup("Rss:   1024 kB\n")
+
+    # Assert
+    assert usage == {"rss": 1024 * 1024, "pss": 0, "shared": 0, "private": 0}
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/smaps_rollup"), reason="Linux only")
+def test_read_memory_usage_of_live_and_exited_processes():
+    # Arrange
+    child = subprocess.run(
+        [sys.executable, "-c", "import os; print(os.getpid())"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    exited_pid = int(child.stdout)
+
+    # Act
+    own = read_memory_usage()
+    exited = read_memory_usage(exited_pid)
+
+    # Assert
+    assert own["rss"] > 0
+    assert own["rss"] == own["shared"] + own["private"]
+    assert exited == {}
@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.serving import MicroBatcher
+
+
+def _echo_inference(X):
+    preds = X["value"].to_numpy() % 2
+    probs = np.column_stack([1 - preds, preds]).astype(float)
+    return preds, probs
+
+
+@pytest.fixture
+def pool():
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        yield executor
+
+
+def _submitting(pool, infer_fn):
+    return lambda X: pool.submit(infer_fn, X)
+
+
+def test_micro_batcher_splits_results_per_request(pool):
+    # Arrange
+    batcher = MicroBatcher(
+        _submitting(pool, _echo_inference), max_batch_size=8, max_wait_ms=20
+    )
+    batcher.start()
+    frames = [pd.DataFrame({"value": [i, i + 1]}) for i in range(10)]
+
+    # Act
+    with ThreadPoolExecutor(max_workers=10) as clients:
+        results = list(clients.map(batcher.predict, frames))
+    batcher.stop()
+
+    # Assert
+    for frame, (preds, probs) in zip(frames, results):
+        assert list(preds) == list(frame["value"] % 2)
+        assert probs.shape == (2, 2)
+
+    stats = batcher.stats()
+    assert stats["requests"] == 10
+    assert stats["rows"] == 20
+    assert stats["batches"] < 10
+    assert stats["mean_batch_rows"] <= 8
+
+
+def test_micro_batcher_propagates_errors(pool):
+    # Arrange
+    def failing_inference(X):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher(
+        _submitting(pool, failing_inference), max_batch_size=4, max_wait_ms=1
+    )
+    batcher.start()
+
+    # Act
+    future = batcher.submit(pd.DataFrame({"value": [1]}))
+    batcher.stop()
+
+    # Assert
+    assert isinstance(future.exception(timeout=1), ValueError)
+
+
+def test_micro_batcher_isolates_failing_request(pool):
+    # Arrange
+    def strict_inference(X):
+        if (X["value"] < 0).any():
+            raise ValueError("negative value")
+        return _echo_inference(X)
+
+    batcher = MicroBatcher(
+        _submitting(pool, strict_inference), max_batch_size=8, max_wait_ms=50
+    )
+    batcher.start()
+
+    # Act
+    good = batcher.submit(pd.DataFrame({"value": [1, 2]}))
+    bad = batcher.submit(pd.DataFrame({"value": [-1]}))
+    batcher.stop()
+
+    # Assert
+    assert list(good.result(timeout=1)[0]) == [1, 0]
+    assert isinstance(bad.exception(timeout=1), ValueError)
+
+
+def test_micro_batcher_keeps_several_batches_in_flight(pool):
+    # Arrange
+    both_scoring = threading.Barrier(2, timeout=5)
+
+    def paired_inference(X):
+        both_scoring.wait()
+        return _echo_inference(X)
+
+    batcher = MicroBatcher(
+        _submitting(pool, paired_inference), max_batch_size=2, max_wait_ms=1
+    )
+    batcher.start()
+
+    # Act
+    first = batcher.submit(pd.DataFrame({"value": [1, 2]}))
+    second = batcher.submit(pd.DataFrame({"value": [3, 4]}))
+
+    # Assert
+    assert list(first.result(timeout=5)[0]) == [1, 0]
+    assert list(second.result(timeout=5)[0]) == [1, 0]
+    batcher.stop()
+    assert batcher.stats()["batches"] == 2
+
+
+def test_micro_batcher_fails_submit_rejections():
+    # Arrange
+    def rejecting_submit(X):
+        raise RuntimeError("queue is full")
+
+    batcher = MicroBatcher(rejecting_submit, max_batch_size=4, max_wait_ms=1)
+    batcher.start()
+
+    # Act
+    future = batcher.submit(pd.DataFrame({"value": [1]}))
+    batcher.stop()
+
+    # Assert
+    assert isinstance(future.exception(timeout=1), RuntimeError)
+
+
+def test_micro_batcher_fails_parked_requests_on_stop(pool):
+    # Arrange
+    release = threading.Event()
+
+    def blocking_submit(X):
+        # A submit that blocks keeps the next request parked in the batcher
+        release.wait(5)
+        return pool.submit(_echo_inference, X)
+
+    batcher = MicroBatcher(blocking_submit, max_batch_size=4, max_wait_ms=50)
+    batcher.start()
+    first = batcher.submit(pd.DataFrame({"value": [1, 2, 3]}))
+    parked = batcher.submit(pd.DataFrame({"value": [4, 5, 6]}))
+
+    # Act
+    time.sleep(0.2)
+    batcher.stop(timeout=0.1)
+    release.set()
+
+    # Assert
+    assert isinstance(parked.exception(timeout=1), RuntimeError)
+    assert list(first.result(timeout=5)[0]) == [1, 0, 1]
@@ -0,0 +1,119 @@
+import time
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.preprocessing import FunctionTransformer
+
+from src.serving import ActiveModel, ModelBundle, PredictionCache, model_watcher
+from src.serving.model_watcher import ModelWatcher
+
+
+class _FakeModel:
+    classes_ = np.array([0, 1])
+
+    def __init__(self, version):
+        self.version = version
+
+    def predict_proba(self, X):
+        return np.tile([0.5, 0.5], (len(X), 1))
+
+
+class _FakeTracker:
+    """Registry whose production alias can be moved by the test."""
+
+    def __init__(self, tmp_path, version):
+        self.version = version
+        self.transformer_path = tmp_path / "transformer.pkl"
+        joblib.dump(FunctionTransformer(), self.transformer_path)
+
+    def get_model_version(self, model_name, alias="production"):
+        return self.version
+
+    def load_model(self, model_name, alias="production"):
+        return _FakeModel(self.version)
+
+    def get_artifact(self, model_name, path, alias="production"):
+        return str(self.transformer_path)
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def events(monkeypatch):
+    events = []
+
+    def warmup(plan, n_rows):
+        events.append(("warmup", plan.model.version))
+        return 0.0
+
+    monkeypatch.setattr(model_watcher, "warmup_plan", warmup)
+    return events
+
+
+def test_watcher_swaps_the_model_when_the_alias_moves(tmp_path, events):
+    # Arrange
+    tracker = _FakeTracker(tmp_path, "v1")
+    v1 = ModelBundle(version="v1", plan=None)
+    active_model = ActiveModel(v1)
+    cache = PredictionCache()
+    cache.set_version("v1")
+    watcher = ModelWatcher(
+        tracker,
+        "bank",
+        active_model,
+        poll_interval=0.01,
+        drain_timeout=5,
+        on_prepare=lambda b: events.append(("prepare", active_model.version)),
+        on_swap=lambda b: cache.set_version(b.version),
+        on_retire=lambda b: events.append(("retire", b.version)),
+    )
+    in_flight = active_model.lease()
+
+    # Act
+    watcher.start()
+    tracker.version = "v2"
+    swapped = _wait_for(lambda: active_model.version == "v2")
+    retired_while_in_flight = ("retire", "v1") in events
+    active_model.release(in_flight)
+    retired = _wait_for(lambda: ("retire", "v1") in events)
+    watcher.stop()
+
+    # Assert
+    assert swapped and retired
+    assert not retired_while_in_flight
+    assert events == [("warmup", "v2"), ("prepare", "v1"), ("retire", "v1")]
+    assert cache.stats()["version"] == "v2"
+    assert watcher.status()["reloads"] == 1
+    assert active_model.status()["draining"] == []
+
+
+def _missing_model(model_name, alias="production"):
+    raise OSError("gone")
+
+
+def test_watcher_keeps_the_model_when_the_reload_fails(tmp_path, events):
+    # Arrange
+    tracker = _FakeTracker(tmp_path, "v1")
+    active_model = ActiveModel(ModelBundle(version="v1", plan=None))
+    watcher = ModelWatcher(tracker, "bank", active_model, poll_interval=0.01)
+    tracker.load_model = _missing_model
+    unchanged = watcher.check_now()
+
+    # Act
+    tracker.version = "v2"
+    watcher.start()
+    failed = _wait_for(lambda: watcher.status()["last_error"] is not None)
+    watcher.stop()
+
+    # Assert
+    assert not unchanged
+    assert failed
+    assert "gone" in watcher.status()["last_error"]
+    assert active_model.version == "v1"
+    assert watcher.status()["reloads"] == 0
@@ -0,0 +1,131 @@
+import time
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from src.serving import PredictionCache
+
+
+def _make_inputs(n_rows, age_offset=0):
+    return pd.DataFrame(
+        {
+            "age": np.arange(n_rows) + 18 + age_offset,
+            "job": ["management"] * n_rows,
+            "marital": ["married"] * n_rows,
+            "education": ["tertiary"] * n_rows,
+            "default": ["no"] * n_rows,
+            "balance": (np.arange(n_rows) + age_offset) * 100.0,
+            "housing": ["yes"] * n_rows,
+            "loan": ["no"] * n_rows,
+            "contact": ["cellular"] * n_rows,
+            "day": [4] * n_rows,
+            "month": ["may"] * n_rows,
+            "duration": [85.0] * n_rows,
+            "campaign": [1] * n_rows,
+            "pdays": [61.0] * n_rows,
+            "previous": [5] * n_rows,
+            "poutcome": ["failure"] * n_rows,
+        }
+    )
+
+
+class _CountingInference:
+    def __init__(self):
+        self.rows = 0
+
+    def __call__(self, X):
+        self.rows += len(X)
+        preds = (X["age"].to_numpy() % 2).astype(int)
+        probs = np.column_stack([1 - preds, preds]).astype(float)
+        return preds, probs
+
+    def submit(self, X):
+        future = Future()
+        future.set_result(self(X))
+        return future
+
+
+def test_cache_only_scores_misses():
+    # Arrange
+    cache = PredictionCache(max_entries=100)
+    infer = _CountingInference()
+    expected = infer(_make_inputs(6))
+    infer.rows = 0
+
+    # Act
+    cache.predict(_make_inputs(4), infer.submit)
+    preds, probs = cache.predict(_make_inputs(6), infer.submit).result()
+
+    # Assert
+    assert infer.rows == 6
+    np.testing.assert_array_equal(preds, expected[0])
+    np.testing.assert_array_equal(probs, expected[1])
+    assert cache.stats()["hits"] == 4
+
+
+def test_cache_evicts_least_recently_used():
+    # Arrange
+    cache = PredictionCache(max_entries=3)
+    infer = _CountingInference()
+
+    # Act
+    cache.predict(_make_inputs(5), infer.submit)
+
+    # Assert
+    assert cache.stats()["size"] == 3
+    assert cache.stats()["evictions"] == 2
+
+
+def test_cache_expires_entries():
+    # Arrange
+    cache = PredictionCache(ttl_seconds=0.01)
+    infer = _CountingInference()
+    cache.predict(_make_inputs(2), infer.submit)
+
+    # Act
+    time.sleep(0.02)
+    cache.predict(_make_inputs(2), infer.submit)
+
+    # Assert
+    assert infer.rows == 4
+    assert cache.stats()["expirations"] == 2
+
+
+def test_cache_is_invalidated_on_version_change():
+    # Arrange
+    versions = iter(["v1", "v2"])
+    cache = PredictionCache(version_fn=lambda: next(versions))
+    infer = _CountingInference()
+    cache.refresh_version()
+    cache.predict(_make_inputs(3), infer.submit)
+
+    # Act
+    cache.refresh_version()
+    cache.predict(_make_inputs(3), infer.submit)
+
+    # Assert
+    assert infer.rows == 6
+    assert cache.stats()["version"] == "v2"
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_cache_polls_version_in_the_background():
+    # Arrange
+    calls = []
+    cache = PredictionCache(
+        version_fn=lambda: calls.append(None) or "v2", version_check_interval=0.01
+    )
+    cache.set_version("v1")
+
+    # Act
+    cache.predict(_make_inputs(2), _CountingInference().submit)
+    looked_up = len(calls)
+    cache.start()
+    time.sleep(0.1)
+    cache.stop()
+
+    # Assert
+    assert looked_up == 0
+    assert len(calls) > 0
+    assert cache.stats()["version"] == "v2"
@@ -0,0 +1,39 @@
+import pytest
+
+from src.telemetry import Counter, Histogram, MetricsRegistry
+from src.telemetry.metrics import _Metric
+
+
+def test_registry_renders_prometheus_text():
+    # Arrange
+    registry = MetricsRegistry()
+    latency = registry.register(
+        Histogram(
+            "latency_seconds", "Latency.", labelnames=("stage",), buckets=(0.1, 1)
+        )
+    )
+    rows = registry.register(Counter("rows_total", "Rows."))
+    registry.register_collector("queue", lambda: {"depth": 3, "type": "thread"})
+
+    # Act
+    latency.labels("predict").observe(0.05)
+    latency.labels("predict").observe(0.5)
+    latency.labels("predict").observe(5)
+    rows.inc(10)
+    text = registry.render()
+
+    # Assert
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{stage="predict",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{stage="predict",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{stage="predict",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{stage="predict"} 3' in text
+    assert "rows_total 10.0" in text
+    assert "queue_depth 3.0" in text
+    assert "queue_type" not in text
+
+
+def test_metric_base_requires_child_factory():
+    # Act / Assert
+    with pytest.raises(TypeError):
+        _Metric("incomplete_metric", "Metric without child type")